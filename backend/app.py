@@ -1,10 +1,33 @@
-from flask import Flask, Response
+from flask import Flask, Response, jsonify
 import pygame
 import threading
+import time
+import logging
+import os
+import sys
+import base64
+import random
 import cv2
 import numpy as np
 
+SIMULATION_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "pygame_simulation")
+sys.path.insert(0, SIMULATION_DIR)  # The simulation modules use flat imports
+
+from simulation import Simulation as WarehouseSimulation
+from fleet import STATE_NAMES
+from algorithm.grid import SHELF, PICKING_STATION, PUTAWAY_STATION
+from state_stream import StateStream, MAP
+from map_format import read_map
+import metrics
+
 app = Flask(__name__)
+logger = logging.getLogger(__name__)
+
+VIDEO_FPS = float(os.environ.get("VIDEO_FPS", 10))  # Frames rendered and encoded per second
+JPEG_QUALITY = int(os.environ.get("JPEG_QUALITY", 80))
+SIM_MAP = os.environ.get("SIM_MAP", os.path.join(SIMULATION_DIR, "maps", "default_map.json"))
+SIM_TICK_SECONDS = float(os.environ.get("SIM_TICK_SECONDS", 0.5))  # Real time per simulation tick
+SIM_DEMO_MISSIONS = os.environ.get("SIM_DEMO_MISSIONS", "1") == "1"  # Keep idle AGVs busy with random missions
 
 # Pygame Simulation Class
 class Simulation:
@@ -12,31 +35,119 @@ class Simulation:
         pygame.init()
         self.width, self.height = 600, 600
         self.cell_size = 20
-        self.screen = pygame.Surface((self.width, self.height))  # Create a Pygame surface
+        # 24-bit surface with B, G, R byte order, so its pixel buffer is already an OpenCV image
+        self.screen = pygame.Surface((self.width, self.height), 0, 24, (0xff0000, 0x00ff00, 0x0000ff, 0))
+        self.background = self.screen.copy()  # Static grid, drawn once
+        self.draw_grid(self.background)
         self.clock = pygame.time.Clock()
 
-    def update(self):
-        self.screen.fill((255, 255, 255))  # Clear the screen
+    def draw_grid(self, surface):
+        surface.fill((255, 255, 255))  # Clear the screen
         for row in range(0, self.width, self.cell_size):
             for col in range(0, self.height, self.cell_size):
-                pygame.draw.rect(self.screen, (0, 0, 0), (row, col, self.cell_size, self.cell_size), 1)
+                pygame.draw.rect(surface, (0, 0, 0), (row, col, self.cell_size, self.cell_size), 1)
 
+    def update(self):
+        self.screen.blit(self.background, (0, 0))
         pygame.draw.circle(self.screen, (255, 0, 0), (300, 300), 10)  # Example robot position
 
     def get_frame(self):
+        started = time.perf_counter() if metrics.enabled else None
         self.update()
-        frame = pygame.surfarray.array3d(self.screen)  # Convert to numpy array
-        frame = np.rot90(frame)  # Rotate
-        frame = cv2.cvtColor(frame, cv2.COLOR_RGB2BGR)  # Convert to BGR
-        _, encoded_image = cv2.imencode('.jpg', frame)  # Encode as JPEG
+        # Wrap the surface pixels in place (no array3d / rot90 / cvtColor copies)
+        pitch = self.screen.get_pitch()
+        frame = np.frombuffer(self.screen.get_buffer(), dtype=np.uint8).reshape(self.height, pitch)
+        frame = frame[:, :self.width * 3].reshape(self.height, self.width, 3)
+        _, encoded_image = cv2.imencode('.jpg', frame, [cv2.IMWRITE_JPEG_QUALITY, JPEG_QUALITY])  # Encode as JPEG
+        if started is not None:
+            metrics.RENDER_FRAME_SECONDS.observe(time.perf_counter() - started, "video")
         return encoded_image.tobytes()
 
 simulation = Simulation()
 
+
+class FrameBroadcaster:
+    """Render and encode each frame once and share it with every client.
+
+    A single producer thread calls `source()` at `fps` while at least one
+    client is connected. Clients only ever get the latest frame: one that
+    falls behind skips the frames it missed instead of queueing them.
+
+    A frame that fails to render is logged and skipped. Should the producer
+    thread die anyway, a client that has waited a second without a frame
+    starts a new one.
+    """
+
+    def __init__(self, source, fps):
+        self.source = source
+        self.interval = 1.0 / fps
+        self.frame = None
+        self.sequence = 0  # Bumped for every new frame
+        self.clients = 0
+        self.condition = threading.Condition()
+        self.thread = None
+
+    def stream(self):
+        """Yield frames for one client until it disconnects."""
+        with self.condition:
+            self.clients += 1
+            self._start_producer()
+        try:
+            seen = 0
+            while True:
+                with self.condition:
+                    while not self.condition.wait_for(lambda: self.sequence != seen,
+                                                      timeout=max(1.0, 2 * self.interval)):
+                        self._start_producer()  # No frame for a while: make sure a producer is running
+                    frame, seen = self.frame, self.sequence
+                yield frame
+        finally:
+            with self.condition:
+                self.clients -= 1
+
+    def _start_producer(self):
+        """Start the producer thread unless one is alive (call with the condition held)."""
+        if self.thread is None or not self.thread.is_alive():
+            self.thread = threading.Thread(target=self._produce, daemon=True)
+            self.thread.start()
+
+    def _produce(self):
+        next_frame = time.monotonic()
+        failures = 0  # Failed frames in a row; only the first one of a streak is logged
+        while True:
+            with self.condition:
+                if not self.clients:
+                    self.thread = None  # Nobody watching; the next client restarts us
+                    return
+            try:
+                frame = self.source()
+            except Exception:
+                failures += 1
+                if failures == 1:
+                    logger.exception("Rendering a video frame failed; skipping frames until it works again")
+                frame = None
+            else:
+                if failures:
+                    logger.warning("Video frames render again after %d failures", failures)
+                failures = 0
+            if frame is not None:
+                with self.condition:
+                    self.frame = frame
+                    self.sequence += 1
+                    self.condition.notify_all()
+            next_frame += self.interval
+            delay = next_frame - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+            else:
+                next_frame = time.monotonic()  # Running late: don't try to catch up
+
+
+broadcaster = FrameBroadcaster(simulation.get_frame, VIDEO_FPS)
+
 # Video Streaming Generator
 def generate_frames():
-    while True:
-        frame = simulation.get_frame()
+    for frame in broadcaster.stream():
         yield (b'--frame\r\n'
                b'Content-Type: image/jpeg\r\n\r\n' + frame + b'\r\n')
 
@@ -44,6 +155,57 @@ def generate_frames():
 def video_feed():
     return Response(generate_frames(), mimetype='multipart/x-mixed-replace; boundary=frame')
 
+# Headless warehouse simulation, streamed as state deltas
+def load_warehouse(path):
+    data = read_map(path)  # JSON or memory-mapped binary (.wmap) map
+    return WarehouseSimulation(data["maze"], [tuple(data.get("robot") or (0, 0))], tick_seconds=SIM_TICK_SECONDS)
+
+warehouse = load_warehouse(SIM_MAP)
+state_stream = StateStream(warehouse)
+
+def run_warehouse():
+    """Advance the simulation in real time, one tick every SIM_TICK_SECONDS."""
+    rng = random.Random()
+    shelves = [warehouse.graph.coords(n) for n in np.flatnonzero(warehouse.graph.cells == SHELF)]
+    stations = [warehouse.graph.coords(n) for n in
+                np.flatnonzero(np.isin(warehouse.graph.cells, (PICKING_STATION, PUTAWAY_STATION)))]
+    next_tick = time.monotonic()
+    while True:
+        if SIM_DEMO_MISSIONS and shelves and stations and warehouse.idle():
+            warehouse.add_mission(rng.choice(shelves), rng.choice(stations))
+        warehouse.step()
+        next_tick += SIM_TICK_SECONDS
+        time.sleep(max(0.0, next_tick - time.monotonic()))
+
+@app.route('/robots')
+def robots():
+    """Current AGV positions and states (polled by frontend/src/api.js)."""
+    data = [{"id": i, "position": [row, col], "state": STATE_NAMES[state]}
+            for i, (row, col, state) in enumerate(state_stream.robots())]
+    response = jsonify({"robots": data})
+    response.headers["Access-Control-Allow-Origin"] = "*"
+    return response
+
+@app.route('/robots/stream')
+def robots_stream():
+    """Server-Sent Events: one `map` event, then `delta` events; payloads are base64 state_stream messages."""
+    def generate():
+        for message in state_stream.stream():
+            kind = "map" if message[0] == MAP else "delta"
+            yield f"event: {kind}\ndata: {base64.b64encode(message).decode()}\n\n"
+    response = Response(generate(), mimetype='text/event-stream')
+    response.headers["Cache-Control"] = "no-cache"
+    response.headers["Access-Control-Allow-Origin"] = "*"
+    return response
+
+@app.route('/metrics')
+def metrics_endpoint():
+    """Planner, tick and frame timings in the Prometheus text format (empty unless METRICS=1)."""
+    return Response(metrics.REGISTRY.render(), mimetype='text/plain; version=0.0.4')
+
+warehouse_thread = threading.Thread(target=run_warehouse, daemon=True)
+warehouse_thread.start()
+
 # Run Flask in a separate thread
 def run_flask():
     app.run(host="0.0.0.0", port=5000, debug=True, use_reloader=False)
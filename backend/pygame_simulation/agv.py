@@ -1,30 +1,59 @@
-from config import BLACK, RED, GRID_SIZE
-import pygame
+from config import GRID_SIZE
+from fleet import Fleet, STATE_NAMES
+from sprites import default_atlas
 
 class AGV:
-    def __init__(self, x, y):
-        self.position = [x, y]
-        self.target = None
-        self.selected = False
+    """Lightweight view onto one row of a Fleet.
 
-    def draw(self, screen):
-        color = RED if self.selected else BLACK  # Highlight AGV when selected
-        pygame.draw.rect(screen, color, 
-                         (self.position[0] * GRID_SIZE, self.position[1] * GRID_SIZE, GRID_SIZE, GRID_SIZE))
+    `AGV(x, y)` still works on its own (it gets a one-row fleet); pass
+    `fleet` and `index` to wrap an AGV that lives in a larger fleet.
+    `position` is an [x, y] list as before, but a copy: assign a new
+    position instead of changing it in place.
+    """
+
+    def __init__(self, x, y, fleet=None, index=None):
+        if fleet is None:
+            fleet = Fleet()
+        self.fleet = fleet
+        self.index = fleet.add((x, y)) if index is None else index
+        self.selected = False  # UI state, not part of the fleet
+
+    @property
+    def position(self):
+        return self.fleet.positions[self.index].tolist()
+
+    @position.setter
+    def position(self, value):
+        self.fleet.positions[self.index] = value
+
+    @property
+    def target(self):
+        if not self.fleet.has_target[self.index]:
+            return None
+        return self.fleet.targets[self.index].tolist()
+
+    @target.setter
+    def target(self, value):
+        self.fleet.set_target(self.index, value)
+
+    @property
+    def state(self):
+        return STATE_NAMES[self.fleet.states[self.index]]
+
+    @property
+    def battery(self):
+        return float(self.fleet.battery[self.index])
+
+    def draw(self, screen, atlas=None):
+        """Blit this AGV's state icon (outlined when selected); see `draw_fleet` for many AGVs."""
+        atlas = atlas or default_atlas()
+        x, y = self.position
+        screen.blit(atlas.icon(self.fleet.states[self.index], GRID_SIZE, self.selected),
+                    (x * GRID_SIZE, y * GRID_SIZE))
 
     def move(self):
-        if self.target:
-            if self.position[0] < self.target[0]:
-                self.position[0] += 1
-            elif self.position[0] > self.target[0]:
-                self.position[0] -= 1
-            elif self.position[1] < self.target[1]:
-                self.position[1] += 1
-            elif self.position[1] > self.target[1]:
-                self.position[1] -= 1
-            
-            if self.position == self.target:
-                self.target = None
+        """Step this AGV alone; use `fleet.tick()` to step the whole fleet at once."""
+        self.fleet.tick(rows=[self.index])
 
     def handle_click(self, x, y):
         """Handles click events to select AGV or set target position."""
@@ -34,3 +63,15 @@ class AGV:
         elif self.selected:  # Clicked on a destination while AGV is selected
             self.target = [grid_x, grid_y]
             self.selected = False  # Deselect AGV after selecting target
+
+
+def draw_fleet(screen, agvs, atlas=None):
+    """Draw AGVs with one batched blit per Fleet they belong to (standalone AGVs each have their own)."""
+    atlas = atlas or default_atlas()
+    groups = {}  # id(fleet) -> (fleet, [agv, ...])
+    for agv in agvs:
+        groups.setdefault(id(agv.fleet), (agv.fleet, []))[1].append(agv)
+    for fleet, members in groups.values():
+        rows = [agv.index for agv in members]
+        atlas.draw_fleet(screen, fleet.positions[rows], fleet.states[rows], GRID_SIZE,
+                         selected=[agv.selected for agv in members])
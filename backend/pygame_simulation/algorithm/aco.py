@@ -1,55 +1,246 @@
 # algorithm/aco.py
 import numpy as np
 import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import metrics
+from algorithm.astar import astar, heuristic
+from algorithm.grid import as_grid_graph, GridGraph, EMPTY
 
 def aco(maze, start, end, num_ants=10, num_iterations=100, alpha=1.0, beta=2.0, evaporation_rate=0.5, pheromone_deposit=1.0):
-    rows, cols = len(maze), len(maze[0])
-    pheromone = np.ones((rows, cols))  # Initialize pheromone matrix
+    started = time.perf_counter()
+    graph = as_grid_graph(maze)
+    cols = graph.cols
+    adjacency = graph.adjacency
+    walkable = graph.walkable(strict=True)  # Only empty cells
+    pheromone = np.ones(graph.size)  # Initialize pheromone matrix (flat, indexed by node id)
     best_path = None
     best_path_length = float('inf')
-    
-    directions = [(-1, 0), (1, 0), (0, -1), (0, 1)]  # Up, Down, Left, Right
-    
-    def is_valid_move(x, y):
-        return 0 <= x < rows and 0 <= y < cols and maze[x][y] == 0
-    
+
+    start_id, end_id = graph.node(start), graph.node(end)
+    end_row, end_col = end
+    steps = 0  # Ant moves, reported as expanded nodes when metrics are on
+
     for _ in range(num_iterations):
         all_paths = []
-        
+
         for _ in range(num_ants):
-            path = [start]
+            path = [start_id]
             visited = set()
-            visited.add(start)
-            current_pos = start
-            
-            while current_pos != end:
-                neighbors = [(current_pos[0] + dx, current_pos[1] + dy) for dx, dy in directions]
-                valid_neighbors = [(x, y) for x, y in neighbors if is_valid_move(x, y) and (x, y) not in visited]
-                
+            visited.add(start_id)
+            current = start_id
+
+            while current != end_id:
+                valid_neighbors = [n for n in adjacency[current] if walkable[n] and n not in visited]
+
                 if not valid_neighbors:
                     break  # Dead-end, stop exploring
-                
+
                 # Compute probabilities based on pheromone and heuristic distance
-                desirability = [pheromone[x][y] ** alpha * (1.0 / (abs(x - end[0]) + abs(y - end[1]) + 1)) ** beta for x, y in valid_neighbors]
+                desirability = []
+                for n in valid_neighbors:
+                    x, y = divmod(n, cols)
+                    desirability.append(pheromone[n] ** alpha * (1.0 / (abs(x - end_row) + abs(y - end_col) + 1)) ** beta)
                 total = sum(desirability)
                 probabilities = [d / total for d in desirability]
-                
-                next_pos = random.choices(valid_neighbors, probabilities)[0]
-                path.append(next_pos)
-                visited.add(next_pos)
-                current_pos = next_pos
-            
-            if path[-1] == end and len(path) < best_path_length:
+
+                next_node = random.choices(valid_neighbors, probabilities)[0]
+                path.append(next_node)
+                visited.add(next_node)
+                current = next_node
+
+            if path[-1] == end_id and len(path) < best_path_length:
                 best_path = path
                 best_path_length = len(path)
-            
+
             all_paths.append(path)
-        
+            steps += len(path) - 1
+
         # Update pheromone matrix
         pheromone *= (1 - evaporation_rate)  # Evaporation
         for path in all_paths:
-            if path[-1] == end:  # Only reinforce successful paths
-                for x, y in path:
-                    pheromone[x][y] += pheromone_deposit / len(path)
-    
-    return best_path if best_path else []
+            if path[-1] == end_id:  # Only reinforce successful paths
+                pheromone[path] += pheromone_deposit / len(path)
+
+    if metrics.enabled:
+        metrics.record_search("aco", time.perf_counter() - started, steps)
+    return [divmod(n, cols) for n in best_path] if best_path else []
+
+
+class AntColony:
+    """Lock-step ACO: all ants of the colony advance one cell per NumPy step.
+
+    Ant positions, visited masks and the pheromone/heuristic lookups are arrays
+    indexed by node id, and the next cell of every ant is drawn with one
+    vectorized roulette wheel. Walkability matches `aco` (empty cells only).
+    Pass `seed` for reproducible runs.
+
+    Runs stop early on any of the convergence criteria accepted by `iterate`;
+    the reason is kept in `stop_reason` ("iterations", "stagnation",
+    "time_budget" or "lower_bound").
+    """
+
+    def __init__(self, grid, num_ants=10, alpha=1.0, beta=2.0, evaporation_rate=0.5, pheromone_deposit=1.0, seed=None):
+        self.graph = as_grid_graph(grid)
+        self.num_ants = num_ants
+        self.alpha, self.beta = alpha, beta
+        self.evaporation_rate = evaporation_rate
+        self.pheromone_deposit = pheromone_deposit
+        self.rng = np.random.default_rng(seed)
+        self.iterations = 0  # Iterations run by the last search
+        self.steps = 0  # Ant moves made by the last search
+        self.stop_reason = None
+
+        # Every per-node array gets one trailing sentinel slot, so the -1 entries
+        # of the neighbor index land on a cell that is never walkable
+        size = self.graph.size
+        self._neighbors = np.where(self.graph.neighbors >= 0, self.graph.neighbors, size)
+        self._free = np.append(self.graph.cells == EMPTY, False)
+        self._rows, self._cols = np.divmod(np.arange(size), self.graph.cols)
+
+    def run(self, start, end, num_iterations=100, patience=None, time_budget=None, lower_bound=None):
+        """Same contract as `aco`: best path including start, or [] if no ant arrived."""
+        started = time.perf_counter()
+        best_path = []
+        for best_path in self.iterate(start, end, num_iterations, patience, time_budget, lower_bound):
+            pass
+        if metrics.enabled:
+            metrics.record_search("aco_colony", time.perf_counter() - started, self.steps)
+        return best_path
+
+    def iterate(self, start, end, num_iterations=100, patience=None, time_budget=None, lower_bound=None):
+        """Anytime search: yield each strictly shorter path (including start) as soon as it is found.
+
+        Stops after `num_iterations`, after `patience` iterations in a row
+        without improving on the best path found so far, once `time_budget` seconds have passed, or when
+        the best path reaches `lower_bound` moves. `lower_bound` may be a
+        number, "manhattan", or "astar" (the `astar` optimum, which may cross
+        stations and shelves and so never overestimates).
+        """
+        graph = self.graph
+        start_id, end_id = graph.node(start), graph.node(end)
+        bound = self._lower_bound(start, end, lower_bound)
+        deadline = time.perf_counter() + time_budget if time_budget is not None else None
+        pheromone = np.ones(graph.size + 1)
+        eta = self._heuristic(end)
+        best_length = None
+        stale = 0
+        self.iterations = 0
+        self.steps = 0
+        self.stop_reason = "iterations"
+
+        for _ in range(num_iterations):
+            path = self._iteration(start_id, end_id, pheromone, eta)
+            self.iterations += 1
+
+            if path is not None and (best_length is None or len(path) < best_length):
+                best_length = len(path)
+                stale = 0
+                yield [graph.coords(int(n)) for n in path]
+                if bound is not None and best_length - 1 <= bound:
+                    self.stop_reason = "lower_bound"
+                    return
+            elif best_length is not None:  # Stagnation only counts once a path exists
+                stale += 1
+                if patience is not None and stale >= patience:
+                    self.stop_reason = "stagnation"
+                    return
+
+            if deadline is not None and time.perf_counter() >= deadline:
+                self.stop_reason = "time_budget"
+                return
+
+    def _lower_bound(self, start, end, lower_bound):
+        if lower_bound == "manhattan":
+            return heuristic(start, end)
+        if lower_bound == "astar":
+            path = astar(self.graph, start, end)
+            return len(path) if path is not None else None
+        return lower_bound
+
+    def _heuristic(self, end):
+        eta = np.zeros(self.graph.size + 1)
+        distance = np.abs(self._rows - end[0]) + np.abs(self._cols - end[1])
+        eta[:-1] = (1.0 / (distance + 1)) ** self.beta
+        return eta
+
+    def _iteration(self, start_id, end_id, pheromone, eta):
+        """Walk every ant once, update pheromone, and return the shortest successful path."""
+        num_ants = self.num_ants
+        neighbors = self._neighbors
+        stride = len(self._free)
+        ants = np.arange(num_ants)
+        offsets = (ants * stride)[:, None]
+
+        # Per-node move weights; the goal row is zeroed so ants stop once they arrive
+        weights = np.where(self._free[neighbors], (pheromone ** self.alpha * eta)[neighbors], 0.0)
+        weights[end_id] = 0.0
+
+        pos = np.full(num_ants, start_id)
+        lengths = np.ones(num_ants, dtype=np.int64)  # Path length including start
+        visited = np.zeros(num_ants * stride, dtype=bool)
+        visited[offsets[:, 0] + start_id] = True
+        trail = [pos]
+
+        while True:
+            candidates = neighbors[pos]
+            move_weights = weights[pos]
+            move_weights[visited[candidates + offsets]] = 0.0
+            cumulative = move_weights.cumsum(axis=1)
+            total = cumulative[:, -1]
+            moving = total > 0  # Ants at the goal or at a dead end stay put
+            if not moving.any():
+                break
+
+            # Roulette wheel selection for all ants at once
+            threshold = self.rng.random(num_ants) * total
+            choice = np.minimum((cumulative <= threshold[:, None]).sum(axis=1), 3)
+            pos = np.where(moving, candidates[ants, choice], pos)
+            visited[pos + offsets[:, 0]] = True
+            lengths += moving
+            trail.append(pos)
+
+        self.steps += int(lengths.sum()) - num_ants
+        pheromone *= (1 - self.evaporation_rate)  # Evaporation
+        arrived = pos == end_id
+        if not arrived.any():
+            return None
+
+        trail = np.stack(trail)
+        on_path = (np.arange(len(trail))[:, None] < lengths[None, :]) & arrived[None, :]
+        deposits = np.broadcast_to(self.pheromone_deposit / lengths, trail.shape)
+        np.add.at(pheromone, trail[on_path], deposits[on_path])
+
+        best = np.flatnonzero(arrived)[np.argmin(lengths[arrived])]
+        return trail[:lengths[best], best].tolist()
+
+
+def _run_colony(cells, shape, start, end, criteria, params, seed):
+    graph = GridGraph(cells, *shape)
+    return AntColony(graph, seed=seed, **params).run(start, end, **criteria)
+
+
+def aco_colonies(maze, start, end, colonies=4, processes=None, num_iterations=100, seed=None,
+                 patience=None, time_budget=None, lower_bound=None, **params):
+    """Run independent AntColony instances and return the shortest path any of them found.
+
+    Colony seeds are spawned from `seed`, so results are reproducible for a
+    given seed and colony count. With `processes` set, colonies run on a
+    process pool of that size; otherwise they run one after another.
+    Convergence criteria apply to each colony separately.
+    """
+    graph = as_grid_graph(maze)
+    seeds = np.random.SeedSequence(seed).spawn(colonies)
+    criteria = {"num_iterations": num_iterations, "patience": patience,
+                "time_budget": time_budget, "lower_bound": lower_bound}
+    jobs = [(graph.cells, (graph.rows, graph.cols), start, end, criteria, params, s) for s in seeds]
+
+    if processes:
+        with ProcessPoolExecutor(max_workers=processes) as pool:
+            results = list(pool.map(_run_colony, *zip(*jobs)))
+    else:
+        results = [_run_colony(*job) for job in jobs]
+
+    found = [path for path in results if path]
+    return min(found, key=len) if found else []
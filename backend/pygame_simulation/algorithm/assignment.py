@@ -0,0 +1,125 @@
+# algorithm/assignment.py
+import numpy as np
+
+
+def hungarian(cost):
+    """Minimum-cost assignment of rows to columns (Hungarian method, shortest augmenting paths).
+
+    Works on rectangular matrices: every row is assigned if there are at
+    least as many columns, every column otherwise. Returns (rows, cols)
+    index arrays, sorted by row. O(n^2 m) for n = min(shape), with the inner
+    loop over columns vectorized.
+    """
+    cost = np.asarray(cost, dtype=float)
+    transposed = cost.shape[0] > cost.shape[1]
+    if transposed:
+        cost = cost.T
+    n, m = cost.shape
+    if n == 0:
+        return np.zeros(0, dtype=int), np.zeros(0, dtype=int)
+
+    # 1-based potentials and matching as in the classic formulation; column 0 is a virtual root
+    u = np.zeros(n + 1)
+    v = np.zeros(m + 1)
+    owner = np.zeros(m + 1, dtype=int)  # owner[j]: row matched to column j, 0 if free
+    way = np.zeros(m + 1, dtype=int)
+    for row in range(1, n + 1):
+        owner[0] = row
+        j0 = 0
+        min_reduced = np.full(m + 1, np.inf)
+        used = np.zeros(m + 1, dtype=bool)
+        while True:
+            used[j0] = True
+            i0 = owner[j0]
+            free = ~used[1:]
+            reduced = cost[i0 - 1] - u[i0] - v[1:]
+            better = free & (reduced < min_reduced[1:])
+            min_reduced[1:][better] = reduced[better]
+            way[1:][better] = j0
+            candidates = np.where(free, min_reduced[1:], np.inf)
+            j1 = int(np.argmin(candidates)) + 1
+            delta = candidates[j1 - 1]
+            visited = np.flatnonzero(used)
+            u[owner[visited]] += delta
+            v[visited] -= delta
+            min_reduced[1:][free] -= delta
+            j0 = j1
+            if owner[j0] == 0:
+                break
+        while j0:  # Flip the augmenting path
+            j1 = way[j0]
+            owner[j0] = owner[j1]
+            j0 = j1
+
+    cols = np.flatnonzero(owner[1:])
+    rows = owner[1:][cols] - 1
+    if transposed:
+        rows, cols = cols, rows
+    order = np.argsort(rows)
+    return rows[order], cols[order]
+
+
+def greedy_assignment(cost, candidates=8):
+    """Repeatedly take the cheapest remaining (row, column) pair; fast, not optimal.
+
+    Rather than sorting all n*m pairs, each round sorts only the `candidates`
+    cheapest columns of every unassigned row and stops as soon as some row
+    has lost all of its candidates (its next pair could be cheaper than what
+    is left in the round); the next round starts over on the remaining rows
+    and columns. The result is the same as sorting everything.
+    """
+    cost = np.asarray(cost, dtype=float)
+    rows_left, cols_left = np.arange(cost.shape[0]), np.arange(cost.shape[1])
+    rows, cols = [], []
+    while len(rows_left) and len(cols_left):
+        sub = cost[np.ix_(rows_left, cols_left)]
+        k = min(candidates, len(cols_left))
+        nearest = np.argpartition(sub, k - 1, axis=1)[:, :k] if k < len(cols_left) else \
+            np.broadcast_to(np.arange(k), sub.shape)
+        pair_rows = np.repeat(np.arange(len(rows_left)), k)
+        pair_cols = nearest.ravel()
+        pair_costs = sub[pair_rows, pair_cols]
+        row_free = np.ones(len(rows_left), dtype=bool)
+        col_free = np.ones(len(cols_left), dtype=bool)
+        blocked = np.zeros(len(rows_left), dtype=int)
+        limit = np.inf
+        for pair in np.argsort(pair_costs, kind="stable"):
+            if pair_costs[pair] > limit:
+                break
+            r, c = pair_rows[pair], pair_cols[pair]
+            if not row_free[r]:
+                continue
+            if col_free[c]:
+                row_free[r] = col_free[c] = False
+                rows.append(rows_left[r])
+                cols.append(cols_left[c])
+                continue
+            blocked[r] += 1
+            if blocked[r] == k:  # Row r ran out of candidates
+                limit = min(limit, pair_costs[pair])
+        rows_left, cols_left = rows_left[row_free], cols_left[col_free]
+    order = np.argsort(rows)
+    return np.asarray(rows, dtype=int)[order], np.asarray(cols, dtype=int)[order]
+
+
+def first_come_assignment(cost):
+    """Columns in order each take their cheapest free row (first-come, first-served).
+
+    A column whose cheapest free row costs inf is left unassigned.
+    """
+    cost = np.asarray(cost, dtype=float)
+    n, m = cost.shape
+    available = np.ones(n, dtype=bool)
+    rows, cols = [], []
+    for c in range(m):
+        if not available.any():
+            break
+        costs = np.where(available, cost[:, c], np.inf)
+        r = int(np.argmin(costs))
+        if costs[r] == np.inf:
+            continue
+        available[r] = False
+        rows.append(r)
+        cols.append(c)
+    order = np.argsort(rows)
+    return np.asarray(rows, dtype=int)[order], np.asarray(cols, dtype=int)[order]
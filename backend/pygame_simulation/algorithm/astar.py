@@ -1,46 +1,185 @@
 import heapq
+import time
+
+import metrics
+from algorithm.grid import as_grid_graph
 
 def heuristic(a, b):
     """Calculate the Manhattan distance heuristic between two points."""
     return abs(a[0] - b[0]) + abs(a[1] - b[1])
 
 def astar(grid, start, goal):
-    """Find the shortest path from start to goal using A* algorithm."""
-    rows, cols = len(grid), len(grid[0])
-    open_set = []
-    heapq.heappush(open_set, (0, start))  # Priority Queue with (cost, position)
-    
+    """Find the shortest path from start to goal using A* algorithm.
+
+    `grid` may be a list-of-lists maze or a GridGraph. With metrics enabled
+    every call reports its search statistics to `metrics.REGISTRY`.
+    """
+    if metrics.enabled:
+        started = time.perf_counter()
+        stats = [0, 0, 0]  # Pops, peak open set, entries left at the end
+        path = _astar(grid, start, goal, stats)
+        pops, peak, left = stats
+        metrics.record_search("astar", time.perf_counter() - started, pops, pops + left - 1, pops, peak)
+        return path
+    return _astar(grid, start, goal, None)
+
+def _astar(grid, start, goal, stats):
+    graph = as_grid_graph(grid)
+    cols = graph.cols
+    adjacency = graph.adjacency
+    walkable = graph.walkable()  # Everything but walls
+    start_id, goal_id = graph.node(start), graph.node(goal)
+    goal_row, goal_col = goal
+
+    open_set = [(0, start_id)]  # Priority Queue with (cost, node id)
     came_from = {}  # Store path history
-    g_score = {node: float('inf') for row in grid for node in enumerate(row)}
-    g_score[start] = 0
-    f_score = {node: float('inf') for row in grid for node in enumerate(row)}
-    f_score[start] = heuristic(start, goal)
-    
+    g_score = {start_id: 0}
+    track = stats is not None  # Pushes are derived from pops and what is left, so only pops are counted
+
     while open_set:
+        if track:
+            stats[0] += 1
+            if len(open_set) > stats[1]:
+                stats[1] = len(open_set)
         _, current = heapq.heappop(open_set)  # Get the node with the lowest cost
-        
-        if current == goal:  # Reached the goal
+
+        if current == goal_id:  # Reached the goal
+            if track:
+                stats[2] = len(open_set)
             path = []
             while current in came_from:
-                path.append(current)
+                path.append(divmod(current, cols))
                 current = came_from[current]
             path.reverse()
             return path  # Return reconstructed path
-        
+
+        temp_g_score = g_score[current] + 1  # Cost from start
+
         # Explore Neighbors (Up, Down, Left, Right)
-        for dx, dy in [(-1, 0), (1, 0), (0, -1), (0, 1)]:
-            neighbor = (current[0] + dx, current[1] + dy)
-            
-            if 0 <= neighbor[0] < rows and 0 <= neighbor[1] < cols:  # Stay inside grid
-                if grid[neighbor[0]][neighbor[1]] == 1:  # Obstacle check
+        for neighbor in adjacency[current]:
+            if not walkable[neighbor]:  # Obstacle check
+                continue
+
+            if temp_g_score < g_score.get(neighbor, float('inf')):  # Better path found
+                came_from[neighbor] = current
+                g_score[neighbor] = temp_g_score
+                row, col = divmod(neighbor, cols)
+                f_score = temp_g_score + abs(row - goal_row) + abs(col - goal_col)
+                heapq.heappush(open_set, (f_score, neighbor))
+
+    return None  # No path found
+
+
+class AStarPlanner:
+    """A* with a preallocated workspace that is reused across queries.
+
+    Cost, parent and closed arrays are allocated once per graph. Instead of
+    clearing them between queries, every query bumps a generation counter and
+    an entry only counts if its stamp matches the current generation. The open
+    set holds plain ints encoding (f_score, -g_score, node id), so ties on
+    f_score are broken towards deeper nodes. Paths have the same length as the
+    ones `astar` returns but may take a different (equally short) route.
+
+    The planner reads cell types from its GridGraph, so changes to the map must
+    go through `planner.graph.set_cell`.
+
+    With a LandmarkTable for the same graph, the estimate is the larger of
+    Manhattan distance and the landmark (ALT) bound, and queries between
+    cells the landmarks show to be disconnected return None without
+    searching.
+    """
+
+    def __init__(self, grid, landmarks=None):
+        self.graph = as_grid_graph(grid)
+        self.landmarks = landmarks
+        size, cols = self.graph.size, self.graph.cols
+        self.g_score = [0] * size
+        self.came_from = [-1] * size
+        self.seen = [0] * size  # Generation in which g_score/came_from were written
+        self.closed = [0] * size  # Generation in which the node was expanded
+        self.generation = 0
+        self.expanded = 0  # Nodes expanded by the last query
+        self._row = [n // cols for n in range(size)]
+        self._col = [n % cols for n in range(size)]
+
+    def plan(self, start, goal):
+        """Same contract as `astar`: path excluding start, or None if unreachable."""
+        if not metrics.enabled:
+            return self._plan(start, goal, None)
+        stats = [0, 0, 0]  # Pops, peak open set, entries left at the end
+        started = time.perf_counter()
+        path = self._plan(start, goal, stats)
+        pops, peak, left = stats
+        metrics.record_search("astar_planner", time.perf_counter() - started, self.expanded,
+                              pops + left - 1 if pops else 0, pops, peak)
+        return path
+
+    def _plan(self, start, goal, stats):
+        graph = self.graph
+        size = graph.size
+        adjacency = graph.adjacency
+        walkable = graph.walkable()
+        g_score, came_from, seen, closed = self.g_score, self.came_from, self.seen, self.closed
+        row_of, col_of = self._row, self._col
+
+        self.generation += 1
+        generation = self.generation
+        start_id, goal_id = graph.node(start), graph.node(goal)
+        goal_row, goal_col = goal
+        bounds = ()  # (landmark distance table, its distance to goal) pairs
+        if self.landmarks is not None:
+            if self.landmarks.separated(start, goal):
+                self.expanded = 0
+                return None
+            bounds = self.landmarks.select(start, goal)
+
+        seen[start_id] = generation
+        g_score[start_id] = 0
+        came_from[start_id] = -1
+        open_set = [start_id]  # (f_score * size + size - g_score) * size + node id
+        expanded = 0
+        heappop, heappush = heapq.heappop, heapq.heappush
+        track = stats is not None
+
+        while open_set:
+            if track:
+                stats[0] += 1
+                if len(open_set) > stats[1]:
+                    stats[1] = len(open_set)
+            current = heappop(open_set) % size
+            if closed[current] == generation:  # Stale heap entry
+                continue
+            closed[current] = generation
+            expanded += 1
+
+            if current == goal_id:
+                self.expanded = expanded
+                if track:
+                    stats[2] = len(open_set)
+                path = []
+                while current != start_id:
+                    path.append((row_of[current], col_of[current]))
+                    current = came_from[current]
+                path.reverse()
+                return path
+
+            temp_g_score = g_score[current] + 1
+            for neighbor in adjacency[current]:
+                if not walkable[neighbor] or closed[neighbor] == generation:
                     continue
-                
-                temp_g_score = g_score[current] + 1  # Cost from start
-                
-                if temp_g_score < g_score[neighbor]:  # Better path found
-                    came_from[neighbor] = current
+                if seen[neighbor] != generation or temp_g_score < g_score[neighbor]:
+                    seen[neighbor] = generation
                     g_score[neighbor] = temp_g_score
-                    f_score[neighbor] = temp_g_score + heuristic(neighbor, goal)
-                    heapq.heappush(open_set, (f_score[neighbor], neighbor))
-    
-    return None  # No path found
+                    came_from[neighbor] = current
+                    h_score = abs(row_of[neighbor] - goal_row) + abs(col_of[neighbor] - goal_col)
+                    for table, to_goal in bounds:  # ALT: |d(L, n) - d(L, goal)| <= d(n, goal)
+                        bound = table[neighbor] - to_goal
+                        if bound < 0:
+                            bound = -bound
+                        if bound > h_score:
+                            h_score = bound
+                    f_score = temp_g_score + h_score
+                    heappush(open_set, (f_score * size + size - temp_g_score) * size + neighbor)
+
+        self.expanded = expanded
+        return None
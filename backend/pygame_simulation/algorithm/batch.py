@@ -0,0 +1,135 @@
+# algorithm/batch.py
+import time
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+
+from algorithm.astar import AStarPlanner
+from algorithm.distance_cache import DistanceCache
+from algorithm.grid import as_grid_graph, GridGraph
+
+
+class BatchWorker:
+    """Per-process planning state shared by every query it answers.
+
+    Queries whose goal is shared by at least `share_goals` queries in the
+    batch are answered from a DistanceCache (one reverse BFS per goal, built
+    the first time a batch asks for that goal, then O(path length) per
+    query); the rest go through a reusable AStarPlanner workspace. Both read
+    the same GridGraph.
+    """
+
+    def __init__(self, grid, share_goals=2):
+        self.graph = as_grid_graph(grid)
+        self.planner = AStarPlanner(self.graph)
+        self.distances = DistanceCache(self.graph, preload=False)
+        self.share_goals = share_goals
+
+    def plan(self, queries):
+        """Plan [(index, start, goal, goal_count), ...] into [(index, path, seconds), ...].
+
+        The reverse BFS for a shared goal is charged to the first query that needs it.
+        """
+        results = []
+        for index, start, goal, goal_count in queries:
+            started = time.perf_counter()
+            if goal_count >= self.share_goals:
+                path = self.distances.path(start, goal)
+            else:
+                path = self.planner.plan(start, goal)
+            results.append((index, path, time.perf_counter() - started))
+        return results
+
+
+_worker = None  # BatchWorker of a pool process, set by _init_worker
+
+
+def _init_worker(cells, shape, share_goals):
+    global _worker
+    _worker = BatchWorker(GridGraph(cells, *shape), share_goals)
+
+
+def _plan_chunk(chunk):
+    return _worker.plan(chunk)
+
+
+class BatchPlanner:
+    """Plan many (start, goal) queries on one map in a single call.
+
+    With `processes` set, queries are fanned out over a process pool that is
+    started once and reused by every `plan` call; each process receives the
+    packed cell array once and builds its own BatchWorker. Queries with the
+    same goal go to the same process so they share one BFS. Without
+    `processes`, everything runs in the calling process.
+
+    Map edits must go through `update_cell`; the pool is restarted so the
+    workers see the new map.
+    """
+
+    def __init__(self, grid, processes=None, share_goals=2):
+        self.graph = as_grid_graph(grid)
+        self.processes = processes
+        self.share_goals = share_goals
+        self._worker = None
+        self._pool = None
+
+    def plan(self, queries):
+        """Return [(path, seconds), ...] in query order.
+
+        `path` follows the `astar` contract (excluding start, None if
+        unreachable) and `seconds` is the time spent on that query alone.
+        """
+        queries = list(queries)
+        goal_counts = defaultdict(int)
+        for _, goal in queries:
+            goal_counts[goal] += 1
+        jobs = [(index, start, goal, goal_counts[goal]) for index, (start, goal) in enumerate(queries)]
+
+        if self.processes:
+            chunks = self._chunks(jobs)
+            results = [r for chunk in self._get_pool().map(_plan_chunk, chunks) for r in chunk]
+        else:
+            if self._worker is None:
+                self._worker = BatchWorker(self.graph, self.share_goals)
+            results = self._worker.plan(jobs)
+
+        ordered = [None] * len(queries)
+        for index, path, seconds in results:
+            ordered[index] = (path, seconds)
+        return ordered
+
+    def update_cell(self, pos, value):
+        """Apply a map edit; cached tables and pool workers are rebuilt on the next plan."""
+        self.graph.set_cell(pos, value)
+        self._worker = None
+        self.close()
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+    def _get_pool(self):
+        if self._pool is None:
+            graph = self.graph
+            self._pool = ProcessPoolExecutor(max_workers=self.processes, initializer=_init_worker,
+                                             initargs=(graph.cells, (graph.rows, graph.cols), self.share_goals))
+        return self._pool
+
+    def _chunks(self, jobs):
+        """Split jobs into a few chunks per process, keeping each goal in one chunk."""
+        by_goal = defaultdict(list)
+        for job in jobs:
+            by_goal[job[2]].append(job)
+        chunks = [[] for _ in range(self.processes * 4)]
+        for group in sorted(by_goal.values(), key=len, reverse=True):  # Largest groups first
+            min(chunks, key=len).extend(group)
+        return [chunk for chunk in chunks if chunk]
+
+
+def plan_batch(grid, queries, processes=None, share_goals=2):
+    """One-off BatchPlanner.plan; keep a BatchPlanner around to reuse the pool."""
+    planner = BatchPlanner(grid, processes=processes, share_goals=share_goals)
+    try:
+        return planner.plan(queries)
+    finally:
+        planner.close()
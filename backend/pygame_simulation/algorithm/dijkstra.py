@@ -1,29 +1,54 @@
-
 # Dijkstra's Algorithm
 import heapq
+import time
+
+import metrics
+from algorithm.grid import as_grid_graph
 
 
 def dijkstras(maze, robot, end):
-    rows, cols = len(maze), len(maze[0])
-    directions = [(-1, 0), (1, 0), (0, -1), (0, 1)]
-    pq = [(0, robot)]
-    distances = {robot: 0}
+    """Shortest path from robot to end over empty cells; `maze` may be a GridGraph."""
+    if metrics.enabled:
+        started = time.perf_counter()
+        stats = [0, 0, 0]  # Pops, peak queue size, entries left at the end
+        path = _dijkstras(maze, robot, end, stats)
+        pops, peak, left = stats
+        metrics.record_search("dijkstra", time.perf_counter() - started, pops, pops + left - 1, pops, peak)
+        return path
+    return _dijkstras(maze, robot, end, None)
+
+
+def _dijkstras(maze, robot, end, stats):
+    graph = as_grid_graph(maze)
+    cols = graph.cols
+    adjacency = graph.adjacency
+    walkable = graph.walkable(strict=True)  # Only empty cells
+    start_id, end_id = graph.node(robot), graph.node(end)
+    pq = [(0, start_id)]
+    distances = {start_id: 0}
     predecessors = {}
 
+    track = stats is not None  # Only pops are counted; pushes follow from what is left
+
     while pq:
+        if track:
+            stats[0] += 1
+            if len(pq) > stats[1]:
+                stats[1] = len(pq)
         cost, current = heapq.heappop(pq)
-        if current == end:
+        if current == end_id:
+            if track:
+                stats[2] = len(pq)
             path = []
             while current in predecessors:
-                path.append(current)
+                path.append(divmod(current, cols))
                 current = predecessors[current]
             path.reverse()
             return path  # Return shortest path
 
-        for d in directions:
-            neighbor = (current[0] + d[0], current[1] + d[1])
-            if 0 <= neighbor[0] < rows and 0 <= neighbor[1] < cols and maze[neighbor[0]][neighbor[1]] == 0:
-                new_cost = cost + 1
+        new_cost = cost + 1
+        for neighbor in adjacency[current]:
+            if walkable[neighbor]:
                 if neighbor not in distances or new_cost < distances[neighbor]:
                     distances[neighbor] = new_cost
                     heapq.heappush(pq, (new_cost, neighbor))
@@ -0,0 +1,156 @@
+# algorithm/distance_cache.py
+from array import array
+from collections import deque
+
+from algorithm.grid import as_grid_graph, PICKING_STATION, PUTAWAY_STATION, SHELF
+
+POINT_OF_INTEREST_TYPES = (PICKING_STATION, PUTAWAY_STATION, SHELF)
+
+
+class DistanceCache:
+    """Exact distances and next hops from every cell to each point of interest.
+
+    One reverse BFS per target (picking/putaway stations, shelves and any AGV
+    home cells passed in) fills a flat distance table and a next-hop table, so
+    `distance` is O(1) and `path` is O(path length). Cells are enterable under
+    the same rule `astar` uses (everything but walls), and paths have the same
+    length as the ones `astar` returns.
+
+    With preload=False no table is built up front (and new shelves or
+    stations are not indexed on edit): each target gets its BFS the first
+    time `distance` or `path` asks for it. Use that when only a few of the
+    points of interest will ever be queried, e.g. on maps with thousands
+    of shelves.
+
+    Map edits must go through `update_cell`, which only rebuilds the targets
+    whose shortest-path trees the edit actually touches.
+    """
+
+    def __init__(self, grid, homes=(), preload=True):
+        self.graph = as_grid_graph(grid)
+        self.preload = preload
+        self.distances = {}  # target node -> array of distances to it, -1 if unreachable
+        self.next_hops = {}  # target node -> array of the next node towards it, -1 if unreachable
+        if preload:
+            for value in POINT_OF_INTEREST_TYPES:
+                for pos in self.graph.positions(value):
+                    self.add_target(pos)
+        for pos in homes:
+            self.add_target(pos)
+
+    @property
+    def targets(self):
+        return [self.graph.coords(node) for node in self.distances]
+
+    def add_target(self, pos):
+        node = self.graph.node(pos)
+        if node not in self.distances:
+            self._build(node)
+
+    def discard_target(self, pos):
+        node = self.graph.node(pos)
+        self.distances.pop(node, None)
+        self.next_hops.pop(node, None)
+
+    def distance(self, source, target):
+        """Shortest path length from source to target, or None if unreachable."""
+        self.add_target(target)
+        dist = self.distances[self.graph.node(target)][self.graph.node(source)]
+        return dist if dist >= 0 else None
+
+    def path(self, source, target):
+        """Same contract as `astar`: path excluding source, or None if unreachable."""
+        self.add_target(target)
+        graph = self.graph
+        target_node = graph.node(target)
+        next_hop = self.next_hops[target_node]
+        current = graph.node(source)
+        if next_hop[current] < 0:
+            return None
+        path = []
+        while current != target_node:
+            current = next_hop[current]
+            path.append(graph.coords(current))
+        return path
+
+    def update_cell(self, pos, value):
+        """Apply a map edit and repair the tables; returns the targets that were rebuilt."""
+        graph = self.graph
+        node = graph.node(pos)
+        walkable = graph.walkable()
+        was_walkable = walkable[node]
+        graph.set_cell(pos, value)
+
+        rebuilt = []
+        if self.preload and value in POINT_OF_INTEREST_TYPES and node not in self.distances:
+            self._build(node)
+            rebuilt.append(pos)
+        if walkable[node] == was_walkable:  # Cell type changed but passability did not
+            return rebuilt
+
+        adjacency = graph.adjacency
+        for target, dist in self.distances.items():
+            if target == node:
+                repaired = False
+            elif walkable[node]:
+                repaired = self._repair_opened(node, dist, self.next_hops[target], adjacency, walkable)
+            else:
+                repaired = self._repair_closed(node, dist, self.next_hops[target], adjacency)
+            if not repaired:
+                self._build(target)
+                rebuilt.append(graph.coords(target))
+        return rebuilt
+
+    def _repair_opened(self, node, dist, next_hop, adjacency, walkable):
+        """Patch the tables in place if opening `node` shortens nothing but itself."""
+        reachable = [n for n in adjacency[node] if dist[n] >= 0]
+        if not reachable:
+            return True  # Still cut off from the target
+        best = min(reachable, key=dist.__getitem__)
+        new_dist = dist[best] + 1
+        for n in adjacency[node]:
+            if walkable[n] and (dist[n] < 0 or dist[n] > new_dist + 1):
+                return False  # The new cell is a shortcut for its neighbors
+        dist[node] = new_dist
+        next_hop[node] = best
+        return True
+
+    def _repair_closed(self, node, dist, next_hop, adjacency):
+        """Patch the tables in place if every cell routed through `node` has an equal detour."""
+        if dist[node] < 0:
+            return True  # Was not reachable, nothing routes through it
+        detours = []
+        for n in adjacency[node]:
+            if next_hop[n] != node:
+                continue
+            detour = next((m for m in adjacency[n] if m != node and 0 <= dist[m] == dist[n] - 1), None)
+            if detour is None:
+                return False
+            detours.append((n, detour))
+        for n, detour in detours:
+            next_hop[n] = detour
+        dist[node] = -1
+        next_hop[node] = -1
+        return True
+
+    def _build(self, target):
+        """Reverse BFS from target over enterable cells."""
+        graph = self.graph
+        adjacency = graph.adjacency
+        walkable = graph.walkable()
+        dist = array('i', [-1]) * graph.size
+        next_hop = array('i', [-1]) * graph.size
+        if walkable[target]:
+            dist[target] = 0
+            next_hop[target] = target
+            queue = deque([target])
+            while queue:
+                current = queue.popleft()
+                step = dist[current] + 1
+                for neighbor in adjacency[current]:
+                    if dist[neighbor] < 0 and walkable[neighbor]:
+                        dist[neighbor] = step
+                        next_hop[neighbor] = current
+                        queue.append(neighbor)
+        self.distances[target] = dist
+        self.next_hops[target] = next_hop
@@ -0,0 +1,143 @@
+# algorithm/dstar_lite.py
+import heapq
+
+from algorithm.grid import as_grid_graph
+
+INF = float('inf')
+
+
+class DStarLite:
+    """Incremental replanning for one AGV (D* Lite, Koenig & Likhachev 2002).
+
+    The search runs backwards from the goal and keeps its g/rhs values between
+    calls. When cells change, only the vertices whose incoming edge costs
+    changed are re-queued, and `plan` repairs the part of the search tree that
+    the change actually invalidates. `advance` moves the AGV along without
+    discarding anything.
+
+    Walkability matches `astar` (everything but walls). Keep one instance per
+    AGV; planners can share a GridGraph as long as every edit is reported to
+    each of them with `cell_changed` (or made through `update_cell`).
+    """
+
+    def __init__(self, grid, start, goal):
+        self.graph = as_grid_graph(grid)
+        size = self.graph.size
+        self.g = [INF] * size
+        self.rhs = [INF] * size
+        self.open_set = []  # (k1, k2, node) entries, stale ones skipped on pop
+        self.keys = {}  # Node -> key of its live open_set entry
+        self.km = 0
+        self.start = self.last = self.graph.node(start)
+        self.goal = self.graph.node(goal)
+        self.expanded = 0  # Vertices expanded by the last plan()
+        cols = self.graph.cols
+        self._row = [n // cols for n in range(size)]
+        self._col = [n % cols for n in range(size)]
+
+        self.rhs[self.goal] = 0
+        self._push(self.goal)
+
+    def advance(self, pos):
+        """Report that the AGV moved to pos."""
+        node = self.graph.node(pos)
+        self.km += self._heuristic(self.last, node)
+        self.last = self.start = node
+
+    def update_cell(self, pos, value):
+        """Edit the map and queue the repair."""
+        self.graph.set_cell(pos, value)
+        self.cell_changed(pos)
+
+    def cell_changed(self, pos):
+        """Queue the repair for a cell whose walkability may have changed."""
+        # Entering the cell is what changed, so only its neighbors' rhs values move
+        for neighbor in self.graph.adjacency[self.graph.node(pos)]:
+            self._update_vertex(neighbor)
+
+    def plan(self):
+        """Repair the search and return the path from the current start, like `astar`."""
+        self._compute_shortest_path()
+        if self.g[self.start] == INF:
+            return None
+
+        graph, g, walkable = self.graph, self.g, self.graph.walkable()
+        path = []
+        current = self.start
+        while current != self.goal:
+            current = min((n for n in graph.adjacency[current] if walkable[n]), key=g.__getitem__)
+            path.append(graph.coords(current))
+        return path
+
+    def _heuristic(self, a, b):
+        return abs(self._row[a] - self._row[b]) + abs(self._col[a] - self._col[b])
+
+    def _key(self, node):
+        g, rhs = self.g[node], self.rhs[node]
+        best = g if g < rhs else rhs
+        start = self.start
+        return (best + abs(self._row[start] - self._row[node]) + abs(self._col[start] - self._col[node]) + self.km, best)
+
+    def _push(self, node):
+        key = self._key(node)
+        self.keys[node] = key
+        heapq.heappush(self.open_set, (key[0], key[1], node))
+
+    def _update_vertex(self, node):
+        if node != self.goal:
+            self._recompute_rhs(node)
+        self._requeue(node)
+
+    def _recompute_rhs(self, node):
+        g, walkable = self.g, self.graph.walkable()
+        self.rhs[node] = min((g[n] + 1 for n in self.graph.adjacency[node] if walkable[n]), default=INF)
+
+    def _requeue(self, node):
+        """Keep node in the open set exactly while it is locally inconsistent."""
+        if self.g[node] != self.rhs[node]:
+            self._push(node)
+        else:
+            self.keys.pop(node, None)
+
+    def _top(self):
+        """Smallest live key in the open set, dropping stale entries."""
+        open_set, keys = self.open_set, self.keys
+        while open_set:
+            k1, k2, node = open_set[0]
+            if keys.get(node) == (k1, k2):
+                return (k1, k2), node
+            heapq.heappop(open_set)
+        return (INF, INF), None
+
+    def _compute_shortest_path(self):
+        g, rhs, adjacency = self.g, self.rhs, self.graph.adjacency
+        walkable = self.graph.walkable()
+        start, goal = self.start, self.goal
+        expanded = 0
+        while True:
+            key, node = self._top()
+            if node is None or rhs[start] == g[start] and key >= self._key(start):
+                break
+            expanded += 1
+            new_key = self._key(node)
+            if key < new_key:
+                self._push(node)
+            elif g[node] > rhs[node]:  # Overconsistent: settle it and relax its predecessors
+                g[node] = rhs[node]
+                del self.keys[node]
+                if walkable[node]:
+                    through = g[node] + 1
+                    for neighbor in adjacency[node]:
+                        if neighbor != goal and through < rhs[neighbor]:
+                            rhs[neighbor] = through
+                            self._requeue(neighbor)
+            else:  # Underconsistent: raise it, re-derive whoever relied on it
+                relied_on = g[node] + 1
+                g[node] = INF
+                self._update_vertex(node)
+                if walkable[node]:
+                    for neighbor in adjacency[node]:
+                        if neighbor != goal and rhs[neighbor] == relied_on:
+                            self._recompute_rhs(neighbor)
+                            self._requeue(neighbor)
+        self.expanded = expanded
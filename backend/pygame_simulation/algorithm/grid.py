@@ -0,0 +1,109 @@
+# algorithm/grid.py
+import numpy as np
+
+# Cell types as stored in MAZE
+EMPTY = 0
+WALL = 1
+PICKING_STATION = 2
+PUTAWAY_STATION = 3
+SHELF = 4
+CELL_TYPES = (EMPTY, WALL, PICKING_STATION, PUTAWAY_STATION, SHELF)
+
+DIRECTIONS = [(-1, 0), (1, 0), (0, -1), (0, 1)]  # Up, Down, Left, Right
+
+
+class GridGraph:
+    """Compact 4-connected grid graph with flat integer node ids (row * cols + col)."""
+
+    def __init__(self, cells, rows, cols):
+        self.rows, self.cols = rows, cols
+        self.size = rows * cols
+        self.cells = np.ascontiguousarray(cells, dtype=np.uint8).reshape(self.size)
+        self.passable = self.cells != WALL
+
+        # Neighbor index in Up, Down, Left, Right order, -1 where the move leaves the grid
+        ids = np.arange(self.size, dtype=np.int32).reshape(rows, cols)
+        neighbors = np.full((rows, cols, 4), -1, dtype=np.int32)
+        neighbors[1:, :, 0] = ids[:-1, :]
+        neighbors[:-1, :, 1] = ids[1:, :]
+        neighbors[:, 1:, 2] = ids[:, :-1]
+        neighbors[:, :-1, 3] = ids[:, 1:]
+        self.neighbors = neighbors.reshape(self.size, 4)
+
+        self._adjacency = None
+        self._flags = {}
+        self.version = 0
+
+    @classmethod
+    def from_maze(cls, maze):
+        """Build a graph from a list-of-lists maze (or any 2D array of cell values)."""
+        cells = np.asarray(maze, dtype=np.uint8)
+        rows, cols = cells.shape
+        return cls(cells, rows, cols)
+
+    def node(self, pos):
+        """Flat node id of a (row, col) position."""
+        return pos[0] * self.cols + pos[1]
+
+    def coords(self, node):
+        """(row, col) position of a flat node id."""
+        return divmod(node, self.cols)
+
+    def in_bounds(self, pos):
+        return 0 <= pos[0] < self.rows and 0 <= pos[1] < self.cols
+
+    def cell(self, pos):
+        return int(self.cells[self.node(pos)])
+
+    def set_cell(self, pos, value):
+        """Change a cell type in place, keeping the passability tables in sync."""
+        if value not in CELL_TYPES:
+            raise ValueError(f"unknown cell type {value!r} for {tuple(pos)}; expected one of {CELL_TYPES}")
+        node = self.node(pos)
+        self.cells[node] = value
+        self.passable[node] = value != WALL
+        for strict, flags in self._flags.items():
+            flags[node] = value == EMPTY if strict else value != WALL
+        self.version += 1
+
+    @property
+    def adjacency(self):
+        """Per-node tuples of in-bounds neighbor ids, for tight pure-Python loops."""
+        if self._adjacency is None:
+            cols = self.cols
+            adjacency = [(n - cols, n + cols, n - 1, n + 1) for n in range(self.size)]
+            # Only border cells lose neighbors; patch those from the neighbor index
+            border = set(range(cols)) | set(range(self.size - cols, self.size))
+            border.update(range(0, self.size, cols))
+            border.update(range(cols - 1, self.size, cols))
+            border = sorted(border)
+            for n, row in zip(border, self.neighbors[border].tolist()):
+                adjacency[n] = tuple(m for m in row if m >= 0)
+            self._adjacency = adjacency
+        return self._adjacency
+
+    def walkable(self, strict=False):
+        """Flat bytearray of enterable cells.
+
+        By default every non-wall cell is enterable (the rule `astar` uses);
+        with strict=True only empty cells are (the rule `dijkstras` and `aco` use).
+        """
+        flags = self._flags.get(strict)
+        if flags is None:
+            mask = self.cells == EMPTY if strict else self.passable
+            flags = self._flags[strict] = bytearray(mask.astype(np.uint8).tobytes())
+        return flags
+
+    def positions(self, value):
+        """All (row, col) positions holding the given cell type, in row-major order."""
+        return [self.coords(int(n)) for n in np.flatnonzero(self.cells == value)]
+
+    def to_maze(self):
+        return self.cells.reshape(self.rows, self.cols).tolist()
+
+
+def as_grid_graph(grid):
+    """Return grid unchanged if it already is a GridGraph, otherwise wrap the maze."""
+    if isinstance(grid, GridGraph):
+        return grid
+    return GridGraph.from_maze(grid)
@@ -0,0 +1,269 @@
+# algorithm/hpa.py
+import heapq
+from collections import deque
+
+from algorithm.grid import as_grid_graph
+
+
+class HierarchicalPlanner:
+    """Hierarchical path planning (HPA*) for large grids.
+
+    The grid is cut into `cluster_size` x `cluster_size` clusters. Along every
+    border between two clusters, each maximal run of cells that is open on
+    both sides becomes an entrance with one transition (two for runs of 6 or
+    more cells, at the ends). Transition cells are the abstract nodes; they are
+    linked across borders with cost 1 and, inside each cluster, by their exact
+    intra-cluster BFS distance. Queries connect start and goal to the
+    entrances of their own clusters, search the abstract graph, and refine each
+    abstract edge with a BFS restricted to one cluster.
+
+    Walkability matches `astar` (everything but walls). Paths are near-optimal,
+    not guaranteed shortest. Map edits must go through `update_cell`, which
+    only rebuilds the clusters around the edited cell.
+    """
+
+    def __init__(self, grid, cluster_size=16):
+        self.graph = as_grid_graph(grid)
+        self.cluster_size = cluster_size
+        self.cluster_rows = -(-self.graph.rows // cluster_size)
+        self.cluster_cols = -(-self.graph.cols // cluster_size)
+        self.transitions = {}  # Border key -> list of (cell, cell) pairs across it
+        self.inter_edges = {}  # Abstract node -> set of abstract nodes across a border
+        self.intra_edges = {}  # Cluster id -> {abstract node: {abstract node: cost}}
+        self._edges = {}  # Abstract node -> merged [(neighbor, cost)] list, filled lazily
+        self.expanded = 0  # Abstract nodes expanded by the last query
+
+        for cluster_row in range(self.cluster_rows):
+            for cluster_col in range(self.cluster_cols):
+                for border in self._borders(cluster_row, cluster_col):
+                    if border not in self.transitions:
+                        self._build_border(border)
+        for cluster in range(self.cluster_rows * self.cluster_cols):
+            self._build_cluster(cluster)
+
+    def cluster_of(self, pos):
+        return (pos[0] // self.cluster_size) * self.cluster_cols + pos[1] // self.cluster_size
+
+    def update_cell(self, pos, value):
+        """Apply a map edit and rebuild the affected clusters; returns their ids."""
+        was_walkable = self.graph.walkable()[self.graph.node(pos)]
+        self.graph.set_cell(pos, value)
+        if self.graph.walkable()[self.graph.node(pos)] == was_walkable:
+            return []
+
+        size = self.cluster_size
+        cluster_row, cluster_col = pos[0] // size, pos[1] // size
+        affected = {cluster_row * self.cluster_cols + cluster_col}
+        # A cell on a cluster edge can open or close an entrance on that border
+        for border in self._borders(cluster_row, cluster_col):
+            if self._on_border(pos, border):
+                self._build_border(border)
+                affected.update(self._border_clusters(border))
+        for cluster in sorted(affected):
+            self._build_cluster(cluster)
+        return sorted(affected)
+
+    def plan(self, start, goal):
+        """Same contract as `astar`: path excluding start, or None if unreachable."""
+        graph = self.graph
+        start_id, goal_id = graph.node(start), graph.node(goal)
+        self.expanded = 0
+        if start_id == goal_id:
+            return []
+        if not graph.walkable()[goal_id]:
+            return None
+
+        start_cluster, goal_cluster = self.cluster_of(start), self.cluster_of(goal)
+        start_edges = self._connect(start_id, start_cluster, goal_id if goal_cluster == start_cluster else None)
+        goal_edges = self._connect(goal_id, goal_cluster, None)
+
+        abstract_path = self._search(start_id, goal_id, start_edges, goal_edges)
+        if abstract_path is None:
+            return None
+
+        path = []
+        for u, v in zip(abstract_path, abstract_path[1:]):
+            path.extend(self._refine(u, v))
+        return path
+
+    def _search(self, start_id, goal_id, start_edges, goal_edges):
+        """A* over the abstract graph with start and goal temporarily attached."""
+        cols = self.graph.cols
+        goal_row, goal_col = divmod(goal_id, cols)
+        open_set = [(0, 0, start_id)]  # (f_score, -g_score, node): ties go to deeper nodes
+        came_from = {start_id: None}
+        g_score = {start_id: 0}
+        closed = set()
+
+        while open_set:
+            _, _, current = heapq.heappop(open_set)
+            if current in closed:
+                continue
+            closed.add(current)
+            self.expanded += 1
+
+            if current == goal_id:
+                path = []
+                while current is not None:
+                    path.append(current)
+                    current = came_from[current]
+                path.reverse()
+                return path
+
+            if current == start_id:
+                edges = list(start_edges.items())
+                edges.extend((n, 1) for n in self.inter_edges.get(current, ()))
+            else:
+                edges = self._edges.get(current)
+                if edges is None:
+                    edges = self._merge_edges(current)
+            if current in goal_edges:
+                edges = edges + [(goal_id, goal_edges[current])]
+
+            for neighbor, cost in edges:
+                if neighbor in closed:
+                    continue
+                temp_g_score = g_score[current] + cost
+                if temp_g_score < g_score.get(neighbor, float('inf')):
+                    came_from[neighbor] = current
+                    g_score[neighbor] = temp_g_score
+                    row, col = divmod(neighbor, cols)
+                    f_score = temp_g_score + abs(row - goal_row) + abs(col - goal_col)
+                    heapq.heappush(open_set, (f_score, -temp_g_score, neighbor))
+
+        return None
+
+    def _merge_edges(self, node):
+        cluster = self.cluster_of(divmod(node, self.graph.cols))
+        edges = list(self.intra_edges[cluster].get(node, {}).items())
+        edges.extend((n, 1) for n in self.inter_edges.get(node, ()))
+        self._edges[node] = edges
+        return edges
+
+    def _connect(self, node, cluster, other):
+        """Distances from node to the entrances of its cluster (and to `other` if given)."""
+        distances, _ = self._cluster_bfs(node, cluster)
+        targets = list(self.intra_edges[cluster])
+        if other is not None:
+            targets.append(other)
+        return {t: distances[t] for t in targets if t in distances and t != node}
+
+    def _refine(self, u, v):
+        """Concrete cells from u (excluded) to v (included) for one abstract edge."""
+        cols = self.graph.cols
+        (ur, uc), (vr, vc) = divmod(u, cols), divmod(v, cols)
+        if abs(ur - vr) + abs(uc - vc) == 1:  # Border crossing or adjacent cells
+            return [(vr, vc)]
+        _, parents = self._cluster_bfs(u, self.cluster_of((ur, uc)), stop=v)
+        cells = []
+        while v != u:
+            cells.append(divmod(v, cols))
+            v = parents[v]
+        cells.reverse()
+        return cells
+
+    def _cluster_bfs(self, source, cluster, stop=None):
+        """BFS from source over walkable cells of one cluster."""
+        graph = self.graph
+        cols, size = graph.cols, self.cluster_size
+        row0, col0 = (cluster // self.cluster_cols) * size, (cluster % self.cluster_cols) * size
+        row1, col1 = row0 + size, col0 + size
+        adjacency, walkable = graph.adjacency, graph.walkable()
+        distances, parents = {source: 0}, {source: None}
+        queue = deque([source])
+        while queue:
+            current = queue.popleft()
+            if current == stop:
+                break
+            step = distances[current] + 1
+            for neighbor in adjacency[current]:
+                if neighbor in distances or not walkable[neighbor]:
+                    continue
+                row, col = divmod(neighbor, cols)
+                if row0 <= row < row1 and col0 <= col < col1:
+                    distances[neighbor] = step
+                    parents[neighbor] = current
+                    queue.append(neighbor)
+        return distances, parents
+
+    def _build_cluster(self, cluster):
+        """Recompute the intra-cluster edges between the cluster's entrance cells."""
+        entrances = set()
+        for border in self._borders(cluster // self.cluster_cols, cluster % self.cluster_cols):
+            for pair in self.transitions[border]:
+                entrances.update(n for n in pair if self.cluster_of(divmod(n, self.graph.cols)) == cluster)
+
+        for node in set(self.intra_edges.get(cluster, ())) | entrances:
+            self._edges.pop(node, None)
+
+        edges = {}
+        for entrance in entrances:
+            distances, _ = self._cluster_bfs(entrance, cluster)
+            edges[entrance] = {other: distances[other] for other in entrances
+                               if other != entrance and other in distances}
+        self.intra_edges[cluster] = edges
+
+    def _build_border(self, border):
+        """Find the entrances along one border and replace its transitions."""
+        for a, b in self.transitions.get(border, ()):
+            self.inter_edges.get(a, set()).discard(b)
+            self.inter_edges.get(b, set()).discard(a)
+
+        graph = self.graph
+        walkable = graph.walkable()
+        pairs = []
+        run = []
+        for a, b in self._border_cells(border) + [(None, None)]:
+            if a is not None and walkable[a] and walkable[b]:
+                run.append((a, b))
+                continue
+            if run:
+                if len(run) < 6:
+                    pairs.append(run[len(run) // 2])
+                else:
+                    pairs.extend((run[0], run[-1]))
+                run = []
+
+        for a, b in pairs:
+            self.inter_edges.setdefault(a, set()).add(b)
+            self.inter_edges.setdefault(b, set()).add(a)
+        self.transitions[border] = pairs
+
+    def _borders(self, cluster_row, cluster_col):
+        """Keys of the borders of a cluster: ('right' | 'down', cluster_row, cluster_col) of the left/top cluster."""
+        borders = []
+        if cluster_col > 0:
+            borders.append(("right", cluster_row, cluster_col - 1))
+        if cluster_col < self.cluster_cols - 1:
+            borders.append(("right", cluster_row, cluster_col))
+        if cluster_row > 0:
+            borders.append(("down", cluster_row - 1, cluster_col))
+        if cluster_row < self.cluster_rows - 1:
+            borders.append(("down", cluster_row, cluster_col))
+        return borders
+
+    def _border_clusters(self, border):
+        side, cluster_row, cluster_col = border
+        first = cluster_row * self.cluster_cols + cluster_col
+        return (first, first + 1) if side == "right" else (first, first + self.cluster_cols)
+
+    def _border_cells(self, border):
+        """(cell, cell) node pairs facing each other across a border."""
+        side, cluster_row, cluster_col = border
+        graph, size = self.graph, self.cluster_size
+        if side == "right":
+            col = (cluster_col + 1) * size - 1
+            rows = range(cluster_row * size, min((cluster_row + 1) * size, graph.rows))
+            return [(graph.node((row, col)), graph.node((row, col + 1))) for row in rows]
+        row = (cluster_row + 1) * size - 1
+        cols = range(cluster_col * size, min((cluster_col + 1) * size, graph.cols))
+        return [(graph.node((row, col)), graph.node((row + 1, col))) for col in cols]
+
+    def _on_border(self, pos, border):
+        side, cluster_row, cluster_col = border
+        size = self.cluster_size
+        if side == "right":
+            return pos[1] in ((cluster_col + 1) * size - 1, (cluster_col + 1) * size) and \
+                cluster_row * size <= pos[0] < (cluster_row + 1) * size
+        return pos[0] in ((cluster_row + 1) * size - 1, (cluster_row + 1) * size) and \
+            cluster_col * size <= pos[1] < (cluster_col + 1) * size
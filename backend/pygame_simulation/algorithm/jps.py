@@ -0,0 +1,176 @@
+# algorithm/jps.py
+import heapq
+from array import array
+
+from algorithm.grid import as_grid_graph
+
+
+def jps(grid, start, goal):
+    """Find the shortest path from start to goal using Jump Point Search.
+
+    Drop-in replacement for `astar` on 4-connected uniform-cost grids: same
+    walkability rule, same return contract, paths of the same length.
+    """
+    return JumpPointPlanner(grid).plan(start, goal)
+
+
+class JumpPointPlanner:
+    """Jump Point Search for 4-connected grids.
+
+    Straight runs of symmetric cells are skipped, and only the cells where a
+    turn can be forced (jump points) reach the open set. The goal-independent
+    part of every scan is precomputed per map (JPS+ style): for each cell and
+    direction, how many open cells follow and where the next jump point is.
+    A jump is then O(1); only the goal row/column needs checking per query.
+    Tables are rebuilt lazily when the graph version changes, so map edits
+    must go through `planner.graph.set_cell`.
+
+    All tables use a copy of the grid padded with a one-cell wall border, so
+    moves are +-1 along a row and +-width along a column with no bounds checks.
+    """
+
+    def __init__(self, grid):
+        self.graph = as_grid_graph(grid)
+        self.width = self.graph.cols + 2
+        self.expanded = 0  # Jump points expanded by the last query
+        self._version = None
+        self._goal = None
+
+    def plan(self, start, goal):
+        """Same contract as `astar`: path excluding start, or None if unreachable."""
+        if self._version != self.graph.version:
+            self._build_tables()
+        width = self.width
+        self._goal = goal_id = (goal[0] + 1) * width + goal[1] + 1
+        start_id = (start[0] + 1) * width + start[1] + 1
+        self.expanded = 0
+        if start_id == goal_id:
+            return []
+        goal_row, goal_col = divmod(goal_id, width)
+
+        open_set = [(0, start_id)]
+        came_from = {start_id: None}
+        g_score = {start_id: 0}
+        closed = set()
+
+        while open_set:
+            _, current = heapq.heappop(open_set)
+            if current in closed:
+                continue
+            closed.add(current)
+            self.expanded += 1
+
+            if current == goal_id:
+                return self._reconstruct(came_from, current)
+
+            for neighbor in self._successors(current, came_from[current]):
+                if neighbor in closed:
+                    continue
+                step = abs(neighbor - current)
+                temp_g_score = g_score[current] + (step if step < width else step // width)
+                if temp_g_score < g_score.get(neighbor, float('inf')):
+                    came_from[neighbor] = current
+                    g_score[neighbor] = temp_g_score
+                    row, col = divmod(neighbor, width)
+                    f_score = temp_g_score + abs(row - goal_row) + abs(col - goal_col)
+                    heapq.heappush(open_set, (f_score, neighbor))
+
+        return None  # No path found
+
+    def _build_tables(self):
+        graph = self.graph
+        rows, cols, width = graph.rows, graph.cols, self.width
+        size = width * (rows + 2)
+        walkable = graph.walkable()
+        is_open = bytearray(size)
+        for row in range(rows):
+            offset = (row + 1) * width + 1
+            is_open[offset:offset + cols] = walkable[row * cols:(row + 1) * cols]
+
+        # reach[d][p]: open cells in a row from p in direction d before a wall
+        # jump[d][p]:  first goal-independent jump point from p in direction d, or -1
+        reach = {d: array('i', [0]) * size for d in (1, -1, width, -width)}
+        jump = {d: array('i', [-1]) * size for d in (1, -1, width, -width)}
+
+        for step in (1, -1):  # Row scans stop where a perpendicular move is forced
+            reach_d, jump_d = reach[step], jump[step]
+            for row in range(1, rows + 1):
+                first, last = row * width + 1, row * width + cols
+                for p in (range(last, first - 1, -1) if step == 1 else range(first, last + 1)):
+                    q = p + step
+                    if is_open[q]:
+                        reach_d[p] = reach_d[q] + 1
+                        forced = (is_open[q - width] and not is_open[p - width]) or \
+                            (is_open[q + width] and not is_open[p + width])
+                        jump_d[p] = q if forced else jump_d[q]
+
+        jump_left, jump_right = jump[-1], jump[1]
+        for step in (width, -width):  # Column scans also stop wherever a row scan would
+            reach_d, jump_d = reach[step], jump[step]
+            cells = range(size - width - 1, width - 1, -1) if step == width else range(width, size - width)
+            for p in cells:
+                q = p + step
+                if is_open[q]:
+                    reach_d[p] = reach_d[q] + 1
+                    forced = (is_open[q - 1] and not is_open[p - 1]) or (is_open[q + 1] and not is_open[p + 1]) or \
+                        jump_left[q] >= 0 or jump_right[q] >= 0
+                    jump_d[p] = q if forced else jump_d[q]
+
+        self._reach, self._jump = reach, jump
+        self._version = graph.version
+
+    def _successors(self, node, parent):
+        width = self.width
+        if parent is None:
+            directions = (-width, width, -1, 1)
+        elif node // width == parent // width:  # Arrived moving along a row
+            step = 1 if node > parent else -1
+            directions = (step, -width, width)
+        else:  # Arrived moving along a column
+            step = width if node > parent else -width
+            directions = (step, -1, 1)
+
+        successors = []
+        for direction in directions:
+            jump_point = self._jump_from(node, direction)
+            if jump_point >= 0:
+                successors.append(jump_point)
+        return successors
+
+    def _jump_from(self, node, step):
+        """Next jump point from node in direction step, taking the goal into account."""
+        width, goal = self.width, self._goal
+        static = self._jump[step][node]
+        reach = self._reach[step][node]
+        if step in (1, -1):
+            if goal // width != node // width:
+                return static
+            distance = (goal - node) * step
+        else:
+            distance = (goal // width - node // width) * (1 if step > 0 else -1)
+        if not 0 < distance <= reach:
+            return static  # Goal row/column not ahead of us on this scan
+        if static >= 0 and (static - node) // step < distance:
+            return static
+
+        stop = node + distance * step
+        if stop == goal:
+            return stop
+        # Crossing the goal row: stop if a row scan from here would run into the goal
+        towards = 1 if goal > stop else -1
+        return stop if self._reach[towards][stop] >= (goal - stop) * towards else static
+
+    def _reconstruct(self, came_from, node):
+        """Expand the chain of jump points into the full cell-by-cell path."""
+        width = self.width
+        path = []
+        while came_from[node] is not None:
+            parent = came_from[node]
+            step = 1 if abs(node - parent) < width else width
+            step = step if node > parent else -step
+            while node != parent:
+                row, col = divmod(node, width)
+                path.append((row - 1, col - 1))
+                node -= step
+        path.reverse()
+        return path
@@ -0,0 +1,193 @@
+# algorithm/landmarks.py
+from array import array
+from collections import deque
+import os
+
+import numpy as np
+
+from algorithm.grid import as_grid_graph
+
+TABLE_SUFFIX = ".landmarks.npz"
+
+
+def table_path(map_path):
+    """Where the landmark tables of a map file are stored: next to it, e.g. maps/foo.landmarks.npz."""
+    return os.path.splitext(map_path)[0] + TABLE_SUFFIX
+
+
+class LandmarkTable:
+    """Exact distances from a few landmark cells, for ALT (A*, landmarks, triangle inequality) heuristics.
+
+    For any landmark L the triangle inequality gives
+    |d(L, goal) - d(L, n)| <= d(n, goal), so the largest such bound over all
+    landmarks is an admissible, consistent estimate that, unlike Manhattan
+    distance, knows about rack rows and walls. One BFS per landmark fills a
+    row of `distances` (-1 where unreachable).
+
+    Landmarks default to the walkable cells nearest the four map corners
+    plus cells chosen by farthest-point selection (each next landmark is
+    the cell farthest from all landmarks so far), up to `count`. Pass
+    `landmarks` to use specific cells, e.g. the stations. Per query only the
+    `active` landmarks giving the best bound between start and goal are
+    consulted, which keeps the per-node cost of the estimate small.
+
+    The tables remember the passable cells they were built for. Closing
+    cells only makes real distances longer, so the bound stays admissible
+    and the tables are kept; opening a cell can make them overestimate, so
+    `refresh` (called before every query) rebuilds them.
+    """
+
+    def __init__(self, grid, count=8, landmarks=None, active=4):
+        self.graph = as_grid_graph(grid)
+        self.count = count
+        self.active = active
+        self.requested = landmarks
+        self.landmarks = []
+        self.distances = np.zeros((0, self.graph.size), dtype=np.int32)
+        self.rebuilds = 0
+        self.build()
+
+    def build(self):
+        graph = self.graph
+        self.version = graph.version
+        self._passable = graph.passable.copy()
+        self.rebuilds += 1
+        if self.requested is not None:
+            self.landmarks = [graph.node(pos) for pos in self.requested]
+            self._set_distances(np.array([self._bfs(node) for node in self.landmarks], dtype=np.int32))
+            return
+
+        walkable = np.flatnonzero(graph.passable)
+        self.landmarks, tables = [], []
+        if not len(walkable):
+            self._set_distances(np.zeros((0, graph.size), dtype=np.int32))
+            return
+        rows, cols = walkable // graph.cols, walkable % graph.cols
+        for corner_row, corner_col in ((0, 0), (0, graph.cols - 1), (graph.rows - 1, 0),
+                                       (graph.rows - 1, graph.cols - 1)):
+            node = int(walkable[np.argmin(abs(rows - corner_row) + abs(cols - corner_col))])
+            if node not in self.landmarks and len(self.landmarks) < self.count:
+                self.landmarks.append(node)
+                tables.append(self._bfs(node))
+        nearest = np.min(tables, axis=0) if tables else None
+        while len(self.landmarks) < self.count:
+            # Farthest reachable cell from every landmark so far
+            candidates = np.where(nearest >= 0, nearest, -1)
+            node = int(np.argmax(candidates))
+            if candidates[node] <= 0:
+                break
+            self.landmarks.append(node)
+            table = self._bfs(node)
+            tables.append(table)
+            nearest = np.where((table >= 0) & ((nearest < 0) | (table < nearest)), table, nearest)
+        self._set_distances(np.array(tables, dtype=np.int32))
+
+    def _set_distances(self, distances):
+        self.distances = distances
+        self._tables = [array("i", row.tobytes()) for row in distances]  # Fast per-node lookups
+
+    def refresh(self):
+        """Rebuild if a cell was opened since the tables were built; returns True if it did."""
+        graph = self.graph
+        if graph.version == self.version:
+            return False
+        self.version = graph.version
+        if np.any(graph.passable & ~self._passable):
+            self.build()
+            return True
+        return False
+
+    def select(self, start, goal):
+        """[(distance table, distance to goal), ...] of the landmarks with the best bound for this query.
+
+        The estimate for a node n is max(|table[n] - to_goal|) over the
+        pairs. Only landmarks that reach the goal are returned; a node they
+        do not reach cannot reach the goal either, so its value is moot.
+        Empty if either cell is a wall (callers fall back to Manhattan).
+        """
+        self.refresh()
+        graph = self.graph
+        start_id, goal_id = graph.node(start), graph.node(goal)
+        if not len(self.landmarks) or not (graph.passable[start_id] and graph.passable[goal_id]):
+            return []
+        to_start, to_goal = self.distances[:, start_id], self.distances[:, goal_id]
+        useful = np.flatnonzero((to_goal >= 0) & (to_start >= 0))
+        best = useful[np.argsort(-np.abs(to_start[useful] - to_goal[useful]), kind="stable")[:self.active]]
+        return [(self._tables[i], int(to_goal[i])) for i in best]
+
+    def lower_bound(self, node_pos, goal):
+        """Best landmark bound on the distance between two cells (0 if no landmark reaches both)."""
+        self.refresh()
+        a, b = self.distances[:, self.graph.node(node_pos)], self.distances[:, self.graph.node(goal)]
+        both = (a >= 0) & (b >= 0)
+        return int(np.abs(a[both] - b[both]).max()) if both.any() else 0
+
+    def separated(self, start, goal):
+        """True if some landmark reaches exactly one of the two cells, i.e. no path can exist.
+
+        Only decided for two passable cells: the landmarks never reach a
+        wall, yet a search may still start on one (an AGV whose cell was
+        closed under it), so a wall endpoint gives False.
+        """
+        self.refresh()
+        graph = self.graph
+        start_id, goal_id = graph.node(start), graph.node(goal)
+        if not len(self.landmarks) or not (graph.passable[start_id] and graph.passable[goal_id]):
+            return False
+        reach = self.distances >= 0
+        return bool(np.any(reach[:, start_id] != reach[:, goal_id]))
+
+    def save(self, path):
+        """Store the tables next to a map (a .npz file); `load` checks they still match the cells."""
+        np.savez_compressed(path, landmarks=np.array(self.landmarks, dtype=np.int64), distances=self.distances,
+                            passable=self._passable, count=self.count, active=self.active)
+
+    @classmethod
+    def load(cls, path, grid):
+        """Tables saved for this exact map, or None if the file is missing or the passable cells differ."""
+        graph = as_grid_graph(grid)
+        try:
+            with np.load(path) as data:
+                passable, landmarks, distances = data["passable"], data["landmarks"], data["distances"]
+                count, active = int(data["count"]), int(data["active"])
+        except (OSError, KeyError, ValueError):
+            return None
+        if passable.shape != graph.passable.shape or not np.array_equal(passable, graph.passable):
+            return None
+        table = cls.__new__(cls)
+        table.graph = graph
+        table.count = count
+        table.active = active
+        table.requested = None
+        table.landmarks = [int(node) for node in landmarks]
+        table._set_distances(distances.astype(np.int32))
+        table.version = graph.version
+        table._passable = passable
+        table.rebuilds = 0
+        return table
+
+    @classmethod
+    def for_map(cls, grid, path, count=8):
+        """Load the tables stored at `path`, or build and store them if they are missing or stale."""
+        table = cls.load(path, grid)
+        if table is None:
+            table = cls(grid, count=count)
+            table.save(path)
+        return table
+
+    def _bfs(self, source):
+        graph = self.graph
+        adjacency = graph.adjacency
+        walkable = graph.walkable()
+        dist = [-1] * graph.size
+        if walkable[source]:
+            dist[source] = 0
+            queue = deque([source])
+            while queue:
+                current = queue.popleft()
+                step = dist[current] + 1
+                for neighbor in adjacency[current]:
+                    if dist[neighbor] < 0 and walkable[neighbor]:
+                        dist[neighbor] = step
+                        queue.append(neighbor)
+        return np.array(dist, dtype=np.int32)
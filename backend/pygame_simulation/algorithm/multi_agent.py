@@ -0,0 +1,171 @@
+# algorithm/multi_agent.py
+from collections import deque
+import heapq
+
+from algorithm.distance_cache import DistanceCache
+
+
+class CooperativePlanner:
+    """Conflict-free paths for many AGVs (cooperative A* with a reservation table).
+
+    Agents are planned one after another in priority order. Each one runs a
+    space-time A* over (cell, timestep) states, where every step is a move to
+    a neighbor or a wait, and avoids everything already in the reservation
+    table: occupied cells (vertex conflicts), opposite moves along the same
+    edge (swap conflicts) and agents parked on their goals. Its path is then
+    reserved for everyone after it. The heuristic is the exact grid distance
+    to the goal, taken from a shared DistanceCache, so agents with a common
+    goal share one BFS.
+
+    Once the clock passes the last reserved timestep nothing changes any more,
+    so later states collapse onto that timestep and the search degrades to a
+    plain spatial search instead of growing with time.
+
+    Walkability matches `astar` (everything but walls). Like any prioritized
+    scheme this is fast but incomplete: an agent that cannot find a path
+    within `slack` timesteps of its optimal length, or within
+    `max_expansions` states, gets None. It then stays parked on its start,
+    so agents already planned through that cell are planned again, after
+    the others.
+    """
+
+    def __init__(self, grid, slack=None, max_expansions=None):
+        self.distances = DistanceCache(grid, preload=False)  # Only goals that agents actually have
+        self.graph = self.distances.graph
+        self.slack = slack if slack is not None else self.graph.rows + self.graph.cols
+        self.max_expansions = max_expansions if max_expansions is not None else 4 * self.graph.size
+        self.expanded = 0  # Space-time states expanded by the last plan()
+
+    def plan(self, agents):
+        """Plan [(start, goal), ...] and return one timed path per agent.
+
+        A timed path lists the agent's cell at t = 0, 1, 2, ... and starts with
+        its start cell; after the last entry the agent stays parked on its goal.
+        """
+        graph = self.graph
+        starts = [graph.node(start) for start, _ in agents]
+        goals = [graph.node(goal) for _, goal in agents]
+        planned = [None] * len(agents)  # Node path per agent
+        failed = set()
+        self.expanded = 0
+
+        tables = self._reservations(planned, starts, failed)
+        queue = deque(range(len(agents)))
+        while queue:
+            agent = queue.popleft()
+            path = self._space_time_astar(starts[agent], goals[agent], *tables)
+            if path is not None:
+                planned[agent] = path
+                tables = self._reserve(path, tables)
+                continue
+            # It stays parked on its start: agents planned earlier that pass through that
+            # cell lose their paths and are planned again, after everyone else
+            failed.add(agent)
+            crossing = [other for other, other_path in enumerate(planned)
+                        if other_path is not None and starts[agent] in other_path[1:]]
+            for other in crossing:
+                planned[other] = None
+                queue.append(other)
+            tables = self._reservations(planned, starts, failed)
+        return [[graph.coords(node) for node in path] if path is not None else None for path in planned]
+
+    def _reservations(self, planned, starts, failed):
+        """(reserved, moves, parked, last_busy, settled) for the given paths and parked failures."""
+        reserved = set(starts)  # t * size + node; everyone is on their start cell at t = 0
+        moves = set()  # (t, from, to) for moves from t to t + 1
+        parked = {starts[agent]: 0 for agent in failed}  # node -> timestep from which an agent sits there for good
+        last_busy = {}  # node -> latest timestep it is reserved
+        settled = 1  # From this timestep on the reservation table no longer changes
+        tables = (reserved, moves, parked, last_busy, settled)
+        for path in planned:
+            if path is not None:
+                tables = self._reserve(path, tables)
+        return tables
+
+    def _reserve(self, path, tables):
+        reserved, moves, parked, last_busy, settled = tables
+        size = self.graph.size
+        for t, node in enumerate(path):
+            reserved.add(t * size + node)
+            last_busy[node] = max(last_busy.get(node, -1), t)
+        for t in range(len(path) - 1):
+            moves.add((t, path[t], path[t + 1]))
+        parked[path[-1]] = len(path) - 1
+        return reserved, moves, parked, last_busy, max(settled, len(path))
+
+    def _space_time_astar(self, start, goal, reserved, moves, parked, last_busy, settled):
+        graph = self.graph
+        size, adjacency, walkable = graph.size, graph.adjacency, graph.walkable()
+        self.distances.add_target(graph.coords(goal))
+        distance = self.distances.distances[goal]
+        if distance[start] < 0:
+            return None
+        max_time = distance[start] + self.slack
+        # The agent may only stop on its goal once nobody else passes through it later
+        free_from = last_busy.get(goal, -1) + 1
+
+        open_set = [(distance[start], 0, start)]  # (f_score, t, node)
+        came_from = {start: None}  # Space-time state min(t, settled) * size + node -> previous state
+        budget = self.max_expansions
+        while open_set and budget:
+            _, t, node = heapq.heappop(open_set)
+            self.expanded += 1
+            budget -= 1
+            state = min(t, settled) * size + node
+            if node == goal and t >= free_from:
+                path = []
+                while state is not None:
+                    path.append(state % size)
+                    state = came_from[state]
+                path.reverse()
+                return path
+            if t >= max_time:
+                continue
+
+            arrive = t + 1
+            for neighbor in adjacency[node] + (node,):
+                if neighbor != node and not walkable[neighbor]:
+                    continue
+                next_state = min(arrive, settled) * size + neighbor
+                if next_state in came_from or next_state in reserved:
+                    continue
+                if (t, neighbor, node) in moves:  # Someone moves the opposite way along this edge
+                    continue
+                if neighbor in parked and parked[neighbor] <= arrive:
+                    continue
+                came_from[next_state] = state
+                heapq.heappush(open_set, (arrive + distance[neighbor], arrive, neighbor))
+        return None
+
+
+def find_conflicts(paths, starts=None):
+    """Vertex and swap conflicts between timed paths.
+
+    None entries are ignored, or, given the agents' `starts`, treated as
+    agents parked on their start. Returns (kind, agent_a, agent_b, t, cell)
+    tuples; agents stay on their last cell after their path ends.
+    """
+    if starts is not None:
+        paths = [path if path is not None else [tuple(start)] for path, start in zip(paths, starts)]
+    timed = [(agent, path) for agent, path in enumerate(paths) if path]
+    horizon = max((len(path) for _, path in timed), default=0)
+
+    def at(path, t):
+        return path[min(t, len(path) - 1)]
+
+    conflicts = []
+    for t in range(horizon):
+        occupied = {}
+        for agent, path in timed:
+            cell = at(path, t)
+            if cell in occupied:
+                conflicts.append(("vertex", occupied[cell], agent, t, cell))
+            occupied[cell] = agent
+        if t + 1 >= horizon:
+            continue
+        moving = {(at(path, t), at(path, t + 1)): agent for agent, path in timed if at(path, t) != at(path, t + 1)}
+        for (a, b), agent in moving.items():
+            other = moving.get((b, a))
+            if other is not None and agent < other:
+                conflicts.append(("swap", agent, other, t, a))
+    return conflicts
@@ -0,0 +1,39 @@
+# benchmarks/aco_engine.py
+"""Compare the pure-Python `aco` with the lock-step `AntColony` engine.
+
+Run from backend/pygame_simulation:  python -m benchmarks.aco_engine
+"""
+import json
+import os
+import random
+import time
+
+from algorithm.aco import aco, AntColony, aco_colonies
+from benchmarks.layouts import warehouse_layout
+
+
+def timed(fn):
+    started = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - started
+
+
+def run(name, maze, start, end, ant_counts=(10, 50, 100), num_iterations=100, seed=0):
+    print(f"{name}: {len(maze)}x{len(maze[0])}, {start} -> {end}, {num_iterations} iterations")
+    for num_ants in ant_counts:
+        random.seed(seed)
+        baseline, baseline_time = timed(lambda: aco(maze, start, end, num_ants=num_ants, num_iterations=num_iterations))
+        colony, colony_time = timed(lambda: AntColony(maze, num_ants=num_ants, seed=seed).run(start, end, num_iterations))
+        print(f"  {num_ants:4d} ants  aco: {baseline_time:6.2f}s len {len(baseline):4d}   "
+              f"AntColony: {colony_time:6.2f}s len {len(colony):4d}   speedup {baseline_time / colony_time:5.2f}x")
+
+    workers = os.cpu_count() or 1
+    merged, merged_time = timed(lambda: aco_colonies(maze, start, end, colonies=workers, processes=workers,
+                                                     num_iterations=num_iterations, seed=seed))
+    print(f"  {workers} colonies on {workers} processes: {merged_time:6.2f}s len {len(merged):4d}")
+
+
+if __name__ == "__main__":
+    with open(os.path.join("maps", "default_map.json")) as f:
+        run("default_map", json.load(f)["maze"], (0, 0), (39, 39))
+    run("warehouse", warehouse_layout(60, 60, noise=0.0), (1, 1), (58, 58))
@@ -0,0 +1,36 @@
+# benchmarks/astar_workspace.py
+"""Compare per-call `astar` against the reusable `AStarPlanner` workspace.
+
+Run from backend/pygame_simulation:  python -m benchmarks.astar_workspace
+"""
+import time
+
+from algorithm.astar import astar, AStarPlanner
+from benchmarks.layouts import warehouse_layout, random_queries
+
+
+def run(maze, num_queries=500, seed=0):
+    queries = random_queries(maze, num_queries, seed=seed)
+
+    started = time.perf_counter()
+    baseline = [astar(maze, start, goal) for start, goal in queries]
+    baseline_time = time.perf_counter() - started
+
+    planner = AStarPlanner(maze)
+    started = time.perf_counter()
+    reused = [planner.plan(start, goal) for start, goal in queries]
+    planner_time = time.perf_counter() - started
+
+    for expected, path in zip(baseline, reused):
+        assert (expected is None) == (path is None), "AStarPlanner disagrees with astar on reachability"
+        assert expected is None or len(expected) == len(path), "AStarPlanner path length differs from astar"
+
+    print(f"{len(maze)}x{len(maze[0])} grid, {num_queries} queries")
+    print(f"  astar:        {baseline_time:.3f}s  ({num_queries / baseline_time:,.0f} queries/s)")
+    print(f"  AStarPlanner: {planner_time:.3f}s  ({num_queries / planner_time:,.0f} queries/s)")
+    print(f"  speedup:      {baseline_time / planner_time:.2f}x")
+
+
+if __name__ == "__main__":
+    run([[0] * 200 for _ in range(200)])  # Open floor
+    run(warehouse_layout(200, 200))
@@ -0,0 +1,57 @@
+# benchmarks/batch.py
+"""Compare one `astar` call per order with a single BatchPlanner call.
+
+Orders mostly end at a handful of picking stations, so many queries share a
+goal. Run from backend/pygame_simulation:  python -m benchmarks.batch
+"""
+import os
+import random
+import time
+
+from algorithm.astar import astar
+from algorithm.batch import BatchPlanner
+from algorithm.grid import SHELF
+from benchmarks.layouts import warehouse_layout, random_free_cells
+
+
+def run(size=200, num_queries=1000, num_stations=8, processes=None, seed=0, racks=None):
+    maze = warehouse_layout(size, size, seed=seed) if racks is None else \
+        warehouse_layout(size, size, seed=seed, racks=racks)
+    rng = random.Random(seed)
+    starts = random_free_cells(maze, num_queries, seed=seed)
+    stations = random_free_cells(maze, num_stations, seed=seed + 1)
+    others = random_free_cells(maze, num_queries, seed=seed + 2)
+    # Three quarters of the orders go to a station, the rest anywhere
+    queries = [(start, rng.choice(stations) if rng.random() < 0.75 else other)
+               for start, other in zip(starts, others)]
+
+    started = time.perf_counter()
+    baseline = [astar(maze, start, goal) for start, goal in queries]
+    baseline_time = time.perf_counter() - started
+
+    planner = BatchPlanner(maze, processes=processes)
+    started = time.perf_counter()
+    results = planner.plan(queries)
+    batch_time = time.perf_counter() - started
+    planner.close()
+
+    for expected, (path, _) in zip(baseline, results):
+        assert (expected is None) == (path is None), "BatchPlanner disagrees with astar on reachability"
+        assert expected is None or len(expected) == len(path), "BatchPlanner path length differs from astar"
+
+    timings = sorted(seconds for _, seconds in results)
+    label = f"{processes} processes" if processes else "in-process"
+    kind = "shelf-rack" if racks == SHELF else "wall-rack"
+    print(f"{size}x{size} {kind} warehouse, {num_queries} queries, {num_stations} stations, {label}")
+    print(f"  astar per query: {baseline_time:.3f}s")
+    # The wall time of the first plan() includes worker setup; per-query times include each goal's BFS
+    print(f"  BatchPlanner:    {batch_time:.3f}s  ({baseline_time / batch_time:.2f}x), "
+          f"setup outside the queries {(batch_time - sum(timings)) * 1e3:.1f}ms")
+    print(f"  per query: median {timings[len(timings) // 2] * 1e3:.3f}ms  "
+          f"p99 {timings[int(len(timings) * 0.99)] * 1e3:.3f}ms  max {timings[-1] * 1e3:.3f}ms")
+
+
+if __name__ == "__main__":
+    run()
+    run(processes=os.cpu_count())
+    run(racks=SHELF)
@@ -0,0 +1,87 @@
+# benchmarks/dispatch.py
+"""Compare task-assignment methods: travel per batch, assignments per second, and a full shift.
+
+Run from backend/pygame_simulation:  python -m benchmarks.dispatch
+"""
+import random
+import time
+
+from algorithm.distance_cache import DistanceCache
+from algorithm.grid import GridGraph, WALL, SHELF, PICKING_STATION, PUTAWAY_STATION
+from benchmarks.layouts import warehouse_layout, random_free_cells
+from dispatcher import Dispatcher
+from simulation import Simulation
+
+METHODS = ("first_come", "greedy", "hungarian")
+
+
+def batches(size=120, fleet_sizes=(10, 50, 200, 1000), repeats=5, seed=0):
+    maze = warehouse_layout(size, size, seed=seed)
+    distances = DistanceCache(GridGraph.from_maze(maze))
+    station = distances.targets[0]
+    # Clutter can wall off a few cells; sample from the floor connected to the stations only
+    connected = [[WALL if distances.distance((r, c), station) is None else value for c, value in enumerate(row)]
+                 for r, row in enumerate(maze)]
+    print(f"{size}x{size} warehouse, square batches (AGVs = tasks), {repeats} batches each")
+    print(f"{'AGVs':>6} {'method':>11} {'travel':>10} {'vs first':>9} {'assign/s':>10}")
+    for count in fleet_sizes:
+        samples = [(random_free_cells(connected, count, seed=seed + 2 * i),
+                    random_free_cells(connected, count, seed=seed + 2 * i + 1)) for i in range(repeats)]
+        for agvs, tasks in samples:  # Build the BFS tables outside the timings
+            Dispatcher(distances).cost_matrix(agvs[:1], tasks)
+        baseline = None
+        for method in METHODS:
+            if method == "hungarian" and count > 1000:
+                continue
+            dispatcher = Dispatcher(distances, method=method)
+            travel, assigned = 0, 0
+            started = time.perf_counter()
+            for agvs, tasks in samples:
+                cost = dispatcher.cost_matrix(agvs, tasks)
+                rows, cols = dispatcher.solve(cost)
+                travel += cost[rows, cols].sum()
+                assigned += len(rows)
+            elapsed = time.perf_counter() - started
+            baseline = baseline or travel
+            print(f"{count:>6} {method:>11} {travel / repeats:>10,.0f} {travel / baseline - 1:>+9.1%} "
+                  f"{assigned / elapsed:>10,.0f}")
+
+
+def shift(size=120, num_agvs=20, num_shelves=200, shift_hours=2, missions_per_hour=400, wave_minutes=0, seed=0):
+    """Run a shift per method; with `wave_minutes` the hour's orders arrive in waves instead of steadily."""
+    maze = warehouse_layout(size, size, seed=seed)
+    for row, col in random_free_cells(maze, num_shelves, seed=seed + 1):
+        maze[row][col] = SHELF
+    shelves = [(r, c) for r, row in enumerate(maze) for c, value in enumerate(row) if value == SHELF]
+    stations = [(r, c) for r, row in enumerate(maze) for c, value in enumerate(row)
+                if value in (PICKING_STATION, PUTAWAY_STATION)]
+    homes = random_free_cells(maze, num_agvs, seed=seed + 2)
+    arrivals = f"waves every {wave_minutes} min" if wave_minutes else "steady arrivals"
+    print(f"\n{shift_hours}h shift, {num_agvs} AGVs, {missions_per_hour} missions/h, {arrivals}")
+    for method in ("first_come", None):
+        sim = Simulation(maze, homes, dispatch_method=method)
+        moves = [0]
+        sim.subscribe(lambda s, events: moves.__setitem__(0, moves[0] + int(s.fleet.has_target.sum())))
+        rng = random.Random(seed)
+        shift_ticks = int(shift_hours * 3600 / sim.tick_seconds)
+        interval = max(1, int(3600 / missions_per_hour / sim.tick_seconds))
+        wave_ticks = int(wave_minutes * 60 / sim.tick_seconds)
+        started = time.perf_counter()
+        while sim.tick < shift_ticks:
+            if wave_ticks and sim.tick % wave_ticks == 0:
+                for _ in range(wave_ticks // interval):
+                    sim.add_mission(rng.choice(shelves), rng.choice(stations))
+            elif not wave_ticks and sim.tick % interval == 0:
+                sim.add_mission(rng.choice(shelves), rng.choice(stations))
+            sim.step()
+        elapsed = time.perf_counter() - started
+        durations = sorted(m.finished_tick - m.created_tick for m in sim.completed)
+        median = durations[len(durations) // 2] * sim.tick_seconds if durations else 0
+        print(f"  {method or 'auto':>10}: {len(sim.completed)} completed, {len(sim.queue)} queued, "
+              f"{moves[0]:,} AGV-ticks moving, median order-to-done {median:.0f}s ({elapsed:.1f}s)")
+
+
+if __name__ == "__main__":
+    batches()
+    shift()
+    shift(num_agvs=40, wave_minutes=15)
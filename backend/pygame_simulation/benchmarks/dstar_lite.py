@@ -0,0 +1,69 @@
+# benchmarks/dstar_lite.py
+"""Replanning cost of D* Lite vs A* from scratch while an AGV drives and cells change.
+
+Run from backend/pygame_simulation:  python -m benchmarks.dstar_lite
+"""
+import random
+import time
+
+from algorithm.astar import AStarPlanner
+from algorithm.dstar_lite import DStarLite
+from benchmarks.layouts import warehouse_layout
+
+
+def drive(size, block_every=5, seed=0):
+    """Drive one AGV corner to corner while an obstacle keeps jumping onto its next cells.
+
+    Every `block_every` steps the previous obstacle is cleared and a new one
+    is dropped a few cells ahead, like a shelf being moved into the aisle.
+    """
+    rng = random.Random(seed)
+    maze = warehouse_layout(size, size, seed=seed, noise=0.0)
+    start, goal = (1, 1), (size - 2, size - 2)
+
+    incremental = DStarLite(maze, start, goal)
+    scratch = AStarPlanner(incremental.graph)  # Shares the graph, so it sees every edit
+    incremental_time = scratch_time = 0.0
+    incremental_expanded = scratch_expanded = replans = 0
+
+    started = time.perf_counter()
+    path = incremental.plan()
+    initial_time = time.perf_counter() - started
+
+    position, steps, obstacle = start, 0, None
+    while path:
+        position = path.pop(0)
+        incremental.advance(position)
+        steps += 1
+        if steps % block_every or len(path) < 3:
+            continue
+
+        if obstacle is not None:
+            incremental.update_cell(obstacle, 0)
+        obstacle = path[rng.randrange(1, min(len(path), 6))]
+        if obstacle == goal:
+            obstacle = None
+            continue
+        incremental.update_cell(obstacle, 1)
+        replans += 1
+
+        started = time.perf_counter()
+        path = incremental.plan()
+        incremental_time += time.perf_counter() - started
+        incremental_expanded += incremental.expanded
+
+        started = time.perf_counter()
+        reference = scratch.plan(position, goal)
+        scratch_time += time.perf_counter() - started
+        scratch_expanded += scratch.expanded
+        assert (reference is None) == (path is None) and (path is None or len(path) == len(reference))
+
+    assert position == goal, "AGV got boxed in"
+    print(f"{size}x{size}: {steps} steps, {replans} replans (initial plan {initial_time * 1000:.1f} ms)")
+    print(f"  D* Lite:       {incremental_time / replans * 1000:7.2f} ms/replan  {incremental_expanded / replans:8.1f} expanded/replan")
+    print(f"  A* (scratch):  {scratch_time / replans * 1000:7.2f} ms/replan  {scratch_expanded / replans:8.1f} expanded/replan")
+
+
+if __name__ == "__main__":
+    for size in (50, 100, 200, 400):
+        drive(size)
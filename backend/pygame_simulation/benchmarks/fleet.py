@@ -0,0 +1,64 @@
+# benchmarks/fleet.py
+"""Compare stepping AGVs one Python object at a time with one Fleet.tick.
+
+The baseline is the per-object `move()` that agv.py used before the fleet
+arrays. Run from backend/pygame_simulation:  python -m benchmarks.fleet
+"""
+import random
+import time
+
+from fleet import Fleet
+
+
+class ObjectAGV:
+    """The old per-object AGV state and greedy move, kept here as a baseline."""
+
+    def __init__(self, x, y):
+        self.position = [x, y]
+        self.target = None
+
+    def move(self):
+        if self.target:
+            if self.position[0] < self.target[0]:
+                self.position[0] += 1
+            elif self.position[0] > self.target[0]:
+                self.position[0] -= 1
+            elif self.position[1] < self.target[1]:
+                self.position[1] += 1
+            elif self.position[1] > self.target[1]:
+                self.position[1] -= 1
+
+            if self.position == self.target:
+                self.target = None
+
+
+def run(num_agvs, ticks=200, size=500, seed=0):
+    rng = random.Random(seed)
+    starts = [(rng.randrange(size), rng.randrange(size)) for _ in range(num_agvs)]
+    targets = [(rng.randrange(size), rng.randrange(size)) for _ in range(num_agvs)]
+
+    objects = [ObjectAGV(*start) for start in starts]
+    for agv, target in zip(objects, targets):
+        agv.target = list(target)
+    started = time.perf_counter()
+    for _ in range(ticks):
+        for agv in objects:
+            agv.move()
+    object_time = time.perf_counter() - started
+
+    fleet = Fleet(starts)
+    for i, target in enumerate(targets):
+        fleet.set_target(i, target)
+    started = time.perf_counter()
+    for _ in range(ticks):
+        fleet.tick()
+    fleet_time = time.perf_counter() - started
+
+    assert fleet.positions.tolist() == [agv.position for agv in objects], "Fleet and per-object moves disagree"
+    print(f"{num_agvs:>6} AGVs x {ticks} ticks:  objects {object_time * 1e6 / ticks:9.1f}us/tick  "
+          f"fleet {fleet_time * 1e6 / ticks:8.1f}us/tick  ({object_time / fleet_time:.1f}x)")
+
+
+if __name__ == "__main__":
+    for num_agvs in (10, 100, 1000, 10000, 50000):
+        run(num_agvs)
@@ -0,0 +1,51 @@
+# benchmarks/hpa.py
+"""Compare HPA* with flat A* on large generated warehouse floors.
+
+Run from backend/pygame_simulation:  python -m benchmarks.hpa
+"""
+import random
+import time
+
+from algorithm.astar import AStarPlanner
+from algorithm.hpa import HierarchicalPlanner
+from benchmarks.layouts import warehouse_layout, random_queries
+
+
+def run(size=500, cluster_size=16, num_queries=100, num_edits=50, seed=0):
+    maze = warehouse_layout(size, size, seed=seed)
+    queries = random_queries(maze, num_queries, seed=seed)
+
+    started = time.perf_counter()
+    hierarchy = HierarchicalPlanner(maze, cluster_size=cluster_size)
+    build_time = time.perf_counter() - started
+
+    flat = AStarPlanner(maze)
+    started = time.perf_counter()
+    flat_paths = [flat.plan(start, goal) for start, goal in queries]
+    flat_time = time.perf_counter() - started
+
+    started = time.perf_counter()
+    paths = [hierarchy.plan(start, goal) for start, goal in queries]
+    hpa_time = time.perf_counter() - started
+
+    overhead = [len(path) / len(reference) for path, reference in zip(paths, flat_paths) if reference]
+    assert all((path is None) == (reference is None) for path, reference in zip(paths, flat_paths))
+
+    rng = random.Random(seed)
+    started = time.perf_counter()
+    for _ in range(num_edits):
+        pos = (rng.randrange(size), rng.randrange(size))
+        hierarchy.update_cell(pos, 1 - hierarchy.graph.cell(pos) if hierarchy.graph.cell(pos) in (0, 1) else 1)
+    edit_time = (time.perf_counter() - started) / num_edits
+
+    print(f"warehouse {size}x{size}, clusters of {cluster_size}, {num_queries} queries")
+    print(f"  HPA* build:     {build_time:7.3f}s")
+    print(f"  AStarPlanner:   {flat_time / num_queries * 1000:7.2f} ms/query")
+    print(f"  HPA*:           {hpa_time / num_queries * 1000:7.2f} ms/query"
+          f"  (paths {100 * (sum(overhead) / len(overhead) - 1):.1f}% longer on average, worst {100 * (max(overhead) - 1):.1f}%)")
+    print(f"  update_cell:    {edit_time * 1000:7.2f} ms/edit vs {build_time * 1000:.0f} ms full rebuild")
+
+
+if __name__ == "__main__":
+    run()
+    run(size=1000, num_queries=30)
@@ -0,0 +1,68 @@
+# benchmarks/ingestion.py
+"""Load-test the WMS order endpoints and report requests/sec and latency percentiles.
+
+Runs the FastAPI app in-process by default; pass --url to hit a live server.
+Run from backend/pygame_simulation:  python -m benchmarks.ingestion [--url http://host:port]
+"""
+import argparse
+import asyncio
+import time
+
+import httpx
+
+PICK_ORDER = {
+    "header": {"warehouse_code": "geekplus", "user_id": "testUser", "user_key": "111111"},
+    "body": {"orders": [{
+        "order_details": {
+            "out_order_code": "do001", "order_type": 0, "out_wave_code": "wave2020001", "owner_code": "lidong",
+            "is_allow_pick_lack": 1, "print": {"type": 1, "content": "label"},
+            "carrier": {"type": 1, "code": "SF", "name": "SF Express", "waybill_code": "SF0001"},
+            "is_allow_lack": 1, "dates": {"creation_date": 1711000000000, "expected_finish_date": 1711086400000},
+            "priority": 1,
+        },
+        "sku_items": [{"sku_code": f"SKU{i:05d}", "sku_id": str(i), "sku_level": 0, "amount": 1 + i % 5}
+                      for i in range(10)],
+    }]},
+}
+
+
+async def _client(http, path, deadline, latencies, statuses):
+    while time.perf_counter() < deadline:
+        started = time.perf_counter()
+        response = await http.post(path, params={"warehouse": "geekplus", "owner": "lidong"}, json=PICK_ORDER)
+        latencies.append(time.perf_counter() - started)
+        statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+
+
+async def load_test(url=None, concurrency=50, duration=5.0, path="/api/pick/create"):
+    if url:
+        transport, base_url = None, url
+    else:
+        from main import app, ingestion
+        transport, base_url = httpx.ASGITransport(app=app), "http://testserver"
+    latencies, statuses = [], {}
+    async with httpx.AsyncClient(transport=transport, base_url=base_url, timeout=30) as http:
+        started = time.perf_counter()
+        deadline = started + duration
+        await asyncio.gather(*(_client(http, path, deadline, latencies, statuses) for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    print(f"{path}: {len(latencies)} requests in {elapsed:.1f}s with {concurrency} concurrent clients")
+    print(f"  throughput: {len(latencies) / elapsed:,.0f} req/s")
+    print(f"  latency:    p50 {latencies[len(latencies) // 2] * 1e3:.2f}ms  "
+          f"p99 {latencies[int(len(latencies) * 0.99)] * 1e3:.2f}ms  max {latencies[-1] * 1e3:.2f}ms")
+    print(f"  statuses:   {dict(sorted(statuses.items()))}")
+    if not url:
+        ingestion.stop()
+        print(f"  ingestion:  {ingestion.stats()}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--url")
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--duration", type=float, default=5.0)
+    parser.add_argument("--path", default="/api/pick/create")
+    args = parser.parse_args()
+    asyncio.run(load_test(args.url, args.concurrency, args.duration, args.path))
@@ -0,0 +1,65 @@
+# benchmarks/jps.py
+"""Compare Jump Point Search with A* on the saved maps and generated warehouse floors.
+
+Run from backend/pygame_simulation:  python -m benchmarks.jps
+"""
+import json
+import os
+import time
+
+from algorithm.astar import astar, AStarPlanner
+from algorithm.jps import JumpPointPlanner
+from benchmarks.layouts import warehouse_layout, random_queries
+
+MAPS_DIR = "maps"
+
+
+def timed_queries(plan, queries, planner=None):
+    expanded = 0
+    paths = []
+    started = time.perf_counter()
+    for start, goal in queries:
+        paths.append(plan(start, goal))
+        if planner is not None:
+            expanded += planner.expanded
+    return time.perf_counter() - started, expanded / len(queries), paths
+
+
+def check_lengths(reference, paths):
+    for expected, path in zip(reference, paths):
+        assert (expected is None) == (path is None), "JPS disagrees with A* on reachability"
+        assert expected is None or len(expected) == len(path), "JPS path length differs from A*"
+
+
+def run(name, maze, num_queries=200, seed=0):
+    queries = random_queries(maze, num_queries, seed=seed)
+
+    astar_time, _, reference = timed_queries(lambda s, g: astar(maze, s, g), queries)
+
+    planner = AStarPlanner(maze)
+    planner_time, planner_expanded, _ = timed_queries(planner.plan, queries, planner)
+
+    jump_planner = JumpPointPlanner(maze)
+    started = time.perf_counter()
+    jump_planner.plan(queries[0][0], queries[0][0])  # Builds the jump tables
+    build_time = time.perf_counter() - started
+    jps_time, jps_expanded, paths = timed_queries(jump_planner.plan, queries, jump_planner)
+    check_lengths(reference, paths)
+
+    print(f"{name}: {len(maze)}x{len(maze[0])}, {num_queries} queries")
+    print(f"  astar:            {astar_time:7.3f}s")
+    print(f"  AStarPlanner:     {planner_time:7.3f}s  {planner_expanded:8.1f} nodes expanded/query")
+    print(f"  JumpPointPlanner: {jps_time:7.3f}s  {jps_expanded:8.1f} nodes expanded/query"
+          f"  (+{build_time:.3f}s one-off table build)")
+    print(f"  JPS expands {planner_expanded / max(jps_expanded, 1):.1f}x fewer nodes than A*,"
+          f" {planner_time / jps_time:.2f}x faster than AStarPlanner, {astar_time / jps_time:.1f}x faster than astar")
+
+
+if __name__ == "__main__":
+    for file_name in sorted(os.listdir(MAPS_DIR)):
+        if file_name.endswith(".json"):
+            with open(os.path.join(MAPS_DIR, file_name)) as f:
+                run(file_name, json.load(f)["maze"])
+    run("open floor", [[0] * 300 for _ in range(300)], num_queries=50)
+    run("warehouse", warehouse_layout(300, 300), num_queries=50)
+    run("warehouse, no clutter", warehouse_layout(300, 300, noise=0.0), num_queries=50)
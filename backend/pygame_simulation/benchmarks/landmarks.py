@@ -0,0 +1,43 @@
+# benchmarks/landmarks.py
+"""A* with Manhattan distance vs landmark (ALT) heuristics: nodes expanded and query time.
+
+Run from backend/pygame_simulation:  python -m benchmarks.landmarks
+"""
+import time
+
+from algorithm.astar import AStarPlanner
+from algorithm.grid import GridGraph
+from algorithm.landmarks import LandmarkTable
+from benchmarks.layouts import warehouse_layout, random_queries
+
+
+def run(maze, name, num_queries=300, landmark_counts=(4, 8, 16), seed=0):
+    graph = GridGraph.from_maze(maze)
+    queries = random_queries(maze, num_queries, seed=seed)
+    print(f"{name}, {len(maze)}x{len(maze[0])}, {num_queries} queries")
+    print(f"  {'heuristic':>12} {'precompute':>11} {'expanded/query':>15} {'ms/query':>9}")
+    baseline = None
+    for count in (0,) + tuple(landmark_counts):
+        started = time.perf_counter()
+        table = LandmarkTable(graph, count=count) if count else None
+        precompute = time.perf_counter() - started
+        planner = AStarPlanner(graph, landmarks=table)
+        expanded, lengths = 0, []
+        started = time.perf_counter()
+        for start, goal in queries:
+            path = planner.plan(start, goal)
+            expanded += planner.expanded
+            lengths.append(None if path is None else len(path))
+        elapsed = time.perf_counter() - started
+        if baseline is None:
+            baseline = lengths
+        assert lengths == baseline, "ALT changed a path length"
+        label = f"ALT x{count}" if count else "manhattan"
+        print(f"  {label:>12} {precompute * 1000:>9.0f}ms {expanded / num_queries:>15,.0f} "
+              f"{elapsed / num_queries * 1000:>9.2f}")
+
+
+if __name__ == "__main__":
+    run([[0] * 200 for _ in range(200)], "open floor")
+    run(warehouse_layout(200, 200), "warehouse")
+    run(warehouse_layout(200, 200, rack_length=40), "warehouse with long racks")
@@ -0,0 +1,45 @@
+# benchmarks/layouts.py
+import random
+
+from algorithm.grid import EMPTY, WALL, PICKING_STATION, PUTAWAY_STATION
+
+
+def warehouse_layout(rows, cols, rack_length=8, seed=0, noise=0.02, racks=WALL):
+    """Generate a warehouse-like maze: double-width rack rows separated by aisles.
+
+    Racks are walls (or `racks`, e.g. SHELF for a shelf-dense map), cross aisles cut through them every `rack_length` cells,
+    picking/putaway stations sit along the left edge, and a little random
+    clutter is sprinkled over the aisles.
+    """
+    rng = random.Random(seed)
+    maze = [[EMPTY] * cols for _ in range(rows)]
+
+    for row in range(2, rows - 2):
+        if row % 3 == 1:  # Aisle between rack rows
+            continue
+        for col in range(3, cols - 2):
+            if (col - 3) % (rack_length + 1) != rack_length:  # Leave cross aisles
+                maze[row][col] = racks
+
+    for row in range(rows):
+        for col in range(3, cols):
+            if maze[row][col] == EMPTY and rng.random() < noise:
+                maze[row][col] = WALL
+
+    for row in range(1, rows - 1, 4):
+        maze[row][0] = PICKING_STATION if (row // 4) % 2 == 0 else PUTAWAY_STATION
+
+    return maze
+
+
+def random_free_cells(maze, count, seed=0):
+    """Sample `count` empty cells from a maze."""
+    rng = random.Random(seed)
+    free = [(r, c) for r, row in enumerate(maze) for c, value in enumerate(row) if value == EMPTY]
+    return [rng.choice(free) for _ in range(count)]
+
+
+def random_queries(maze, count, seed=0):
+    """Sample `count` (start, goal) pairs of empty cells."""
+    cells = random_free_cells(maze, 2 * count, seed)
+    return list(zip(cells[::2], cells[1::2]))
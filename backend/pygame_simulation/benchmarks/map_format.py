@@ -0,0 +1,70 @@
+# benchmarks/map_format.py
+"""Load time, file size and memory of JSON maps vs binary (.wmap) maps.
+
+Run from backend/pygame_simulation:  python -m benchmarks.map_format
+"""
+import json
+import os
+import tempfile
+import time
+import tracemalloc
+
+from benchmarks.layouts import warehouse_layout
+from map_format import save_map, load_map, PACK_U8, PACK_U4
+
+
+def best_time(fn, repeats=3):
+    best = float("inf")
+    for _ in range(repeats):
+        started = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def allocated(load):
+    """Bytes the loaded map keeps allocated on the Python heap (timed separately; tracing is slow)."""
+    tracemalloc.start()
+    result = load()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del result
+    return size
+
+
+def run(sizes=(500, 1000, 2000)):
+    directory = tempfile.mkdtemp()
+    print(f"{'map':>10} {'format':>12} {'file':>9} {'load':>9} {'+ full scan':>12} {'memory':>9}")
+    for size in sizes:
+        maze = warehouse_layout(size, size)
+        json_path = os.path.join(directory, f"map_{size}.json")
+        with open(json_path, "w") as f:
+            json.dump({"maze": maze, "robot": [0, 0], "end": [size - 1, size - 1]}, f)
+        del maze
+
+        def load_json():
+            with open(json_path) as f:
+                return json.load(f)
+
+        def scan_json():
+            return sum(map(sum, load_json()["maze"]))
+
+        with open(json_path) as f:
+            cells = json.load(f)["maze"]
+        formats = [("json", json_path, load_json, scan_json)]
+        for name, packing in (("wmap u8", PACK_U8), ("wmap u4", PACK_U4)):
+            path = os.path.join(directory, f"map_{size}_{name[-2:]}.wmap")
+            save_map(path, cells, (0, 0), (size - 1, size - 1), packing)
+            formats.append((name, path, lambda path=path: load_map(path),
+                            lambda path=path: int(load_map(path).cells.sum())))
+        del cells
+
+        for name, path, load, scan in formats:
+            load_time, scan_time, memory = best_time(load), best_time(scan), allocated(load)
+            print(f"{size:>4}x{size:<5} {name:>12} {os.path.getsize(path) / 1e6:>7.2f}MB {load_time * 1000:>7.1f}ms "
+                  f"{scan_time * 1000:>10.1f}ms {memory / 1e6:>7.2f}MB")
+    print("memory = Python heap still allocated after loading; mmap'd pages are file-backed and not counted")
+
+
+if __name__ == "__main__":
+    run()
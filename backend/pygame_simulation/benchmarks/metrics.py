@@ -0,0 +1,59 @@
+# benchmarks/metrics.py
+"""Cost of the planner and simulation instrumentation with metrics switched off and on.
+
+Run from backend/pygame_simulation:  python -m benchmarks.metrics
+"""
+import time
+
+import metrics
+from algorithm.astar import astar, AStarPlanner
+from algorithm.dijkstra import dijkstras
+from algorithm.grid import GridGraph
+from benchmarks.layouts import warehouse_layout, random_queries
+from simulation import Simulation
+
+
+def best_of(repeats, fn):
+    best = float("inf")
+    for _ in range(repeats):
+        started = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def run(size=120, num_queries=200, ticks=2000, repeats=5, seed=0):
+    maze = warehouse_layout(size, size, seed=seed)
+    graph = GridGraph.from_maze(maze)
+    queries = random_queries(maze, num_queries, seed=seed)
+    planner = AStarPlanner(graph)
+    cases = [
+        ("astar", lambda: [astar(graph, start, goal) for start, goal in queries]),
+        ("AStarPlanner", lambda: [planner.plan(start, goal) for start, goal in queries]),
+        ("dijkstras", lambda: [dijkstras(graph, start, goal) for start, goal in queries]),
+    ]
+    print(f"warehouse {size}x{size}, {num_queries} queries, best of {repeats}")
+    print(f"  {'case':>14} {'off ms':>9} {'on ms':>9} {'overhead':>9}")
+    for name, fn in cases:
+        metrics.enable(False)
+        off = best_of(repeats, fn)
+        metrics.enable(True)
+        on = best_of(repeats, fn)
+        print(f"  {name:>14} {off * 1000:>9.1f} {on * 1000:>9.1f} {(on / off - 1) * 100:>8.1f}%")
+
+    def simulate():
+        sim = Simulation(maze, [start for start, _ in queries[:20]])
+        for _ in range(ticks):
+            sim.step()
+
+    metrics.enable(False)
+    off = best_of(repeats, simulate)
+    metrics.enable(True)
+    on = best_of(repeats, simulate)
+    print(f"  {'sim ticks':>14} {off * 1000:>9.1f} {on * 1000:>9.1f} {(on / off - 1) * 100:>8.1f}%")
+    metrics.enable(False)
+    metrics.REGISTRY.reset()
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,47 @@
+# benchmarks/simulation.py
+"""Simulate a full shift of picking missions headlessly.
+
+Run from backend/pygame_simulation:  python -m benchmarks.simulation
+"""
+import random
+import time
+
+from algorithm.grid import SHELF, PICKING_STATION, PUTAWAY_STATION
+from benchmarks.layouts import warehouse_layout, random_free_cells
+from simulation import Simulation
+
+
+def run(size=120, num_agvs=20, num_shelves=200, shift_hours=8, missions_per_hour=400, seed=0):
+    maze = warehouse_layout(size, size, seed=seed)
+    for row, col in random_free_cells(maze, num_shelves, seed=seed + 1):
+        maze[row][col] = SHELF
+    shelves = [(r, c) for r, row in enumerate(maze) for c, value in enumerate(row) if value == SHELF]
+    stations = [(r, c) for r, row in enumerate(maze) for c, value in enumerate(row)
+                if value in (PICKING_STATION, PUTAWAY_STATION)]
+    homes = random_free_cells(maze, num_agvs, seed=seed + 2)
+
+    started = time.perf_counter()
+    sim = Simulation(maze, homes)
+    setup_time = time.perf_counter() - started
+
+    rng = random.Random(seed)
+    shift_ticks = int(shift_hours * 3600 / sim.tick_seconds)
+    interval = max(1, int(3600 / missions_per_hour / sim.tick_seconds))  # Ticks between orders
+    started = time.perf_counter()
+    while sim.tick < shift_ticks:
+        if sim.tick % interval == 0:
+            sim.add_mission(rng.choice(shelves), rng.choice(stations))
+        sim.step()
+    run_time = time.perf_counter() - started
+
+    durations = sorted(m.finished_tick - m.created_tick for m in sim.completed)
+    print(f"{size}x{size} warehouse, {num_agvs} AGVs, {len(shelves)} shelves, {shift_hours}h shift ({shift_ticks} ticks)")
+    print(f"  setup {setup_time:.2f}s, simulation {run_time:.2f}s ({sim.time / run_time:,.0f}x real time)")
+    print(f"  missions: {len(sim.completed)} completed, {len(sim.failed)} failed, {len(sim.queue)} still queued")
+    if durations:
+        print(f"  order-to-done: median {durations[len(durations) // 2] * sim.tick_seconds:.0f}s, "
+              f"max {durations[-1] * sim.tick_seconds:.0f}s")
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,73 @@
+# benchmarks/sprites.py
+"""Frame time of drawing a large fleet: rect per AGV, icon per AGV, and one batched atlas blit.
+
+Run from backend/pygame_simulation:  python -m benchmarks.sprites
+(set SDL_VIDEODRIVER=dummy to run without a window)
+"""
+import time
+
+import numpy as np
+import pygame # type: ignore
+
+from fleet import Fleet
+from sprites import SpriteAtlas
+
+
+def frame_time(draw, frames=50):
+    started = time.perf_counter()
+    for _ in range(frames):
+        draw()
+    return (time.perf_counter() - started) / frames
+
+
+def run(num_agvs=1000, cell_size=16, grid=(100, 75), seed=0):
+    pygame.init()
+    screen = pygame.display.set_mode((grid[0] * cell_size, grid[1] * cell_size))
+    rng = np.random.default_rng(seed)
+    fleet = Fleet(rng.integers(0, grid, size=(num_agvs, 2)).tolist(), capacity=num_agvs)
+    fleet.states[:] = rng.integers(0, 4, num_agvs)
+    selected = rng.random(num_agvs) < 0.01
+
+    started = time.perf_counter()
+    atlas = SpriteAtlas()
+    atlas.sheet(cell_size)
+    setup = time.perf_counter() - started
+    opaque = SpriteAtlas(background=(255, 255, 255))
+
+    def rects():
+        screen.fill((255, 255, 255))
+        for (x, y), chosen in zip(fleet.positions.tolist(), selected):
+            pygame.draw.rect(screen, (255, 0, 0) if chosen else (0, 0, 0),
+                             (x * cell_size, y * cell_size, cell_size, cell_size))
+
+    def icons_uncached():  # What loading the icons naively would cost: scale per AGV per frame
+        screen.fill((255, 255, 255))
+        for (x, y), state in zip(fleet.positions.tolist(), fleet.states.tolist()):
+            screen.blit(pygame.transform.smoothscale(atlas.sources[state], (cell_size, cell_size)),
+                        (x * cell_size, y * cell_size))
+
+    def icons_per_agv():
+        screen.fill((255, 255, 255))
+        for (x, y), state, chosen in zip(fleet.positions.tolist(), fleet.states.tolist(), selected.tolist()):
+            screen.blit(atlas.icon(state, cell_size, chosen), (x * cell_size, y * cell_size))
+
+    def atlas_batch():
+        screen.fill((255, 255, 255))
+        atlas.draw_fleet(screen, fleet.positions, fleet.states, cell_size, selected=selected)
+
+    def opaque_batch():
+        screen.fill((255, 255, 255))
+        opaque.draw_fleet(screen, fleet.positions, fleet.states, cell_size, selected=selected)
+
+    print(f"{num_agvs} AGVs, {cell_size}px cells, {screen.get_width()}x{screen.get_height()} screen "
+          f"(atlas built in {setup * 1000:.1f}ms); 60 fps budget is 16.7ms")
+    for name, draw in (("rect per AGV", rects), ("icon scaled per AGV", icons_uncached),
+                       ("cached icon per AGV", icons_per_agv), ("atlas, one blits()", atlas_batch),
+                       ("opaque atlas, blits()", opaque_batch)):
+        print(f"  {name:>21}: {frame_time(draw) * 1000:6.2f}ms per frame")
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    run()
+    run(cell_size=32, grid=(50, 40))
@@ -0,0 +1,68 @@
+# benchmarks/waves.py
+"""Wave planning vs one trip per order: trips, path length and simulated shift time.
+
+Run from backend/pygame_simulation:  python -m benchmarks.waves
+"""
+import random
+import time
+
+from algorithm.distance_cache import DistanceCache
+from algorithm.grid import GridGraph, SHELF
+from benchmarks.layouts import warehouse_layout, random_free_cells
+from order_store import PickOrder
+from simulation import Simulation
+from wave_planner import WavePlanner
+
+
+def make_orders(num_orders, num_skus, wave_size, max_lines=4, seed=0):
+    """Orders with 1..max_lines lines; SKU popularity is skewed (a few SKUs appear in many orders)."""
+    rng = random.Random(seed)
+    weights = [1 / (rank + 1) for rank in range(num_skus)]
+    orders = []
+    for i in range(num_orders):
+        skus = set(rng.choices(range(num_skus), weights, k=rng.randint(1, max_lines)))
+        items = [(f"SKU{sku:05d}", rng.randint(1, 5)) for sku in sorted(skus)]
+        orders.append(PickOrder(f"ORD{i:06d}", "owner", f"WAVE{i // wave_size:04d}", 1, "", items, None))
+    return orders
+
+
+def run(size=120, num_shelves=300, num_skus=1200, skus_per_shelf=6, num_orders=2000, wave_size=50,
+        num_agvs=20, seed=0):
+    maze = warehouse_layout(size, size, seed=seed)
+    for row, col in random_free_cells(maze, num_shelves, seed=seed + 1):
+        maze[row][col] = SHELF
+    shelves = [(r, c) for r, row in enumerate(maze) for c, value in enumerate(row) if value == SHELF]
+    rng = random.Random(seed)
+    inventory = {}  # sku_code -> shelves holding it; every SKU is stocked somewhere
+    slots = list(range(num_skus)) + rng.choices(range(num_skus), k=max(0, len(shelves) * skus_per_shelf - num_skus))
+    rng.shuffle(slots)
+    for i, sku in enumerate(slots):
+        inventory.setdefault(f"SKU{sku:05d}", []).append(shelves[i % len(shelves)])
+    orders = make_orders(num_orders, num_skus, wave_size, seed=seed)
+    distances = DistanceCache(GridGraph.from_maze(maze))
+    planner = WavePlanner(distances, lambda sku: inventory.get(sku, ()))
+
+    print(f"{size}x{size} warehouse, {len(shelves)} shelves, {num_skus} SKUs, {num_orders} orders "
+          f"in waves of {wave_size}, {len(planner.stations)} picking stations")
+    homes = random_free_cells(maze, num_agvs, seed=seed + 2)
+    results = {}
+    for name, plan_fn in (("per order", planner.plan_per_order), ("waves", planner.plan)):
+        started = time.perf_counter()
+        plan = plan_fn(orders)
+        elapsed = time.perf_counter() - started
+        sim = Simulation(maze, homes)
+        for trip in plan.trips:
+            sim.add_mission(trip.shelf, trip.station)
+        ticks = sim.run(until_idle=True)
+        metrics = plan.metrics()
+        results[name] = metrics
+        print(f"  {name:>9}: {metrics['trips']:>5} trips, path {metrics['path_length']:>8,} cells, "
+              f"{metrics['lines_per_trip']:.2f} lines/trip, {metrics['unplaced']} unplaced, "
+              f"planned in {elapsed * 1000:.0f}ms; {num_agvs} AGVs finish in {ticks * sim.tick_seconds / 3600:.2f}h")
+    base, waves = results["per order"], results["waves"]
+    print(f"  waves vs per order: {waves['trips'] / base['trips'] - 1:+.1%} trips, "
+          f"{waves['path_length'] / base['path_length'] - 1:+.1%} path length")
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,90 @@
+# dispatcher.py
+import numpy as np
+
+from algorithm.assignment import hungarian, greedy_assignment, first_come_assignment
+
+UNREACHABLE = 1e9  # Cost of an AGV/task pair with no path; such pairs are never returned
+
+
+class Dispatcher:
+    """Assign tasks to idle AGVs in batches by minimizing total travel.
+
+    The cost of sending an AGV to a task is the grid distance from the AGV to
+    the task's cell, read straight out of the DistanceCache BFS table of that
+    cell, so building an n x m matrix costs one table lookup per task (plus a
+    BFS the first time a cell is seen). The matrix is solved exactly with the
+    Hungarian method while n * m * min(n, m) stays under `exact_limit`
+    cubed; bigger batches (very large fleets) fall back to greedy
+    cheapest-pair-first. `method` forces "hungarian", "greedy" or
+    "first_come" (each task in order takes the nearest free AGV, which is
+    what `Simulation` did before).
+    """
+
+    def __init__(self, distances, exact_limit=300, method=None):
+        self.distances = distances
+        self.exact_limit = exact_limit
+        self.method = method
+
+    def cost_matrix(self, agv_positions, targets):
+        """Travel cost from every AGV (rows) to every target cell (columns)."""
+        graph = self.distances.graph
+        sources = np.array([graph.node(pos) for pos in agv_positions], dtype=np.intp)
+        cost = np.empty((len(sources), len(targets)))
+        for col, target in enumerate(targets):
+            self.distances.add_target(target)
+            table = np.frombuffer(self.distances.distances[graph.node(target)], dtype=np.int32)
+            cost[:, col] = table[sources]
+        cost[cost < 0] = UNREACHABLE
+        return cost
+
+    def solve(self, cost):
+        """Pick the assignment method for a cost matrix and return (rows, cols)."""
+        method = self.method
+        if method is None:
+            n, m = cost.shape
+            method = "hungarian" if n * m * min(n, m) <= self.exact_limit ** 3 else "greedy"
+        if method == "hungarian":
+            return hungarian(cost)
+        if method == "greedy":
+            return greedy_assignment(cost)
+        return first_come_assignment(np.where(cost >= UNREACHABLE, np.inf, cost))
+
+    def assign(self, agv_positions, targets):
+        """[(agv index, target index), ...] for every reachable pair chosen, cheapest batch overall."""
+        if not len(agv_positions) or not len(targets):
+            return []
+        cost = self.cost_matrix(agv_positions, targets)
+        rows, cols = self.solve(cost)
+        return [(int(r), int(c)) for r, c in zip(rows, cols) if cost[r, c] < UNREACHABLE]
+
+    def dispatch_pending(self, store, agv_positions, locate):
+        """Pop up to one pending order per AGV from an OrderStore and assign them.
+
+        `locate(order)` returns the cell an AGV has to drive to for that order
+        (its shelf), or None if it cannot be placed yet. Unplaceable orders
+        are skipped, so they do not hold up the orders behind them; at most
+        the currently pending orders are looked at. Returns
+        [(agv index, order), ...]; skipped orders and orders no AGV was
+        chosen for go back into the pending queue.
+        """
+        orders, targets, unplaced = [], [], []
+        for _ in range(store.pending_count()):
+            if len(orders) >= len(agv_positions):
+                break
+            order = store.pop_pending()
+            if order is None:
+                break
+            target = locate(order)
+            if target is None:
+                unplaced.append(order)
+                continue
+            orders.append(order)
+            targets.append(target)
+        for order in unplaced:
+            store.requeue(order.out_order_code)
+        pairs = self.assign(agv_positions, targets)
+        chosen = {col for _, col in pairs}
+        for col, order in enumerate(orders):
+            if col not in chosen:
+                store.requeue(order.out_order_code)
+        return [(agv, orders[col]) for agv, col in pairs]
@@ -0,0 +1,264 @@
+# fleet.py
+import numpy as np
+
+# AGV states, matching the icons in assets/elements
+IDLE = 0
+NORMAL = 1
+TURNING = 2
+CHARGING = 3
+STATE_NAMES = ("idle", "normal", "turning", "charging")
+
+# Heading codes for the four moves, indexed by (d0 + 1) * 3 + (d1 + 1) of the step (d0, d1)
+_HEADINGS = np.array([-1, 0, -1, 2, -1, 3, -1, 1, -1], dtype=np.int8)
+_HEADING_CODES = _HEADINGS.tolist()
+
+# Fleets up to this size are stepped in plain Python by `tick`
+_SCALAR_ROWS = 32
+
+
+class Fleet:
+    """Struct-of-arrays state for a fleet of AGVs.
+
+    Row i of every array belongs to AGV i: `positions` and `targets` are
+    (count, 2) int32 coordinate pairs, `has_target` says whether the target
+    is set, `states` holds IDLE/NORMAL/TURNING/CHARGING, `battery` is a
+    percentage and `headings` the direction of the last move (-1 before the
+    first one). Paths live in one shared `path_cells` buffer; AGV i drives
+    path_cells[path_cursor[i]:path_end[i]].
+
+    `tick` advances every AGV at once: AGVs with a path take its next cell,
+    AGVs with only a target take one greedy step towards it (first
+    coordinate first, like the old `AGV.move`), charging AGVs recharge.
+    Fleets of up to `_SCALAR_ROWS` AGVs are stepped row by row in plain
+    Python instead, skipping parked ones: for a few AGVs the fixed cost of
+    the array operations outweighs the per-row work.
+    Batteries only drain when `drain_per_move` is set (the owner opts in,
+    e.g. `Simulation(drain_per_move=...)`); an empty AGV stops moving.
+    Coordinates are used as given; `AGV` stores (x, y), the simulation
+    (row, col).
+    """
+
+    def __init__(self, positions=(), battery=100.0, drain_per_move=0.0, charge_per_tick=0.5, capacity=16):
+        self.count = 0
+        self.drain_per_move = drain_per_move
+        self.charge_per_tick = charge_per_tick
+        self._allocate(max(capacity, len(positions)))
+        self.path_cells = np.zeros((0, 2), dtype=np.int32)
+        self._path_used = 0
+        for pos in positions:
+            self.add(pos, battery)
+
+    def __len__(self):
+        return self.count
+
+    def add(self, position, battery=100.0):
+        """Append an AGV and return its row index."""
+        if self.count == len(self._positions):
+            self._allocate(2 * len(self._positions))
+        i = self.count
+        self.count += 1
+        self._positions[i] = position
+        self._targets[i] = position
+        self._has_target[i] = False
+        self._states[i] = IDLE
+        self._battery[i] = battery
+        self._headings[i] = -1
+        self._path_cursor[i] = self._path_end[i] = 0
+        return i
+
+    # Views of the live rows; they stay valid until the next `add` that grows the arrays
+    @property
+    def positions(self):
+        return self._positions[:self.count]
+
+    @property
+    def targets(self):
+        return self._targets[:self.count]
+
+    @property
+    def has_target(self):
+        return self._has_target[:self.count]
+
+    @property
+    def states(self):
+        return self._states[:self.count]
+
+    @property
+    def battery(self):
+        return self._battery[:self.count]
+
+    @property
+    def headings(self):
+        return self._headings[:self.count]
+
+    @property
+    def path_cursor(self):
+        return self._path_cursor[:self.count]
+
+    @property
+    def path_end(self):
+        return self._path_end[:self.count]
+
+    def set_target(self, i, target):
+        """Head for target greedily; None clears it."""
+        self._has_target[i] = target is not None
+        if target is not None:
+            self._targets[i] = target
+
+    def set_path(self, i, cells):
+        """Follow `cells` (excluding the current position) one cell per tick."""
+        cells = np.asarray(cells, dtype=np.int32).reshape(-1, 2)
+        self._path_cursor[i] = self._path_end[i] = 0  # Drop the old path before compacting
+        if self._path_used + len(cells) > len(self.path_cells):
+            self._compact(len(cells))
+        start = self._path_used
+        self.path_cells[start:start + len(cells)] = cells
+        self._path_used += len(cells)
+        self._path_cursor[i], self._path_end[i] = start, start + len(cells)
+        if len(cells):
+            self._targets[i] = cells[-1]
+            self._has_target[i] = True
+
+    def remaining_path(self, i):
+        return self.path_cells[self._path_cursor[i]:self._path_end[i]]
+
+    def start_charging(self, i):
+        self._states[i] = CHARGING
+
+    def tick(self, rows=None):
+        """Advance every AGV (or only `rows`) by one step; returns the rows that reached their target."""
+        n = self.count
+        if rows is not None:
+            selected = np.zeros(n, dtype=bool)
+            selected[rows] = True
+        if n > _SCALAR_ROWS:
+            return self._tick_arrays(np.ones(n, dtype=bool) if rows is None else selected)
+        # A small fleet steps faster in plain Python than as arrays
+        return self._tick_rows(range(n) if rows is None else np.flatnonzero(selected).tolist())
+
+    def _tick_rows(self, rows):
+        n = self.count
+        states, has_target = self._states[:n].tolist(), self._has_target[:n].tolist()
+        cursor, end = self._path_cursor[:n].tolist(), self._path_end[:n].tolist()
+        positions = targets = headings = None  # Fetched once some AGV has somewhere to go
+        reached = []
+        for i in rows:
+            state = states[i]
+            if state == IDLE and not has_target[i] and cursor[i] >= end[i]:
+                continue  # Parked
+            if state == CHARGING:
+                self._battery[i] = min(self._battery[i] + self.charge_per_tick, 100.0)
+                if self._battery[i] >= 100.0:
+                    self._states[i] = IDLE
+                continue
+            if self.drain_per_move and self._battery[i] <= 0:
+                continue
+            if positions is None:
+                positions = self._positions[:n].ravel().tolist()
+                targets = self._targets[:n].ravel().tolist()
+                headings = self._headings[:n].tolist()
+
+            p0, p1 = positions[2 * i], positions[2 * i + 1]
+            following = cursor[i] < end[i]
+            if following:
+                n0, n1 = self.path_cells[cursor[i]].tolist()
+                cursor[i] += 1
+            elif has_target[i]:
+                t0, t1 = targets[2 * i], targets[2 * i + 1]
+                n0, n1 = p0 + (t0 > p0) - (t0 < p0), p1
+                if n0 == p0:  # First coordinate first
+                    n1 += (t1 > p1) - (t1 < p1)
+            else:
+                n0, n1 = p0, p1
+
+            turning = False
+            if n0 != p0 or n1 != p1:
+                positions[2 * i], positions[2 * i + 1] = n0, n1
+                heading = _HEADING_CODES[(n0 - p0) * 3 + n1 - p1 + 4]
+                if heading != headings[i]:
+                    turning = headings[i] >= 0
+                    self._headings[i] = heading
+                if self.drain_per_move:
+                    self._battery[i] = max(self._battery[i] - self.drain_per_move, 0.0)
+            elif not following:  # Nowhere to go; waiting on a path still counts as driving
+                self._states[i] = IDLE
+                continue
+            if has_target[i] and targets[2 * i] == n0 and targets[2 * i + 1] == n1:
+                self._has_target[i] = False
+                reached.append(i)
+            state_now = TURNING if turning else NORMAL
+            if state != state_now:
+                self._states[i] = state_now
+
+        if positions is not None:  # Some AGV moved or followed its path
+            self._positions[:n].ravel()[:] = positions
+            self._path_cursor[:n] = cursor
+        return np.array(reached, dtype=np.intp)
+
+    def _tick_arrays(self, selected):
+        n = self.count
+        positions, targets, has_target = self._positions[:n], self._targets[:n], self._has_target[:n]
+        states, battery, headings = self._states[:n], self._battery[:n], self._headings[:n]
+        cursor, end = self._path_cursor[:n], self._path_end[:n]
+
+        charging = selected & (states == CHARGING)
+        if charging.any():
+            battery[charging] = np.minimum(battery[charging] + self.charge_per_tick, 100.0)
+            states[charging & (battery >= 100.0)] = IDLE
+            selected &= ~charging
+        if self.drain_per_move:
+            selected &= battery > 0
+
+        # Rows with only a target step greedily, rows with a path take its next cell
+        on_path = cursor < end
+        steps = np.sign(targets - positions)
+        steps[:, 1] *= steps[:, 0] == 0  # First coordinate first
+        steps *= (selected & has_target & ~on_path)[:, None]
+        following = np.flatnonzero(selected & on_path)
+        if len(following):
+            steps[following] = self.path_cells[cursor[following]] - positions[following]
+            cursor[following] += 1
+
+        positions += steps
+        moved = (steps[:, 0] != 0) | (steps[:, 1] != 0)
+        new_headings = _HEADINGS[steps[:, 0] * 3 + steps[:, 1] + 4]
+        turning = moved & (headings >= 0) & (new_headings != headings)
+        np.copyto(headings, new_headings, where=moved)
+        if self.drain_per_move:
+            battery[moved] = np.maximum(battery[moved] - self.drain_per_move, 0.0)
+
+        busy = moved.copy()
+        busy[following] = True  # Waiting on a path still counts as driving
+        reached = busy & has_target & (positions == targets).all(axis=1)
+        has_target[reached] = False
+        idle = selected & ~busy
+        states[idle] = IDLE
+        states[busy] = np.where(turning[busy], TURNING, NORMAL)
+        return np.flatnonzero(reached)
+
+    def _allocate(self, capacity):
+        old = self.count
+        fields = (("_positions", (capacity, 2), np.int32), ("_targets", (capacity, 2), np.int32),
+                  ("_has_target", capacity, bool), ("_states", capacity, np.int8),
+                  ("_battery", capacity, np.float32), ("_headings", capacity, np.int8),
+                  ("_path_cursor", capacity, np.int64), ("_path_end", capacity, np.int64))
+        for name, shape, dtype in fields:
+            array = np.zeros(shape, dtype=dtype)
+            if old:
+                array[:old] = getattr(self, name)[:old]
+            setattr(self, name, array)
+
+    def _compact(self, extra):
+        """Drop consumed path cells and grow the buffer so `extra` more cells fit."""
+        cursor, end = self.path_cursor, self.path_end
+        live = np.flatnonzero(cursor < end)
+        needed = int((end[live] - cursor[live]).sum()) + extra
+        buffer = np.zeros((max(2 * needed, 1024), 2), dtype=np.int32)
+        used = 0
+        for i in live:
+            length = end[i] - cursor[i]
+            buffer[used:used + length] = self.path_cells[cursor[i]:end[i]]
+            cursor[i], end[i] = used, used + length
+            used += length
+        self.path_cells = buffer
+        self._path_used = used
@@ -0,0 +1,134 @@
+# ingestion.py
+import json
+import logging
+import queue
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+
+class QueueFull(Exception):
+    """Raised by `IngestionQueue.submit` when the queue is at capacity."""
+
+
+class IngestionQueue:
+    """Bounded in-memory queue of validated API requests, persisted in batches.
+
+    Handlers call `submit`, which only appends to the queue and never blocks:
+    when `maxsize` requests are already waiting it raises QueueFull so the
+    caller can answer 429. A single background thread takes up to
+    `batch_size` requests at a time (waiting at most `flush_interval`
+    seconds for a batch to fill), serializes them as JSON lines and appends
+    the whole batch to `path` with one write. Serialization happens on that
+    thread, off the event loop.
+
+    A batch that cannot be written (disk full, file not writable) is tried
+    `retries` more times, `retry_delay` seconds apart, and then dropped
+    and logged, so the worker keeps draining the queue instead of letting
+    it fill up.
+    """
+
+    def __init__(self, path, maxsize=10000, batch_size=500, flush_interval=0.2, retries=3, retry_delay=1.0):
+        self.path = path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.retries = retries
+        self.retry_delay = retry_delay
+        self.queue = queue.Queue(maxsize)
+        self.accepted = 0
+        self.rejected = 0
+        self.persisted = 0
+        self.batches = 0
+        self.dropped = 0  # Requests lost to batches that could not be written
+        self._lock = threading.Lock()
+        self._thread = None
+        self._stopping = False
+
+    def submit(self, kind, warehouse, owner, request):
+        """Queue one validated request (a pydantic model); raises QueueFull under backpressure."""
+        if self._thread is None:
+            self.start()
+        try:
+            self.queue.put_nowait((kind, warehouse, owner, time.time(), request))
+        except queue.Full:
+            self.rejected += 1
+            raise QueueFull(kind) from None
+        self.accepted += 1
+
+    def start(self):
+        with self._lock:
+            if self._thread is None:
+                self._stopping = False
+                self._thread = threading.Thread(target=self._run, name="ingestion", daemon=True)
+                self._thread.start()
+
+    def stop(self):
+        """Persist everything still queued and stop the worker."""
+        with self._lock:
+            thread, self._thread = self._thread, None
+            self._stopping = True
+        if thread is not None:
+            thread.join()
+
+    def stats(self):
+        return {"queued": self.queue.qsize(), "accepted": self.accepted, "rejected": self.rejected,
+                "persisted": self.persisted, "batches": self.batches, "dropped": self.dropped}
+
+    def _run(self):
+        while True:
+            batch = self._take_batch()
+            if batch:
+                self._write(batch)
+            elif self._stopping:
+                return
+
+    def _take_batch(self):
+        try:
+            batch = [self.queue.get(timeout=self.flush_interval)]
+        except queue.Empty:
+            return []
+        deadline = time.monotonic() + self.flush_interval
+        while len(batch) < self.batch_size:
+            try:
+                batch.append(self.queue.get_nowait())
+            except queue.Empty:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0 or self._stopping:
+                    break
+                try:
+                    batch.append(self.queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+        return batch
+
+    def _write(self, batch):
+        """Persist a batch, retrying failed writes; never raises, so the worker keeps running."""
+        for attempt in range(self.retries + 1):
+            try:
+                self._persist(batch)
+                return
+            except OSError as error:
+                if attempt < self.retries:
+                    logger.warning("Writing %d requests to %s failed (%s); retrying", len(batch), self.path, error)
+                    time.sleep(self.retry_delay)
+                else:
+                    logger.error("Dropping %d requests: writing to %s failed %d times (%s)",
+                                 len(batch), self.path, self.retries + 1, error)
+            except Exception:  # A request that does not serialize; retrying would not help
+                logger.exception("Dropping %d requests that could not be persisted", len(batch))
+                break
+        self.dropped += len(batch)
+
+    def _persist(self, batch):
+        lines = []
+        for kind, warehouse, owner, received, request in batch:
+            # pydantic v2 serializes straight to JSON; v1 goes through .json()
+            data = request.model_dump_json() if hasattr(request, "model_dump_json") else request.json()
+            header = json.dumps({"kind": kind, "warehouse": warehouse, "owner": owner, "received": received},
+                                separators=(",", ":"))
+            lines.append(header[:-1] + ',"data":' + data + "}")
+        with open(self.path, "a") as f:
+            f.write("\n".join(lines) + "\n")
+        self.persisted += len(batch)
+        self.batches += 1
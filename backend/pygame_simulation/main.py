@@ -1,13 +1,86 @@
-from fastapi import FastAPI, Query
+from fastapi import FastAPI, HTTPException, Query
+from fastapi.responses import PlainTextResponse
 from pydantic import BaseModel
-import logging
+import contextvars
+from contextlib import asynccontextmanager
+import os
 from typing import List, Optional, Dict
 
-# Initialize FastAPI app
-app = FastAPI()
+import metrics
+from ingestion import IngestionQueue, QueueFull
+from order_store import OrderStore
+from request_log import setup_request_logging, PayloadSampler, RequestLogMiddleware
+
+@asynccontextmanager
+async def lifespan(app):
+    """Start the ingestion worker with the app; on shutdown flush it and the request log."""
+    ingestion.start()
+    yield
+    ingestion.stop()  # Persist what is still queued
+    log_listener.stop()
 
-# Setup logging
-logging.basicConfig(filename="api_requests.log", level=logging.INFO, format="%(asctime)s - %(message)s")
+# Initialize FastAPI app
+app = FastAPI(lifespan=lifespan)
+
+# Setup logging: compact JSON lines written by a background thread, rotated by size and time
+logger, log_listener = setup_request_logging(os.environ.get("LOG_PATH", "api_requests.log"),
+                                             max_bytes=int(os.environ.get("LOG_MAX_BYTES", 50 * 1024 * 1024)),
+                                             when=os.environ.get("LOG_ROTATE_WHEN", "midnight"))
+sample_payload = PayloadSampler(float(os.environ.get("LOG_PAYLOAD_SAMPLE", 0.01)))
+log_fields = contextvars.ContextVar("log_fields", default=None)  # Per-request summary filled by the handler
+app.add_middleware(RequestLogMiddleware, logger=logger, fields=log_fields)
+
+# Per-endpoint latency histograms, only when METRICS=1 (otherwise requests skip the middleware entirely)
+if metrics.enabled:
+    app.add_middleware(metrics.MetricsMiddleware)
+
+# Validated requests are queued here and persisted in batches by a background thread
+ingestion = IngestionQueue(os.environ.get("INGEST_PATH", "api_requests.jsonl"),
+                           maxsize=int(os.environ.get("INGEST_QUEUE_SIZE", 10000)))
+
+# Indexed SKUs, receipts and pick orders; pending picks come out by priority and deadline
+store = OrderStore()
+
+def order_code(item):
+    """Order, receipt or SKU code of one entry in a request body."""
+    for attr in ("order_details", "receipt_info"):
+        info = getattr(item, attr, None)
+        if info is not None:
+            return getattr(info, "out_order_code", None) or getattr(info, "receipt_code", None)
+    return getattr(item, "sku_code", None)
+
+def ingest(kind, request, warehouse, owner):
+    """Queue a request for persistence, or answer 429 when the queue is full."""
+    fields = log_fields.get()
+    if fields is not None:
+        items = next(iter(request.body.values()), [])
+        fields.update(kind=kind, warehouse=warehouse, owner=owner, count=len(items),
+                      codes=[order_code(item) for item in items[:20]])
+        if sample_payload():
+            fields["payload"] = request  # Serialized on the logging thread
+    try:
+        ingestion.submit(kind, warehouse, owner, request)
+    except QueueFull:
+        raise HTTPException(status_code=429, detail="Ingestion queue is full, retry later",
+                            headers={"Retry-After": "1"})
+
+@app.get("/api/ingestion/stats")
+async def ingestion_stats():
+    return ingestion.stats()
+
+@app.get("/metrics")
+async def metrics_endpoint(format: str = Query("prometheus", pattern="^(prometheus|json)$")):
+    """Planner, simulation and API timings; `format=json` gives counts, sums and p50/p99 per series."""
+    if format == "json":
+        return metrics.REGISTRY.snapshot()
+    return PlainTextResponse(metrics.REGISTRY.render(), media_type="text/plain; version=0.0.4")
+
+@app.get("/api/pick/pending")
+async def pick_pending():
+    """Number of pending pick orders and the one the dispatcher would take next."""
+    next_order = store.peek_pending()
+    return {"pending": store.pending_count(),
+            "next": next_order.out_order_code if next_order is not None else None}
 
 # ========================= SKU SYNC =========================
 class Packing(BaseModel):
@@ -48,8 +121,8 @@ class SKUSyncRequest(BaseModel):
 async def sku_sync(request: SKUSyncRequest, warehouse: str = Query(...), owner: str = Query(...)):
     """Handles SKU Synchronization"""
     
-    logging.info(f"SKU Sync Request: Warehouse: {warehouse}, Owner: {owner}, Data: {request.dict()}")
-    print(f"Received SKU Sync Request: {request.dict()}")
+    ingest("sku_sync", request, warehouse, owner)
+    store.upsert_skus(request.body["sku_list"])
 
     return {
         "message": "SKU Synchronization Successful",
@@ -89,8 +162,8 @@ class PutawayRequest(BaseModel):
 async def putaway_order(request: PutawayRequest, warehouse: str = Query(...), owner: str = Query(...)):
     """Handles Putaway Order Creation"""
     
-    logging.info(f"Putaway Order Request: Warehouse: {warehouse}, Owner: {owner}, Data: {request.dict()}")
-    print(f"Received Putaway Order Request: {request.dict()}")
+    ingest("putaway_create", request, warehouse, owner)
+    store.add_receipts(request.body["receipts"])
 
     return {
         "message": "Putaway Order Created Successfully",
@@ -127,8 +200,8 @@ class PutawayConfirmRequest(BaseModel):
 async def putaway_confirm(request: PutawayConfirmRequest, warehouse: str = Query(...), owner: str = Query(...)):
     """Handles Putaway Order Confirmation"""
     
-    logging.info(f"Putaway Confirm Request: Warehouse: {warehouse}, Owner: {owner}, Data: {request.dict()}")
-    print(f"Received Putaway Confirm Request: {request.dict()}")
+    ingest("putaway_confirm", request, warehouse, owner)
+    store.confirm_receipts(request.body["receipts"])
 
     return {
         "message": "Putaway Order Confirmed Successfully",
@@ -157,8 +230,8 @@ class PutawayCancelRequest(BaseModel):
 async def putaway_cancel(request: PutawayCancelRequest, warehouse: str = Query(...), owner: str = Query(...)):
     """Handles Putaway Order Cancellation"""
     
-    logging.info(f"Putaway Cancel Request: Warehouse: {warehouse}, Owner: {owner}, Data: {request.dict()}")
-    print(f"Received Putaway Cancel Request: {request.dict()}")
+    ingest("putaway_cancel", request, warehouse, owner)
+    store.cancel_receipts(request.body["receipts"])
 
     return {
         "message": "Putaway Order Canceled Successfully",
@@ -217,8 +290,8 @@ class PickOrderRequest(BaseModel):
 async def pick_order_create(request: PickOrderRequest, warehouse: str = Query(...), owner: str = Query(...)):
     """Handles Pick Order Creation"""
 
-    logging.info(f"Pick Order Request: Warehouse: {warehouse}, Owner: {owner}, Data: {request.dict()}")
-    print(f"Received Pick Order Request: {request.dict()}")
+    ingest("pick_create", request, warehouse, owner)
+    store.add_orders(request.body["orders"])
 
     return {
         "message": "Pick Order Created Successfully",
@@ -295,8 +368,8 @@ class PickOrderConfirmRequest(BaseModel):
 async def pick_order_confirm(request: PickOrderConfirmRequest, warehouse: str = Query(...), owner: str = Query(...)):
     """Handles Pick Order Confirmation"""
 
-    logging.info(f"Pick Order Confirmation Request: Warehouse: {warehouse}, Owner: {owner}, Data: {request.dict()}")
-    print(f"Received Pick Order Confirmation Request: {request.dict()}")
+    ingest("pick_confirm", request, warehouse, owner)
+    store.confirm_orders(request.body["orders"])
 
     return {
         "message": "Pick Order Confirmed Successfully",
@@ -0,0 +1,157 @@
+# map_catalogue.py
+import base64
+import binascii
+import hashlib
+import json
+import os
+import time
+
+import numpy as np
+
+from map_format import read_map, EXTENSION as BINARY_MAP_EXTENSION
+
+MAP_EXTENSIONS = (".json", BINARY_MAP_EXTENSION)
+INDEX_FILE = ".catalogue.json"
+INDEX_VERSION = 1  # Bump when the entry layout changes; older indexes are rebuilt
+
+
+class MapEntry:
+    """What the menu needs to know about one map file."""
+
+    def __init__(self, name, rows, cols, mtime_ns, size, content_hash, thumbnail):
+        self.name = name  # File name inside the maps directory
+        self.rows, self.cols = rows, cols
+        self.mtime_ns = mtime_ns
+        self.size = size
+        self.content_hash = content_hash
+        self.thumbnail = thumbnail  # Small uint8 array of cell values, at most thumbnail_size on each side
+
+    def to_json(self):
+        return {"name": self.name, "rows": self.rows, "cols": self.cols, "mtime_ns": self.mtime_ns,
+                "size": self.size, "hash": self.content_hash, "thumb_shape": list(self.thumbnail.shape),
+                "thumb": base64.b64encode(self.thumbnail.tobytes()).decode("ascii")}
+
+    @classmethod
+    def from_json(cls, data):
+        thumbnail = np.frombuffer(base64.b64decode(data["thumb"]), dtype=np.uint8).reshape(data["thumb_shape"])
+        return cls(data["name"], data["rows"], data["cols"], data["mtime_ns"], data["size"], data["hash"],
+                   thumbnail)
+
+
+def thumbnail(cells, size):
+    """Nearest-cell downsample of a (rows, cols) map to at most size x size."""
+    cells = np.asarray(cells, dtype=np.uint8)
+    rows, cols = cells.shape
+    row_index = np.linspace(0, rows - 1, min(rows, size)).round().astype(int)
+    col_index = np.linspace(0, cols - 1, min(cols, size)).round().astype(int)
+    return np.ascontiguousarray(cells[np.ix_(row_index, col_index)])
+
+
+class MapCatalogue:
+    """Index of the map files in a directory, kept in sync cheaply.
+
+    The index (names, dimensions, mtimes, content hashes and thumbnails) is
+    saved to `.catalogue.json` in the directory, so a restart only looks at
+    files whose mtime or size changed; an index with another `INDEX_VERSION`
+    or thumbnail size, or an entry that does not parse, is rebuilt from the
+    files. `refresh` rescans the directory at most every `interval` seconds
+    with one `os.scandir`; a changed file is hashed first and only parsed
+    again if its content hash differs.
+    `version` goes up whenever the entries change, so callers can keep
+    derived data (rendered text, thumbnails) until it does.
+    """
+
+    def __init__(self, directory, thumbnail_size=32, interval=1.0):
+        self.directory = directory
+        self.thumbnail_size = thumbnail_size
+        self.interval = interval
+        self.entries = []
+        self.version = 0
+        self._by_name = {}
+        self._skipped = {}  # Unreadable files -> (mtime_ns, size) when last tried
+        self._checked = None
+        self._load_index()
+        self.refresh(force=True)
+
+    def refresh(self, force=False):
+        """Pick up added, removed and modified maps; returns True if anything changed."""
+        now = time.monotonic()
+        if not force and self._checked is not None and now - self._checked < self.interval:
+            return False
+        self._checked = now
+
+        changed = touched = False
+        seen, skipped = {}, {}
+        with os.scandir(self.directory) as scan:
+            for item in scan:
+                if item.name.startswith(".") or not item.name.endswith(MAP_EXTENSIONS) or not item.is_file():
+                    continue
+                stat = item.stat()
+                key = (stat.st_mtime_ns, stat.st_size)
+                entry = self._by_name.get(item.name)
+                if entry is None and self._skipped.get(item.name) == key:
+                    skipped[item.name] = key  # Still the same unreadable file
+                    continue
+                if entry is None or (entry.mtime_ns, entry.size) != key:
+                    updated = self._index(item.path, item.name, stat, entry)
+                    changed = changed or updated is not entry
+                    touched = True
+                    entry = updated
+                if entry is None:
+                    skipped[item.name] = key
+                else:
+                    seen[item.name] = entry
+        changed = changed or seen.keys() != self._by_name.keys()
+        self._by_name, self._skipped = seen, skipped
+        if changed:
+            self.entries = [seen[name] for name in sorted(seen)]
+            self.version += 1
+        if changed or touched:
+            self._save_index()
+        return changed
+
+    def _index(self, path, name, stat, previous):
+        try:
+            with open(path, "rb") as f:
+                content = f.read()
+        except OSError:
+            return None
+        content_hash = hashlib.blake2b(content, digest_size=16).hexdigest()
+        if previous is not None and previous.content_hash == content_hash:  # Touched, not changed
+            previous.mtime_ns, previous.size = stat.st_mtime_ns, stat.st_size
+            return previous
+        try:
+            cells = np.asarray(read_map(path)["maze"], dtype=np.uint8)
+        except (ValueError, KeyError, TypeError):  # Not a map we can read; leave it out of the menu
+            return None
+        if cells.ndim != 2:
+            return None
+        return MapEntry(name, int(cells.shape[0]), int(cells.shape[1]), stat.st_mtime_ns, stat.st_size,
+                        content_hash, thumbnail(cells, self.thumbnail_size))
+
+    def _load_index(self):
+        try:
+            with open(os.path.join(self.directory, INDEX_FILE)) as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        if not isinstance(data, dict):
+            return
+        if data.get("version") != INDEX_VERSION or data.get("thumbnail_size") != self.thumbnail_size:
+            return  # Written by another layout or thumbnail size; rebuilt by refresh
+        for item in data.get("entries", []):
+            try:
+                entry = MapEntry.from_json(item)
+            except (KeyError, TypeError, ValueError, binascii.Error):
+                continue  # Stale or damaged; refresh indexes that file again
+            self._by_name[entry.name] = entry
+        self.entries = [self._by_name[name] for name in sorted(self._by_name)]
+
+    def _save_index(self):
+        data = {"version": INDEX_VERSION, "thumbnail_size": self.thumbnail_size,
+                "entries": [entry.to_json() for entry in self._by_name.values()]}
+        try:
+            with open(os.path.join(self.directory, INDEX_FILE), "w") as f:
+                json.dump(data, f, separators=(",", ":"))
+        except OSError:
+            pass  # Read-only maps directory; the in-memory index still works
@@ -0,0 +1,152 @@
+# map_format.py
+import json
+import mmap
+import os
+import struct
+
+import numpy as np
+
+from algorithm.grid import PICKING_STATION, PUTAWAY_STATION
+
+# Binary map file (.wmap), all integers little-endian:
+#   magic b"WMAP", version u8, packing u8, 2 pad bytes, rows u32, cols u32,
+#   robot row/col i32, end row/col i32 (-1 when unset), station count u32, cells offset u32,
+#   then station node ids (u32, row * cols + col, row-major order),
+#   then the cells at `cells offset` (64-byte aligned): one byte per cell (PACK_U8)
+#   or two cells per byte, first cell in the high nibble (PACK_U4)
+MAGIC = b"WMAP"
+VERSION = 1
+PACK_U8 = 0
+PACK_U4 = 1
+EXTENSION = ".wmap"
+_HEADER = struct.Struct("<4sBBxxIIiiiiII")
+_ALIGN = 64
+
+
+class MapFile:
+    """A binary map opened with `load_map`.
+
+    `cells` is a (rows, cols) uint8 array. For byte-packed files it is a view
+    straight onto a copy-on-write memory map, so opening a map costs a header
+    read regardless of its size and pages are only read from disk when cells
+    are touched; edits to the array never reach the file. Nibble-packed files
+    are unpacked into memory on load.
+    """
+
+    def __init__(self, path, rows, cols, robot, end, stations, cells, mapping=None):
+        self.path = path
+        self.rows, self.cols = rows, cols
+        self.robot = robot
+        self.end = end
+        self.stations = stations  # [(row, col), ...] picking and putaway stations
+        self.cells = cells
+        self._mapping = mapping
+
+    def to_dict(self):
+        """Same layout as the JSON map files: {"maze": [[...]], "robot": [r, c], "end": [r, c]}."""
+        return {"maze": self.cells.tolist(), "robot": _as_list(self.robot), "end": _as_list(self.end)}
+
+    def close(self):
+        """Release the memory map (left to the garbage collector while other views of it are alive)."""
+        self.cells = None
+        if self._mapping is not None:
+            try:
+                self._mapping.close()
+            except BufferError:
+                pass
+            self._mapping = None
+
+
+def save_map(path, maze, robot=None, end=None, packing=PACK_U8):
+    """Write a maze (list of lists or 2D array) and its robot/end positions as a binary map."""
+    cells = np.ascontiguousarray(maze, dtype=np.uint8)
+    rows, cols = cells.shape
+    flat = cells.reshape(-1)
+    stations = np.flatnonzero(np.isin(flat, (PICKING_STATION, PUTAWAY_STATION))).astype("<u4")
+    offset = -(-(_HEADER.size + stations.nbytes) // _ALIGN) * _ALIGN
+    if packing == PACK_U4:
+        if flat.size and flat.max() > 15:
+            raise ValueError("cell values above 15 do not fit in 4 bits")
+        padded = np.append(flat, np.zeros(flat.size % 2, dtype=np.uint8))
+        payload = (padded[0::2] << 4) | padded[1::2]
+    else:
+        payload = flat
+    robot_row, robot_col = robot if robot is not None else (-1, -1)
+    end_row, end_col = end if end is not None else (-1, -1)
+    header = _HEADER.pack(MAGIC, VERSION, packing, rows, cols, robot_row, robot_col, end_row, end_col,
+                          len(stations), offset)
+    with open(path, "wb") as f:
+        f.write(header)
+        f.write(stations.tobytes())
+        f.write(b"\0" * (offset - _HEADER.size - stations.nbytes))
+        f.write(payload.tobytes())
+
+
+def load_map(path):
+    """Open a binary map; see MapFile."""
+    with open(path, "rb") as f:
+        header = f.read(_HEADER.size)
+        if len(header) < _HEADER.size or header[:4] != MAGIC:
+            raise ValueError(f"{path} is not a binary map")
+        _, version, packing, rows, cols, robot_row, robot_col, end_row, end_col, count, offset = \
+            _HEADER.unpack(header)
+        if version != VERSION:
+            raise ValueError(f"{path}: unsupported map version {version}")
+        stations = np.frombuffer(f.read(4 * count), dtype="<u4")
+        stations = [divmod(int(node), cols) for node in stations]
+        robot = (robot_row, robot_col) if robot_row >= 0 else None
+        end = (end_row, end_col) if end_row >= 0 else None
+        if packing == PACK_U4:
+            f.seek(offset)
+            packed = np.frombuffer(f.read((rows * cols + 1) // 2), dtype=np.uint8)
+            cells = np.empty(packed.size * 2, dtype=np.uint8)
+            cells[0::2], cells[1::2] = packed >> 4, packed & 0x0F
+            return MapFile(path, rows, cols, robot, end, stations, cells[:rows * cols].reshape(rows, cols))
+        if rows * cols == 0:
+            return MapFile(path, rows, cols, robot, end, stations, np.zeros((rows, cols), dtype=np.uint8))
+        mapping = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_COPY)
+    cells = np.frombuffer(mapping, dtype=np.uint8, count=rows * cols, offset=offset).reshape(rows, cols)
+    return MapFile(path, rows, cols, robot, end, stations, cells, mapping)
+
+
+def read_map(path):
+    """Load a JSON or binary map into the JSON layout; binary mazes stay memory-mapped arrays."""
+    if path.endswith(EXTENSION):
+        map_file = load_map(path)
+        return {"maze": map_file.cells, "robot": map_file.robot, "end": map_file.end}
+    with open(path) as f:
+        return json.load(f)
+
+
+def json_to_binary(json_path, path=None, packing=PACK_U8):
+    """Convert a JSON map file to a binary one next to it (or at `path`); returns the new path."""
+    path = path or os.path.splitext(json_path)[0] + EXTENSION
+    with open(json_path) as f:
+        data = json.load(f)
+    save_map(path, data["maze"], data.get("robot"), data.get("end"), packing)
+    return path
+
+
+def binary_to_json(binary_path, path=None):
+    """Convert a binary map back to the JSON layout the editor writes; returns the new path."""
+    path = path or os.path.splitext(binary_path)[0] + ".json"
+    map_file = load_map(binary_path)
+    try:
+        data = map_file.to_dict()
+    finally:
+        map_file.close()
+    with open(path, "w") as f:
+        json.dump(data, f)
+    return path
+
+
+def _as_list(pos):
+    return list(pos) if pos is not None else None
+
+
+if __name__ == "__main__":
+    import sys
+
+    # python map_format.py maps/foo.json [...]  (or .wmap files to go back to JSON)
+    for name in sys.argv[1:]:
+        print(binary_to_json(name) if name.endswith(EXTENSION) else json_to_binary(name))
@@ -0,0 +1,225 @@
+# metrics.py
+import bisect
+import os
+import threading
+import time
+
+# Off unless METRICS=1 (or `enable()`); instrumented code checks this flag once per call
+enabled = os.environ.get("METRICS", "0") == "1"
+
+# Seconds; from 10 microseconds (a short A* query) to 10 seconds (a long ACO run)
+TIME_BUCKETS = (1e-5, 5e-5, 1e-4, 5e-4, 1e-3, 5e-3, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def enable(on=True):
+    global enabled
+    enabled = on
+
+
+class _Metric:
+    kind = None
+
+    def __init__(self, name, help_text, labels=()):
+        self.name = name
+        self.help = help_text
+        self.label_names = tuple(labels)
+        self.values = {}  # Label values tuple -> value (or per-metric state)
+        self.lock = threading.Lock()
+
+    def items(self):
+        """Sorted (label values, value) pairs, copied under the lock so writers can keep adding series."""
+        with self.lock:
+            return sorted(self.values.items())
+
+    def _label_text(self, key, extra=""):
+        pairs = [f'{name}="{value}"' for name, value in zip(self.label_names, key)]
+        if extra:
+            pairs.append(extra)
+        return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def inc(self, amount=1, *labels):
+        with self.lock:
+            self.values[labels] = self.values.get(labels, 0) + amount
+
+    def lines(self):
+        return [f"{self.name}{self._label_text(key)} {value}" for key, value in self.items()]
+
+    def snapshot(self):
+        return {",".join(key): value for key, value in self.items()}
+
+
+class Gauge(_Metric):
+    kind = "gauge"
+
+    def set(self, value, *labels):
+        with self.lock:
+            self.values[labels] = value
+
+    def set_max(self, value, *labels):
+        """Keep the largest value seen (peaks)."""
+        with self.lock:
+            if value > self.values.get(labels, value - 1):
+                self.values[labels] = value
+
+    lines = Counter.lines
+    snapshot = Counter.snapshot
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name, help_text, labels=(), buckets=TIME_BUCKETS):
+        super().__init__(name, help_text, labels)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value, *labels):
+        index = bisect.bisect_left(self.buckets, value)
+        with self.lock:
+            state = self.values.get(labels)
+            if state is None:
+                state = self.values[labels] = [[0] * (len(self.buckets) + 1), 0.0, 0]  # Bucket counts, sum, count
+            state[0][index] += 1
+            state[1] += value
+            state[2] += 1
+
+    def items(self):
+        with self.lock:  # Bucket lists are updated in place, so copy them too
+            return sorted((key, (list(counts), total, count)) for key, (counts, total, count) in self.values.items())
+
+    def lines(self):
+        lines = []
+        for key, (counts, total, count) in self.items():
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + ("+Inf",), counts):
+                cumulative += bucket_count
+                le = 'le="%s"' % bound
+                lines.append(f"{self.name}_bucket{self._label_text(key, le)} {cumulative}")
+            lines.append(f"{self.name}_sum{self._label_text(key)} {total}")
+            lines.append(f"{self.name}_count{self._label_text(key)} {count}")
+        return lines
+
+    def snapshot(self):
+        summary = {}
+        for key, (counts, total, count) in self.items():
+            summary[",".join(key)] = {"count": count, "sum": total, "mean": total / count if count else 0.0,
+                                      "p50": self._quantile(counts, count, 0.5),
+                                      "p99": self._quantile(counts, count, 0.99)}
+        return summary
+
+    def _quantile(self, counts, count, q):
+        """Upper bound of the bucket holding the q-quantile."""
+        rank, seen = q * count, 0
+        for bound, bucket_count in zip(self.buckets + (float("inf"),), counts):
+            seen += bucket_count
+            if seen >= rank:
+                return bound
+        return float("inf")
+
+
+class MetricsRegistry:
+    """In-process collection of counters, gauges and histograms, rendered in the Prometheus text format."""
+
+    def __init__(self):
+        self.metrics = {}
+        self.lock = threading.Lock()
+
+    def counter(self, name, help_text, labels=()):
+        return self._get(Counter, name, help_text, labels)
+
+    def gauge(self, name, help_text, labels=()):
+        return self._get(Gauge, name, help_text, labels)
+
+    def histogram(self, name, help_text, labels=(), buckets=TIME_BUCKETS):
+        with self.lock:
+            if name not in self.metrics:
+                self.metrics[name] = Histogram(name, help_text, labels, buckets)
+            return self.metrics[name]
+
+    def render(self):
+        lines = []
+        with self.lock:
+            metrics = sorted(self.metrics.values(), key=lambda m: m.name)
+        for metric in metrics:
+            lines.append(f"# HELP {metric.name} {metric.help}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            lines.extend(metric.lines())
+        return "\n".join(lines) + "\n"
+
+    def snapshot(self):
+        """{metric name: {label values joined by ",": value or histogram summary}} for JSON output."""
+        with self.lock:
+            metrics = list(self.metrics.values())
+        return {metric.name: metric.snapshot() for metric in metrics}
+
+    def reset(self):
+        with self.lock:
+            metrics = list(self.metrics.values())
+        for metric in metrics:
+            with metric.lock:
+                metric.values.clear()
+
+    def _get(self, cls, name, help_text, labels):
+        with self.lock:
+            if name not in self.metrics:
+                self.metrics[name] = cls(name, help_text, labels)
+            return self.metrics[name]
+
+
+REGISTRY = MetricsRegistry()
+
+PLANNER_SEARCHES = REGISTRY.counter("planner_searches_total", "Path searches run", ("planner",))
+PLANNER_EXPANDED = REGISTRY.counter("planner_nodes_expanded_total", "Nodes expanded (ACO: ant steps)", ("planner",))
+PLANNER_PUSHES = REGISTRY.counter("planner_heap_pushes_total", "Open-set pushes", ("planner",))
+PLANNER_POPS = REGISTRY.counter("planner_heap_pops_total", "Open-set pops", ("planner",))
+PLANNER_PEAK_OPEN = REGISTRY.gauge("planner_open_set_peak", "Largest open set seen in one search", ("planner",))
+PLANNER_SECONDS = REGISTRY.histogram("planner_seconds", "Wall time per search", ("planner",))
+SIM_TICK_SECONDS = REGISTRY.histogram("sim_tick_seconds", "Simulation.step duration, observers excluded")
+RENDER_FRAME_SECONDS = REGISTRY.histogram("render_frame_seconds", "Time to draw one frame", ("view",))
+API_REQUEST_SECONDS = REGISTRY.histogram("api_request_seconds", "API handler latency",
+                                         ("method", "endpoint", "status"))
+
+
+def record_search(planner, seconds, expanded, pushes=0, pops=0, peak_open=0):
+    """Report one planner query (planners call this only when `enabled`)."""
+    PLANNER_SEARCHES.inc(1, planner)
+    PLANNER_EXPANDED.inc(expanded, planner)
+    if pops:  # Heap-based planners only
+        PLANNER_PUSHES.inc(pushes, planner)
+        PLANNER_POPS.inc(pops, planner)
+        PLANNER_PEAK_OPEN.set_max(peak_open, planner)
+    PLANNER_SECONDS.observe(seconds, planner)
+
+
+class MetricsMiddleware:
+    """ASGI middleware observing API_REQUEST_SECONDS per method, route template and status.
+
+    Add it only when metrics are enabled; it is not installed otherwise, so
+    requests pay nothing.
+    """
+
+    def __init__(self, app, histogram=API_REQUEST_SECONDS):
+        self.app = app
+        self.histogram = histogram
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        started = time.perf_counter()
+        status = [500]
+
+        async def send_and_capture(message):
+            if message["type"] == "http.response.start":
+                status[0] = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_and_capture)
+        finally:
+            route = scope.get("route")  # Set by the router; templates keep label cardinality bounded
+            endpoint = getattr(route, "path", None) or "unmatched"
+            self.histogram.observe(time.perf_counter() - started, scope["method"], endpoint, str(status[0]))
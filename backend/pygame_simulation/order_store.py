@@ -0,0 +1,243 @@
+# order_store.py
+import heapq
+import threading
+from collections import defaultdict
+
+# Record statuses
+PENDING = "pending"  # Waiting for an AGV
+DISPATCHED = "dispatched"  # Handed to the dispatcher
+CONFIRMED = "confirmed"
+CANCELED = "canceled"
+
+
+class PickOrder:
+    """One pick order as the store keeps it; confirm/cancel update it in place."""
+
+    def __init__(self, out_order_code, owner_code, out_wave_code, priority, expected_finish_date, sku_items, data):
+        self.out_order_code = out_order_code
+        self.owner_code = owner_code
+        self.out_wave_code = out_wave_code
+        self.priority = priority
+        self.expected_finish_date = expected_finish_date
+        self.sku_items = sku_items  # [(sku_code, amount), ...]
+        self.data = data  # The validated request model
+        self.status = PENDING
+        self.pickup_sku_amount = None
+        self.finish_date = None
+        self.queue_entry = None  # Sequence number of its live entry in the pending heap
+
+
+class Receipt:
+    """One putaway receipt; confirm/cancel update it in place."""
+
+    def __init__(self, receipt_code, owner_codes, sku_items, data):
+        self.receipt_code = receipt_code
+        self.owner_codes = owner_codes
+        self.sku_items = sku_items  # [(sku_code, amount), ...]
+        self.data = data
+        self.status = PENDING
+        self.completion_time = None
+
+
+class OrderStore:
+    """In-process store for SKUs, putaway receipts and pick orders.
+
+    Every record sits in one dict keyed by its code, and secondary indexes
+    map sku_code, owner_code, out_wave_code and priority to sets of codes,
+    so upserts and lookups are O(1) per record. Pending pick orders also go
+    into a heap ordered by priority (highest first unless
+    `highest_priority_first` is False) and then by expected_finish_date;
+    entries for orders that were confirmed, canceled or re-upserted are
+    skipped lazily when they reach the top.
+    """
+
+    def __init__(self, highest_priority_first=True):
+        self.priority_sign = -1 if highest_priority_first else 1
+        self.lock = threading.RLock()
+        self.skus = {}  # (owner_code, sku_code) -> SKU model
+        self.receipts = {}  # receipt_code -> Receipt
+        self.orders = {}  # out_order_code -> PickOrder
+        self.skus_by_code = defaultdict(set)  # sku_code -> {(owner_code, sku_code)}
+        self.skus_by_owner = defaultdict(set)  # owner_code -> {(owner_code, sku_code)}
+        self.orders_by_sku = defaultdict(set)  # sku_code -> {out_order_code}
+        self.orders_by_owner = defaultdict(set)
+        self.orders_by_wave = defaultdict(set)
+        self.orders_by_priority = defaultdict(set)
+        self.receipts_by_sku = defaultdict(set)  # sku_code -> {receipt_code}
+        self._pending = []  # (priority key, expected_finish_date, sequence, PickOrder)
+        self._pending_codes = set()  # Codes of orders with status PENDING
+        self._sequence = 0
+
+    # ---- SKUs ----
+    def upsert_skus(self, skus):
+        with self.lock:
+            for sku in skus:
+                key = (sku.owner_code, sku.sku_code)
+                self.skus[key] = sku
+                self.skus_by_code[sku.sku_code].add(key)
+                self.skus_by_owner[sku.owner_code].add(key)
+        return len(skus)
+
+    def find_skus(self, sku_code=None, owner_code=None):
+        with self.lock:
+            keys = self._match([(self.skus_by_code, sku_code), (self.skus_by_owner, owner_code)], self.skus)
+            return [self.skus[key] for key in keys]
+
+    # ---- Putaway receipts ----
+    def add_receipts(self, receipts):
+        with self.lock:
+            for receipt in receipts:
+                code = receipt.receipt_info.receipt_code
+                self._unindex_receipt(code)
+                items = [(d.sku_code, d.sku_amount) for d in receipt.sku_details]
+                owners = sorted({d.owner_code for d in receipt.sku_details})
+                self.receipts[code] = Receipt(code, owners, items, receipt)
+                for sku_code, _ in items:
+                    self.receipts_by_sku[sku_code].add(code)
+
+    def confirm_receipts(self, receipts):
+        """Mark receipts confirmed; returns the codes that were not found."""
+        missing = []
+        with self.lock:
+            for receipt in receipts:
+                record = self.receipts.get(receipt.receipt_info.receipt_code)
+                if record is None:
+                    missing.append(receipt.receipt_info.receipt_code)
+                    continue
+                record.status = CONFIRMED
+                record.completion_time = receipt.receipt_info.completion_time
+        return missing
+
+    def cancel_receipts(self, receipts):
+        missing = []
+        with self.lock:
+            for receipt in receipts:
+                record = self.receipts.get(receipt.receipt_info.receipt_code)
+                if record is None:
+                    missing.append(receipt.receipt_info.receipt_code)
+                else:
+                    record.status = CANCELED
+        return missing
+
+    # ---- Pick orders ----
+    def add_orders(self, orders):
+        with self.lock:
+            for order in orders:
+                details = order.order_details
+                code = details.out_order_code
+                self._unindex_order(code)
+                record = PickOrder(code, details.owner_code, details.out_wave_code, details.priority,
+                                   details.dates.expected_finish_date,
+                                   [(item.sku_code, item.amount) for item in order.sku_items], order)
+                self.orders[code] = record
+                self.orders_by_owner[record.owner_code].add(code)
+                self.orders_by_wave[record.out_wave_code].add(code)
+                self.orders_by_priority[record.priority].add(code)
+                for sku_code, _ in record.sku_items:
+                    self.orders_by_sku[sku_code].add(code)
+                self._push_pending(record)
+
+    def confirm_orders(self, orders):
+        """Apply pick confirmations in place; returns the codes that were not found."""
+        missing = []
+        with self.lock:
+            for order in orders:
+                details = order.order_details
+                record = self.orders.get(details.out_order_code)
+                if record is None:
+                    missing.append(details.out_order_code)
+                    continue
+                record.status = CONFIRMED
+                self._pending_codes.discard(record.out_order_code)
+                record.pickup_sku_amount = details.pickup_sku_amount
+                record.finish_date = details.finish_date
+        return missing
+
+    def cancel_order(self, out_order_code):
+        with self.lock:
+            record = self.orders.get(out_order_code)
+            if record is not None:
+                record.status = CANCELED
+                self._pending_codes.discard(out_order_code)
+            return record
+
+    def find_orders(self, sku_code=None, owner_code=None, out_wave_code=None, priority=None, status=None):
+        """Orders matching every given index value, intersecting the smallest index sets first."""
+        with self.lock:
+            codes = self._match([(self.orders_by_sku, sku_code), (self.orders_by_owner, owner_code),
+                                 (self.orders_by_wave, out_wave_code), (self.orders_by_priority, priority)],
+                                self.orders)
+            records = [self.orders[code] for code in codes]
+        if status is not None:
+            records = [record for record in records if record.status == status]
+        return records
+
+    def pop_pending(self):
+        """Take the most urgent pending order and mark it dispatched; None when there is none."""
+        with self.lock:
+            record = self._top_pending()
+            if record is not None:
+                heapq.heappop(self._pending)
+                record.status = DISPATCHED
+                self._pending_codes.discard(record.out_order_code)
+            return record
+
+    def peek_pending(self):
+        with self.lock:
+            return self._top_pending()
+
+    def requeue(self, out_order_code):
+        """Put a dispatched order back in the pending queue (e.g. no AGV could take it)."""
+        with self.lock:
+            record = self.orders.get(out_order_code)
+            if record is not None and record.status == DISPATCHED:
+                record.status = PENDING
+                self._push_pending(record)
+
+    def pending_count(self):
+        with self.lock:
+            return len(self._pending_codes)
+
+    # ---- internals ----
+    def _push_pending(self, record):
+        self._sequence += 1
+        entry = (self.priority_sign * record.priority, record.expected_finish_date, self._sequence, record)
+        record.queue_entry = self._sequence  # Only the latest heap entry of a record is live
+        self._pending_codes.add(record.out_order_code)
+        heapq.heappush(self._pending, entry)
+
+    def _top_pending(self):
+        pending = self._pending
+        while pending:
+            _, _, sequence, record = pending[0]
+            if record.status == PENDING and record.queue_entry == sequence and \
+                    self.orders.get(record.out_order_code) is record:
+                return record
+            heapq.heappop(pending)
+        return None
+
+    def _unindex_order(self, code):
+        record = self.orders.pop(code, None)
+        if record is None:
+            return
+        record.status = CANCELED  # Superseded; drops its heap entry
+        self._pending_codes.discard(code)
+        self.orders_by_owner[record.owner_code].discard(code)
+        self.orders_by_wave[record.out_wave_code].discard(code)
+        self.orders_by_priority[record.priority].discard(code)
+        for sku_code, _ in record.sku_items:
+            self.orders_by_sku[sku_code].discard(code)
+
+    def _unindex_receipt(self, code):
+        record = self.receipts.pop(code, None)
+        if record is not None:
+            for sku_code, _ in record.sku_items:
+                self.receipts_by_sku[sku_code].discard(code)
+
+    @staticmethod
+    def _match(filters, records):
+        sets = [index.get(value, set()) for index, value in filters if value is not None]
+        if not sets:
+            return list(records)
+        sets.sort(key=len)
+        return [key for key in sets[0] if all(key in other for other in sets[1:])]
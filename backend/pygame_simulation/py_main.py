@@ -1,9 +1,17 @@
 from algorithm.dijkstra import dijkstras
-from algorithm.aco import aco
-from algorithm.astar import astar
+from algorithm.aco import AntColony
+from algorithm.astar import heuristic
+from algorithm.distance_cache import DistanceCache
+from algorithm.landmarks import LandmarkTable, table_path
+from renderer import GridRenderer
+from simulation import Simulation
+from map_format import read_map, EXTENSION as BINARY_MAP_EXTENSION
+from map_catalogue import MapCatalogue
+import metrics
 import pygame # type: ignore
 import heapq
 import json
+import numpy as np
 import os
 import time
 
@@ -27,6 +35,11 @@ ORANGE = (255, 165, 0)  # Orange for the previous position
 CYAN = (0, 255, 255)         # Picking Station
 DARK_ORANGE = (255, 140, 0)  # Putaway Station
 DARK_PURPLE = (48, 25, 52)   # Shelf
+GRAY = (128, 128, 128)
+
+CELL_COLORS = np.array([WHITE, BLACK, CYAN, DARK_ORANGE, DARK_PURPLE], dtype=np.uint8)  # Indexed by cell value
+MENU_ROW_HEIGHT = 40
+THUMBNAIL_SIZE = 32
 
 
 
@@ -36,15 +49,11 @@ current_map_name = None  # Store the map name after first input
 if not os.path.exists(MAPS_DIR):
     os.makedirs(MAPS_DIR)
 
-# Load Maps
-def load_maps():
-    return [f for f in os.listdir(MAPS_DIR) if f.endswith(".json")]
-
 def generate_default_name():
     """Generates a default map name using a timestamp"""
     return f"map_{int(time.time())}"  # Example: map_1713056778
 
-def save_map(maze, robot, end, rename=False):
+def save_map(maze, robot, end, rename=False, landmarks=None):
     global current_map_name
 
     # If renaming, ask for a new name
@@ -63,34 +72,42 @@ def save_map(maze, robot, end, rename=False):
 
     with open(file_path, "w") as f:
         json.dump(data, f)
+    if landmarks is not None:  # Stored next to the map; `LandmarkTable.for_map` reuses them while they match
+        landmarks.refresh()
+        landmarks.save(table_path(file_path))
 
     print(f"Map '{current_map_name}' saved successfully!")
 
 # Map Editor
 def edit_map(map_name):
     global MAZE, ROBOT, END
+    map_path = None
     if map_name == "new_map":
         MAZE = [[0 for _ in range(COLS)] for _ in range(ROWS)]
         ROBOT, END = None, None
     else:
-        with open(os.path.join(MAPS_DIR, f"{map_name}.json"), "r") as f:
-            data = json.load(f)
-            MAZE = data["maze"]
-            
-            robot_data = data.get("robot", (0, 0))  # Get "robot" or default (0,0)
-            
-            if robot_data is None:  # Handle None case
-                robot_data = (0, 0)
+        if not map_name.endswith(BINARY_MAP_EXTENSION):
+            map_name += ".json"
+        map_path = os.path.join(MAPS_DIR, map_name)
+        data = read_map(map_path)
+        MAZE = data["maze"]
+        if not isinstance(MAZE, list):  # Binary maps load as arrays; the editor edits rows in place
+            MAZE = MAZE.tolist()
+        
+        robot_data = data.get("robot", (0, 0))  # Get "robot" or default (0,0)
+        
+        if robot_data is None:  # Handle None case
+            robot_data = (0, 0)
 
-            ROBOT = tuple(robot_data)  # Ensure it's a tuple
+        ROBOT = tuple(robot_data)  # Ensure it's a tuple
 
-            
-            end_data = data.get("end", (ROWS-1, COLS-1))  # Get "end" or default
+        
+        end_data = data.get("end", (ROWS-1, COLS-1))  # Get "end" or default
 
-            if end_data is None:  # Handle None case
-                end_data = (ROWS-1, COLS-1)
+        if end_data is None:  # Handle None case
+            end_data = (ROWS-1, COLS-1)
 
-            END = tuple(end_data)  # Ensure it's a tuple
+        END = tuple(end_data)  # Ensure it's a tuple
     
 
     pygame.init()
@@ -100,6 +117,20 @@ def edit_map(map_name):
 
 
     robot_path = []  # Store the robot's path
+    distance_cache = DistanceCache(MAZE, homes=[ROBOT] if ROBOT else [])  # Station/shelf distances
+    # Landmark tables on the same graph, so edits reach them; saved maps keep theirs next to the file
+    if map_path is not None:
+        landmarks = LandmarkTable.for_map(distance_cache.graph, table_path(map_path))
+    else:
+        landmarks = LandmarkTable(distance_cache.graph)
+    renderer = GridRenderer(screen, MAZE, CELL_SIZE, {1: BLACK, 2: CYAN, 3: DARK_ORANGE})  # Walls, picking, putaway
+
+    def set_cell(row, col, value):
+        """Edit MAZE and keep the distance cache and the static map layer in sync."""
+        distance_cache.update_cell((row, col), value)  # Rejects unknown cell types before MAZE changes
+        MAZE[row][col] = value
+        renderer.set_cell((row, col), value)
+
     SHELVES = []  # ✅ Store multiple shelves
 
     SHELF = None  # Store the shelf's position (Initially None)
@@ -107,7 +138,7 @@ def edit_map(map_name):
         global ROBOT, END
         row, col = pos[1] // CELL_SIZE, pos[0] // CELL_SIZE
         if mode == 'wall':
-            MAZE[row][col] = 1 - MAZE[row][col]
+            MAZE[row][col] = 1 if MAZE[row][col] != 1 else 0
         elif mode == 'robot':
             ROBOT = (row, col)
         elif mode == 'end':
@@ -121,44 +152,36 @@ def edit_map(map_name):
 
 
 
-    def draw_grid(robot_pos=None):
-        screen.fill(WHITE)
-        
-        for row in range(ROWS):
-            for col in range(COLS):
-                rect = pygame.Rect(col * CELL_SIZE, row * CELL_SIZE, CELL_SIZE, CELL_SIZE)
-                
-                if MAZE[row][col] == 1:
-                    pygame.draw.rect(screen, BLACK, rect)  # Walls
-                elif MAZE[row][col] == 2:
-                    pygame.draw.rect(screen, CYAN, rect)  # Picking Station
-                elif MAZE[row][col] == 3:
-                    pygame.draw.rect(screen, DARK_ORANGE, rect)  # Putaway Station
+    trail = {}  # Trail cells of robot_path[:trail_length], extended as the robot moves
+    trail_length = 0
 
-                pygame.draw.rect(screen, WHITE, rect, 1)  # Grid lines
+    def overlay(robot_pos=None):
+        """Cells drawn over the static map, later entries on top."""
+        nonlocal trail_length
+        if trail_length > len(robot_path):  # Path was cleared
+            trail.clear()
+            trail_length = 0
+        for pos in robot_path[trail_length:]:
+            trail[pos] = LIGHT_BLUE  # Trail color
+        trail_length = len(robot_path)
 
+        cells = {}
         if END:
-            pygame.draw.rect(screen, RED, (END[1] * CELL_SIZE, END[0] * CELL_SIZE, CELL_SIZE, CELL_SIZE))
-
+            cells[END] = RED
         if ROBOT:
-            pygame.draw.rect(screen, PURPLE, (ROBOT[1] * CELL_SIZE, ROBOT[0] * CELL_SIZE, CELL_SIZE, CELL_SIZE))
-        
+            cells[ROBOT] = PURPLE
         if SHELF:
-            pygame.draw.rect(screen, DARK_PURPLE, (SHELF[1] * CELL_SIZE, SHELF[0] * CELL_SIZE, CELL_SIZE, CELL_SIZE))  # Draw shelf
-
-        # Draw the robot's path
-        for pos in robot_path:
-            pygame.draw.rect(screen, LIGHT_BLUE, (pos[1] * CELL_SIZE, pos[0] * CELL_SIZE, CELL_SIZE, CELL_SIZE))  # Trail color
-
-        if robot_path:  
-            last_pos = robot_path[-1]  # Last visited position
-            pygame.draw.rect(screen, ORANGE, (last_pos[1] * CELL_SIZE, last_pos[0] * CELL_SIZE, CELL_SIZE, CELL_SIZE))  # Mark last position
-
+            cells[SHELF] = DARK_PURPLE  # Draw shelf
+        cells.update(trail)
+        if robot_path:
+            cells[robot_path[-1]] = ORANGE  # Mark last position
         if robot_pos:
             robot_path.append(robot_pos)  # Add current position to path
-            pygame.draw.rect(screen, PURPLE, (robot_pos[1] * CELL_SIZE, robot_pos[0] * CELL_SIZE, CELL_SIZE, CELL_SIZE))  # Draw robot
+            cells[robot_pos] = PURPLE  # Draw robot
+        return cells
 
-        pygame.display.flip()
+    def draw_grid(robot_pos=None):
+        renderer.draw(overlay(robot_pos))
 
 
     # Animate Robot Movement
@@ -170,6 +193,15 @@ def edit_map(map_name):
         print("Robot reached the end!")
 
 
+    def show_candidate(path):
+        """ Show an improving ACO path while the search keeps running. """
+        cells = overlay()
+        for pos in path:
+            cells[pos] = YELLOW
+        renderer.draw(cells)
+        pygame.event.pump()  # Keep the window responsive between iterations
+
+
     def find_position(value):
         """Finds the first occurrence of a specific value in the grid."""
         for row in range(ROWS):
@@ -186,7 +218,7 @@ def edit_map(map_name):
 
 
     def move_robot():
-        global ROBOT, MAZE
+        global ROBOT
         
         shelf_pos = find_position(4)  # Locate shelf
         station_pos = find_position(2) or find_position(3)  # Find either picking or putaway station
@@ -194,40 +226,19 @@ def edit_map(map_name):
         if not shelf_pos or not station_pos:
             print("Shelf or Station not found!")
             return
-        
-        original_shelf_pos = shelf_pos  # Store shelf's original position
-        
-        # 1. Move to Shelf
-        path_to_shelf = astar(MAZE, ROBOT, shelf_pos)
-        if path_to_shelf:
-            follow_path(path_to_shelf)
-
-        # 2. Pick up Shelf (Remove from Grid)
-        MAZE[shelf_pos[0]][shelf_pos[1]] = 0  
-
-        # 3. Move to Putaway/Picking Station
-        path_to_station = astar(MAZE, shelf_pos, station_pos)
-        if path_to_station:
-            follow_path(path_to_station)
 
-        # 4. Wait for 3 seconds
-        time.sleep(3)
+        # Shelf -> station -> wait -> back runs in the headless simulation; we only watch it
+        sim = Simulation(MAZE, [ROBOT], tick_seconds=0.5, dwell_seconds=3.0)
+        sim.add_mission(shelf_pos, station_pos)
 
-        # 5. Move back to the original shelf position
-        path_back = astar(MAZE, station_pos, original_shelf_pos)
-        if path_back:
-            follow_path(path_back)
+        def show_tick(sim, events):
+            draw_grid(sim.position(0))
+            pygame.event.pump()
+            pygame.time.delay(int(sim.tick_seconds * 1000))  # Play back in real time
 
-        # 6. Place Shelf Back
-        MAZE[original_shelf_pos[0]][original_shelf_pos[1]] = 4  
-
-
-    def follow_path(path):
-        global ROBOT
-        for step in path:
-            ROBOT = step  # Move robot
-            draw_grid(ROBOT)  # Redraw grid to show movement
-            pygame.time.delay(500)  # Delay for animation
+        sim.subscribe(show_tick)
+        sim.run(until_idle=True)
+        ROBOT = sim.position(0)
 
 
   
@@ -259,14 +270,19 @@ def edit_map(map_name):
                     if ROBOT is None or END is None:
                         print("Error: Place both the robot and the end position before running Dijkstra.")
                     else:
-                        path = aco(MAZE ,ROBOT, END)  # Now we are sure both are set
+                        path = []  # Now we are sure both are set
+                        colony = AntColony(MAZE)
+                        # Stop as soon as a path reaches the landmark bound (never below Manhattan distance)
+                        bound = max(heuristic(ROBOT, END), landmarks.lower_bound(ROBOT, END))
+                        for path in colony.iterate(ROBOT, END, patience=20, time_budget=5.0, lower_bound=bound):
+                            show_candidate(path)
                         animate_robot(screen, path)
                 
                 elif event.key == pygame.K_f:
-                    save_map(MAZE, ROBOT, END)
+                    save_map(MAZE, ROBOT, END, landmarks=landmarks)
 
                 elif event.key == pygame.K_q:
-                    save_map(MAZE, ROBOT, END, rename=True)  # Rename and save
+                    save_map(MAZE, ROBOT, END, rename=True, landmarks=landmarks)  # Rename and save
                 
                 elif event.key == pygame.K_m:
                     running = False
@@ -275,18 +291,19 @@ def edit_map(map_name):
                 x, y = pygame.mouse.get_pos()
                 row, col = y // CELL_SIZE, x // CELL_SIZE
                 if mode == 'wall':
-                    MAZE[row][col] = 1 - MAZE[row][col]
+                    set_cell(row, col, 1 if MAZE[row][col] != 1 else 0)  # Stations and shelves become walls
                 elif mode == 'robot':
                     ROBOT = (row, col)
+                    distance_cache.add_target(ROBOT)  # AGV home cell
                     robot_path.clear()  # ✅ Clear previous path to remove cyan color
 
                     draw_grid(ROBOT)  # ✅ Fix: Update immediately after placing the robot
                 elif mode == 'end':
                     END = (row, col)
                 elif mode == 'picking_station':
-                    MAZE[row][col] = 2  # Assign picking station (new representation)
+                    set_cell(row, col, 2)  # Assign picking station (new representation)
                 elif mode == 'putaway_station':
-                    MAZE[row][col] = 3  # Assign putaway station
+                    set_cell(row, col, 3)  # Assign putaway station
                 elif mode == 'shelf':
                     if (row, col) not in SHELVES:  # ✅ Avoid duplicate shelves
                         SHELVES.append((row, col))  # ✅ Add new shelf instead of replacing
@@ -298,23 +315,46 @@ def edit_map(map_name):
 
 
 # Main Menu
-def main_menu():
-    pygame.init()
-    screen = pygame.display.set_mode((WIDTH, HEIGHT))
-    pygame.display.set_caption("Map Selector")
-    font = pygame.font.Font(None, 36)
+def render_menu_items(catalogue, font, small_font):
+    """Thumbnail, name and size surfaces for every map in the catalogue."""
+    items = []
+    for entry in catalogue.entries:
+        pixels = CELL_COLORS[np.minimum(entry.thumbnail, len(CELL_COLORS) - 1)]
+        rows, cols = entry.thumbnail.shape
+        scale = THUMBNAIL_SIZE / max(rows, cols)
+        thumbnail = pygame.transform.scale(pygame.surfarray.make_surface(pixels.transpose(1, 0, 2)),
+                                           (max(1, round(cols * scale)), max(1, round(rows * scale))))
+        items.append((thumbnail, font.render(entry.name, True, BLACK),
+                      small_font.render(f"{entry.rows} x {entry.cols}", True, GRAY)))
+    return items
 
+def main_menu():
+    catalogue = MapCatalogue(MAPS_DIR, thumbnail_size=THUMBNAIL_SIZE)
+    clock = pygame.time.Clock()
     running = True
     while running:
+        if not pygame.display.get_init():  # First pass, or the editor shut pygame down
+            pygame.init()
+            screen = pygame.display.set_mode((WIDTH, HEIGHT))
+            pygame.display.set_caption("Map Selector")
+            font = pygame.font.Font(None, 36)
+            small_font = pygame.font.Font(None, 24)
+            create_text = font.render("+ Create New Map", True, GREEN)
+            items_version = None
+
+        catalogue.refresh()  # Rescans the directory at most once a second
+        if items_version != catalogue.version:  # Render names and thumbnails only when maps change
+            items, items_version = render_menu_items(catalogue, font, small_font), catalogue.version
+        maps = catalogue.entries
+
         screen.fill(WHITE)
-        maps = load_maps()
         y_offset = 50
-        for i, map_name in enumerate(maps):
-            text_surface = font.render(map_name, True, BLACK)
-            screen.blit(text_surface, (50, y_offset + i * 40))
-
-        create_text = font.render("+ Create New Map", True, GREEN)
-        screen.blit(create_text, (50, y_offset + len(maps) * 40 + 20))
+        for i, (thumbnail, name, size) in enumerate(items):
+            y = y_offset + i * MENU_ROW_HEIGHT
+            screen.blit(thumbnail, (50, y))
+            screen.blit(name, (50 + THUMBNAIL_SIZE + 10, y))
+            screen.blit(size, (WIDTH - size.get_width() - 30, y + 6))
+        screen.blit(create_text, (50, y_offset + len(maps) * MENU_ROW_HEIGHT + 20))
 
         pygame.display.flip()
 
@@ -323,14 +363,18 @@ def main_menu():
                 running = False
             elif event.type == pygame.MOUSEBUTTONDOWN:
                 x, y = pygame.mouse.get_pos()
-                if y > y_offset + len(maps) * 40:  # Clicked on "Create New Map"
+                if y > y_offset + len(maps) * MENU_ROW_HEIGHT:  # Clicked on "Create New Map"
                     edit_map("new_map")
                 else:
-                    index = (y - y_offset) // 40
+                    index = (y - y_offset) // MENU_ROW_HEIGHT
                     if 0 <= index < len(maps):
-                        edit_map(maps[index].replace(".json", ""))
+                        edit_map(maps[index].name.removesuffix(".json"))
+
+        clock.tick(30)
 
     pygame.quit()
 
 if __name__ == "__main__":
     main_menu()
+    if metrics.enabled:  # METRICS=1: planner and frame timings of the session
+        print(metrics.REGISTRY.render(), end="")
@@ -0,0 +1,150 @@
+# request_log.py
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import random
+import time
+
+
+class JsonFormatter(logging.Formatter):
+    """One compact JSON object per record: ts, level, logger, msg and the record's `fields`.
+
+    Values in `fields` that are pydantic models are serialized here, so the
+    cost lands on the logging thread rather than on the caller.
+    """
+
+    def format(self, record):
+        entry = {"ts": round(record.created, 6), "level": record.levelname, "logger": record.name,
+                 "msg": record.getMessage()}
+        for key, value in getattr(record, "fields", {}).items():
+            if hasattr(value, "model_dump"):  # pydantic v2
+                value = value.model_dump()
+            elif hasattr(value, "dict"):  # pydantic v1
+                value = value.dict()
+            entry[key] = value
+        if record.exc_info:
+            entry["exc"] = self.formatException(record.exc_info)
+        return json.dumps(entry, separators=(",", ":"), default=str)
+
+
+class SizeAndTimeRotatingFileHandler(logging.handlers.TimedRotatingFileHandler):
+    """Rotate at the `when`/`interval` boundary or once the file reaches `max_bytes`, whichever comes first."""
+
+    def __init__(self, filename, max_bytes=50 * 1024 * 1024, when="midnight", interval=1, backup_count=7):
+        super().__init__(filename, when=when, interval=interval, backupCount=backup_count, delay=True)
+        self.max_bytes = max_bytes
+
+    def shouldRollover(self, record):
+        if super().shouldRollover(record):
+            return True
+        if self.max_bytes <= 0:
+            return False
+        if self.stream is None:
+            self.stream = self._open()
+        return self.stream.tell() >= self.max_bytes
+
+    def rotation_filename(self, default_name):
+        # Size rollovers can happen several times per interval; number them instead of overwriting
+        name, suffix = default_name, 1
+        while os.path.exists(name):
+            name = f"{default_name}.{suffix}"
+            suffix += 1
+        return name
+
+    def getFilesToDelete(self):
+        """Rotated files beyond `backupCount`, oldest first (by mtime, as suffixes mix dates and counters)."""
+        directory, base = os.path.split(self.baseFilename)
+        rotated = [os.path.join(directory, name) for name in os.listdir(directory or ".")
+                   if name.startswith(base + ".")]
+        rotated.sort(key=os.path.getmtime)
+        return rotated[:max(0, len(rotated) - self.backupCount)]
+
+
+class DroppingQueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler that never blocks: when the queue is full the record is dropped and counted."""
+
+    def __init__(self, log_queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record):
+        # Only resolve %-args here; JSON formatting happens on the listener thread
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+class PayloadSampler:
+    """Decide which requests get their full payload logged (a fraction `rate` of them)."""
+
+    def __init__(self, rate, seed=None):
+        self.rate = rate
+        self._random = random.Random(seed)
+
+    def __call__(self):
+        return self.rate >= 1 or (self.rate > 0 and self._random.random() < self.rate)
+
+
+def setup_request_logging(path, logger_name="api", max_bytes=50 * 1024 * 1024, when="midnight",
+                          backup_count=7, queue_size=10000):
+    """Route `logger_name` through a bounded queue to a rotating JSON-lines file.
+
+    Returns (logger, listener); call `listener.stop()` at shutdown to flush.
+    """
+    file_handler = SizeAndTimeRotatingFileHandler(path, max_bytes=max_bytes, when=when, backup_count=backup_count)
+    file_handler.setFormatter(JsonFormatter())
+    log_queue = queue.Queue(queue_size)
+    listener = logging.handlers.QueueListener(log_queue, file_handler, respect_handler_level=True)
+    listener.start()
+
+    logger = logging.getLogger(logger_name)
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+    for handler in list(logger.handlers):
+        logger.removeHandler(handler)
+    logger.addHandler(DroppingQueueHandler(log_queue))
+    return logger, listener
+
+
+class RequestLogMiddleware:
+    """ASGI middleware logging one record per HTTP request: method, path, status, duration_ms.
+
+    A fresh dict is placed in the `fields` context variable before the
+    request runs; whatever the handler adds to it (order codes, counts,
+    a sampled payload) ends up in the same record.
+    """
+
+    def __init__(self, app, logger, fields):
+        self.app = app
+        self.logger = logger
+        self.fields = fields
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        started = time.perf_counter()
+        fields = {}
+        token = self.fields.set(fields)
+        status = [500]
+
+        async def send_and_capture(message):
+            if message["type"] == "http.response.start":
+                status[0] = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_and_capture)
+        finally:
+            self.fields.reset(token)
+            fields.update(method=scope["method"], path=scope["path"], status=status[0],
+                          duration_ms=round((time.perf_counter() - started) * 1000, 3))
+            self.logger.info("request", extra={"fields": fields})
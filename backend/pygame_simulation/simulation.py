@@ -0,0 +1,208 @@
+# simulation.py
+from collections import deque
+import time
+
+import numpy as np
+
+import metrics
+from algorithm.distance_cache import DistanceCache
+from algorithm.grid import GridGraph, EMPTY, SHELF
+from dispatcher import Dispatcher, UNREACHABLE
+from fleet import Fleet
+
+# Mission stages of an AGV
+IDLE = "idle"
+TO_SHELF = "to_shelf"  # Driving to the shelf it will lift
+TO_STATION = "to_station"  # Carrying the shelf to the station
+AT_STATION = "at_station"  # Waiting while the station works
+RETURNING = "returning"  # Carrying the shelf back to its spot
+
+
+class Mission:
+    """Bring the shelf at `shelf` to `station` and put it back afterwards."""
+
+    def __init__(self, mission_id, shelf, station):
+        self.id = mission_id
+        self.shelf = tuple(shelf)
+        self.station = tuple(station)
+        self.agv = None
+        self.created_tick = None
+        self.started_tick = None
+        self.finished_tick = None
+
+
+class Simulation:
+    """Headless, fixed-timestep warehouse simulation.
+
+    Owns the map, the AGVs and the mission queue and advances in discrete
+    ticks of `tick_seconds` simulated time: each tick every driving AGV moves
+    one cell, idle AGVs pick up the oldest queued missions (the Dispatcher
+    decides which AGV takes which, minimizing total travel unless
+    `dispatch_method` says otherwise), and a shelf waits `dwell_seconds` at its station before going
+    back. Nothing here sleeps or touches pygame, so a shift of orders runs as
+    fast as the CPU allows; the pygame UI and the streaming backend observe
+    it through `subscribe`.
+
+    Positions, paths and motion states live in a Fleet of (row, col) rows that
+    is advanced by one `Fleet.tick` call per step; only mission bookkeeping
+    at arrivals runs per AGV. Routes come from a DistanceCache shared by all AGVs; lifting
+    a shelf turns its cell empty and dropping it turns it back into a shelf,
+    exactly like `move_robot` used to. AGVs do not avoid each other, and
+    batteries only drain if `drain_per_move` is set.
+    """
+
+    def __init__(self, maze, agv_positions, tick_seconds=0.5, dwell_seconds=3.0, drain_per_move=0.0,
+                 dispatch_method=None):
+        self.graph = GridGraph.from_maze(maze)
+        self.distances = DistanceCache(self.graph, preload=False)  # Shelf and station tables built on first use
+        self.dispatcher = Dispatcher(self.distances, method=dispatch_method)
+        self.fleet = Fleet(agv_positions, drain_per_move=drain_per_move)
+        self.stages = [IDLE] * len(agv_positions)  # Mission stage per AGV
+        self.missions = [None] * len(agv_positions)  # Running mission per AGV
+        self.wait_ticks = np.zeros(len(agv_positions), dtype=np.int32)  # Dwell left at the station
+        self.tick_seconds = tick_seconds
+        self.dwell_ticks = max(1, round(dwell_seconds / tick_seconds))
+        self.tick = 0
+        self.queue = deque()  # Missions waiting for an AGV
+        self.completed = []
+        self.failed = []
+        self.observers = []
+        self._next_mission_id = 0
+        self._busy_shelves = set()  # Shelves lifted or claimed by a running mission
+
+    @property
+    def time(self):
+        """Simulated seconds since the start."""
+        return self.tick * self.tick_seconds
+
+    def add_mission(self, shelf, station):
+        mission = Mission(self._next_mission_id, shelf, station)
+        mission.created_tick = self.tick
+        self._next_mission_id += 1
+        self.queue.append(mission)
+        return mission
+
+    def subscribe(self, callback):
+        """Call `callback(simulation, events)` after every tick."""
+        self.observers.append(callback)
+
+    def position(self, agv):
+        return tuple(self.fleet.positions[agv].tolist())
+
+    def idle(self):
+        return not self.queue and all(stage == IDLE for stage in self.stages)
+
+    def run(self, ticks=None, until_idle=False):
+        """Advance `ticks` ticks, or until every mission is done; returns the ticks run."""
+        start = self.tick
+        while ticks is None or self.tick - start < ticks:
+            if until_idle and self.idle():
+                break
+            self.step()
+        return self.tick - start
+
+    def step(self):
+        """Advance one tick; returns the events it produced as (kind, agv id, mission id) tuples."""
+        started = time.perf_counter() if metrics.enabled else None
+        events = []
+        self._assign(events)
+        done_waiting = ()
+        if self.wait_ticks.any():  # Usually nobody is at a station
+            waiting = self.wait_ticks > 0
+            self.wait_ticks[waiting] -= 1
+            done_waiting = np.flatnonzero(waiting & (self.wait_ticks == 0))
+
+        for agv in self.fleet.tick():
+            self._arrive(int(agv), events)
+        for agv in done_waiting:  # Leave the station from the next tick on
+            agv = int(agv)
+            self._drive(agv, self.missions[agv].shelf, RETURNING, events)
+
+        self.tick += 1
+        if started is not None:  # Observers (rendering, logging) are timed by their owners
+            metrics.SIM_TICK_SECONDS.observe(time.perf_counter() - started)
+        for callback in self.observers:
+            callback(self, events)
+        return events
+
+    def _assign(self, events):
+        idle = [agv for agv, stage in enumerate(self.stages) if stage == IDLE]
+        if not idle or not self.queue:
+            return
+        positions = [self.position(agv) for agv in idle]
+        # Oldest missions first, at most one per idle AGV; the dispatcher decides who takes which
+        batch, columns, skipped, claimed = [], [], [], set()
+        while len(batch) < len(idle) and self.queue:
+            mission = self.queue.popleft()
+            if mission.shelf in self._busy_shelves or mission.shelf in claimed:  # Wait until that shelf is back
+                skipped.append(mission)
+                continue
+            column = self.dispatcher.cost_matrix(positions, [mission.shelf])
+            if column.min() >= UNREACHABLE:
+                if self._fleet_can_reach(mission.shelf):
+                    skipped.append(mission)  # A busy AGV can get there later
+                else:
+                    self.failed.append(mission)
+                    events.append(("failed", None, mission.id))
+                continue
+            claimed.add(mission.shelf)
+            batch.append(mission)
+            columns.append(column)
+        if batch:
+            cost = np.hstack(columns)
+            assigned = set()
+            for row, col in zip(*self.dispatcher.solve(cost)):
+                if cost[row, col] >= UNREACHABLE:
+                    continue
+                agv, mission = idle[row], batch[col]
+                assigned.add(col)
+                self._busy_shelves.add(mission.shelf)
+                mission.agv, mission.started_tick = agv, self.tick
+                self.missions[agv] = mission
+                events.append(("assigned", agv, mission.id))
+                self._drive(agv, mission.shelf, TO_SHELF, events)
+            # Missions that lost out to another one for the only AGV that reaches them stay in line
+            skipped.extend(mission for col, mission in enumerate(batch) if col not in assigned)
+            skipped.sort(key=lambda mission: mission.id)
+        self.queue.extendleft(reversed(skipped))
+
+    def _fleet_can_reach(self, pos):
+        positions = self.fleet.positions
+        return any(self.distances.distance((int(row), int(col)), pos) is not None for row, col in positions)
+
+    def _drive(self, agv, target, stage, events):
+        self.stages[agv] = stage
+        path = self.distances.path(self.position(agv), target)
+        if path is None:
+            self._finish(agv, "failed", events)
+            return
+        self.fleet.set_path(agv, path)
+        if not path:  # Already there
+            self._arrive(agv, events)
+
+    def _arrive(self, agv, events):
+        mission, stage = self.missions[agv], self.stages[agv]
+        if stage == TO_SHELF:
+            self.distances.update_cell(mission.shelf, EMPTY)  # Lift the shelf
+            events.append(("lifted", agv, mission.id))
+            self._drive(agv, mission.station, TO_STATION, events)
+        elif stage == TO_STATION:
+            self.stages[agv], self.wait_ticks[agv] = AT_STATION, self.dwell_ticks
+            events.append(("at_station", agv, mission.id))
+        elif stage == RETURNING:
+            self.distances.update_cell(mission.shelf, SHELF)  # Put it back
+            self._finish(agv, "completed", events)
+
+    def _finish(self, agv, outcome, events):
+        mission = self.missions[agv]
+        if outcome == "completed":
+            mission.finished_tick = self.tick
+            self.completed.append(mission)
+        else:
+            if self.stages[agv] in (TO_STATION, RETURNING):  # Shelf was lifted; put it down again
+                self.distances.update_cell(mission.shelf, SHELF)
+            self.failed.append(mission)
+        self._busy_shelves.discard(mission.shelf)
+        events.append((outcome, agv, mission.id))
+        self.stages[agv], self.missions[agv] = IDLE, None
+        self.fleet.set_path(agv, [])
@@ -0,0 +1,94 @@
+# sprites.py
+import os
+
+import numpy as np
+import pygame # type: ignore
+
+from fleet import STATE_NAMES
+
+ASSETS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "assets")
+ICON_SETS = {"elements": "{}.png", "dropdown": "{}_icon.png"}  # Folder -> file name pattern per state
+SELECTED_COLOR = (255, 0, 0)
+
+
+class SpriteAtlas:
+    """AGV state icons, loaded once and packed into one sheet per cell size.
+
+    The source PNGs (one per fleet state, in STATE_NAMES order) are read
+    on construction. `sheet(size)` scales them with smoothscale into a
+    single surface holding every state twice, plain and with a selection
+    outline, converts it for fast blitting if a display is up, and caches
+    it, so resizing the grid costs one rescale and drawing never does.
+    `draw_fleet` then blits every AGV from that sheet with one
+    `Surface.blits` call.
+
+    With a `background` color the icons are flattened onto it and the
+    sheet is opaque, which skips per-pixel alpha blending on every blit
+    (several times faster); use it when AGVs are drawn over plain cells.
+    """
+
+    def __init__(self, icon_set="elements", assets_dir=ASSETS_DIR, background=None):
+        self.background = background
+        pattern = ICON_SETS[icon_set]
+        self.sources = [pygame.image.load(os.path.join(assets_dir, icon_set, pattern.format(name)))
+                        for name in STATE_NAMES]
+        self._sheets = {}  # Cell size -> (sheet surface, [area rect per state], [area rect per state, selected])
+        self._icons = {}  # (state, size, selected) -> subsurface of the sheet
+
+    def sheet(self, size):
+        cached = self._sheets.get(size)
+        if cached is None:
+            count = len(self.sources)
+            sheet = pygame.Surface((size * count, size * 2), pygame.SRCALPHA)
+            if self.background is not None:
+                sheet.fill(self.background)
+            for state, source in enumerate(self.sources):
+                icon = pygame.transform.smoothscale(source, (size, size))
+                sheet.blit(icon, (state * size, 0))
+                sheet.blit(icon, (state * size, size))
+                pygame.draw.rect(sheet, SELECTED_COLOR, (state * size, size, size, size), max(1, size // 10))
+            if pygame.display.get_init() and pygame.display.get_surface() is not None:
+                sheet = sheet.convert_alpha() if self.background is None else sheet.convert()
+            areas = [pygame.Rect(state * size, 0, size, size) for state in range(count)]
+            selected_areas = [pygame.Rect(state * size, size, size, size) for state in range(count)]
+            cached = self._sheets[size] = (sheet, areas, selected_areas)
+        return cached
+
+    def icon(self, state, size, selected=False):
+        """A standalone surface for one state (e.g. for menus); shares pixels with the sheet."""
+        key = (int(state), size, bool(selected))
+        icon = self._icons.get(key)
+        if icon is None:
+            sheet, areas, selected_areas = self.sheet(size)
+            icon = self._icons[key] = sheet.subsurface((selected_areas if selected else areas)[key[0]])
+        return icon
+
+    def draw_fleet(self, surface, positions, states, size, selected=None, offset=(0, 0)):
+        """Blit one icon per AGV in a single batch.
+
+        positions: (n, 2) array of (x, y) cells, as AGV keeps them (pass
+        `fleet.positions[:, ::-1]` for a (row, col) fleet). states: fleet
+        state codes. selected: optional boolean mask of highlighted AGVs.
+        """
+        sheet, areas, selected_areas = self.sheet(size)
+        if not len(positions):
+            return
+        dests = (np.asarray(positions) * size + offset).tolist()
+        states = np.asarray(states).tolist()
+        if selected is None:
+            rects = [areas[state] for state in states]
+        else:
+            rects = [(selected_areas if chosen else areas)[state]
+                     for state, chosen in zip(states, np.asarray(selected).tolist())]
+        surface.blits(zip([sheet] * len(dests), dests, rects), doreturn=False)
+
+
+_default_atlas = None
+
+
+def default_atlas():
+    """Shared atlas of the `elements` icons, loaded on first use."""
+    global _default_atlas
+    if _default_atlas is None:
+        _default_atlas = SpriteAtlas()
+    return _default_atlas
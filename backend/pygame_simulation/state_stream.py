@@ -0,0 +1,140 @@
+# state_stream.py
+import struct
+import threading
+
+import numpy as np
+
+# Message kinds (first byte of every message)
+MAP = 1
+DELTA = 2
+
+# All integers little-endian:
+#   MAP:   kind u8, tick u32, rows u16, cols u16, robot count u16,
+#          rows * cols cell bytes, then per robot (row u16, col u16, state u8) in id order
+#   DELTA: kind u8, tick u32 (last tick covered), first tick u32, robot count u16, cell count u32,
+#          then per robot (id u16, row u16, col u16, state u8), then per cell (node u32, value u8)
+_MAP_HEADER = struct.Struct("<BIHHH")
+_DELTA_HEADER = struct.Struct("<BIIHI")
+_ROBOT = np.dtype([("row", "<u2"), ("col", "<u2"), ("state", "u1")])
+_ROBOT_UPDATE = np.dtype([("id", "<u2"), ("row", "<u2"), ("col", "<u2"), ("state", "u1")])
+_CELL_UPDATE = np.dtype([("node", "<u4"), ("value", "u1")])
+
+
+def encode_map(tick, rows, cols, cells, positions, states):
+    robots = np.empty(len(positions), dtype=_ROBOT)
+    robots["row"], robots["col"] = positions[:, 0], positions[:, 1]
+    robots["state"] = states
+    return _MAP_HEADER.pack(MAP, tick, rows, cols, len(robots)) + cells.tobytes() + robots.tobytes()
+
+
+def encode_delta(first_tick, tick, robots, cells):
+    """robots: {id: (row, col, state)}, cells: {node: value}."""
+    robot_array = np.array([(i,) + robot for i, robot in robots.items()], dtype=_ROBOT_UPDATE)
+    cell_array = np.array(list(cells.items()), dtype=_CELL_UPDATE)
+    header = _DELTA_HEADER.pack(DELTA, tick, first_tick, len(robot_array), len(cell_array))
+    return header + robot_array.tobytes() + cell_array.tobytes()
+
+
+def decode(message):
+    """Decode a MAP or DELTA message into a dict (for tests and Python clients)."""
+    kind = message[0]
+    if kind == MAP:
+        _, tick, rows, cols, count = _MAP_HEADER.unpack_from(message)
+        offset = _MAP_HEADER.size
+        cells = np.frombuffer(message, dtype=np.uint8, count=rows * cols, offset=offset)
+        robots = np.frombuffer(message, dtype=_ROBOT, count=count, offset=offset + rows * cols)
+        return {"kind": MAP, "tick": tick, "rows": rows, "cols": cols, "cells": cells.reshape(rows, cols),
+                "robots": [(int(r["row"]), int(r["col"]), int(r["state"])) for r in robots]}
+    _, tick, first_tick, robot_count, cell_count = _DELTA_HEADER.unpack_from(message)
+    offset = _DELTA_HEADER.size
+    robots = np.frombuffer(message, dtype=_ROBOT_UPDATE, count=robot_count, offset=offset)
+    cells = np.frombuffer(message, dtype=_CELL_UPDATE, count=cell_count, offset=offset + robots.nbytes)
+    return {"kind": DELTA, "tick": tick, "first_tick": first_tick,
+            "robots": {int(r["id"]): (int(r["row"]), int(r["col"]), int(r["state"])) for r in robots},
+            "cells": {int(c["node"]): int(c["value"]) for c in cells}}
+
+
+class _Client:
+    """Changes accumulated for one client since it last read."""
+
+    def __init__(self):
+        self.first_tick = None
+        self.tick = None
+        self.robots = {}
+        self.cells = {}
+
+    def merge(self, tick, robots, cells):
+        if self.first_tick is None:
+            self.first_tick = tick
+        self.tick = tick
+        self.robots.update(robots)
+        self.cells.update(cells)
+
+    def take(self):
+        message = encode_delta(self.first_tick, self.tick, self.robots, self.cells)
+        self.__init__()
+        return message
+
+
+class StateStream:
+    """Publish a Simulation as one MAP message followed by per-tick DELTA messages.
+
+    Subscribes to the simulation and, after each tick, diffs AGV positions,
+    AGV states and map cells against the last published state. Every
+    client has its own accumulator that the diff is merged into; a client
+    that reads slower than the simulation ticks therefore gets one DELTA
+    covering several ticks (first_tick..tick) instead of a backlog.
+    Ticks that change nothing send nothing.
+    """
+
+    def __init__(self, simulation):
+        self.simulation = simulation
+        fleet, graph = simulation.fleet, simulation.graph
+        self.rows, self.cols = graph.rows, graph.cols
+        self.tick = simulation.tick
+        self.positions = fleet.positions.copy()
+        self.states = fleet.states.copy()
+        self.cells = graph.cells.copy()
+        self.clients = set()
+        self.condition = threading.Condition()
+        simulation.subscribe(self._on_tick)
+
+    def robots(self):
+        """Last published [(row, col, state), ...] in AGV id order."""
+        with self.condition:
+            return [(int(r), int(c), int(s)) for (r, c), s in zip(self.positions, self.states)]
+
+    def stream(self):
+        """Yield the MAP message, then DELTA messages, until the consumer stops."""
+        client = _Client()
+        with self.condition:
+            self.clients.add(client)
+            snapshot = encode_map(self.tick, self.rows, self.cols, self.cells, self.positions, self.states)
+        try:
+            yield snapshot
+            while True:
+                with self.condition:
+                    self.condition.wait_for(lambda: client.tick is not None)
+                    message = client.take()
+                yield message
+        finally:
+            with self.condition:
+                self.clients.discard(client)
+
+    def _on_tick(self, simulation, events):
+        fleet, graph = simulation.fleet, simulation.graph
+        positions, states, cells = fleet.positions, fleet.states, graph.cells
+        moved = np.flatnonzero((positions != self.positions).any(axis=1) | (states != self.states))
+        changed = np.flatnonzero(cells != self.cells)
+        with self.condition:
+            self.tick = simulation.tick
+            if not len(moved) and not len(changed):
+                return
+            self.positions[moved] = positions[moved]
+            self.states[moved] = states[moved]
+            self.cells[changed] = cells[changed]
+            robots = {int(i): (int(positions[i, 0]), int(positions[i, 1]), int(states[i])) for i in moved}
+            cell_updates = {int(n): int(cells[n]) for n in changed}
+            for client in self.clients:
+                client.merge(simulation.tick, robots, cell_updates)
+            self.condition.notify_all()
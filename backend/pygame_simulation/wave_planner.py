@@ -0,0 +1,133 @@
+# wave_planner.py
+from collections import defaultdict
+
+from algorithm.grid import PICKING_STATION
+
+
+class Trip:
+    """One shelf brought to one picking station, serving `lines` [(out_order_code, sku_code, amount), ...]."""
+
+    def __init__(self, wave, shelf, station, lines, length):
+        self.wave = wave
+        self.shelf = tuple(shelf)
+        self.station = tuple(station)
+        self.lines = lines
+        self.length = length  # Shelf -> station -> shelf, in cells
+
+
+class WavePlan:
+    """Trips for a set of waves plus the order lines no shelf could serve."""
+
+    def __init__(self, trips, unplaced):
+        self.trips = trips
+        self.unplaced = unplaced  # [(out_order_code, sku_code, amount), ...]
+
+    def metrics(self):
+        lines = sum(len(trip.lines) for trip in self.trips)
+        return {"trips": len(self.trips), "path_length": sum(trip.length for trip in self.trips),
+                "lines": lines, "lines_per_trip": lines / len(self.trips) if self.trips else 0.0,
+                "unplaced": len(self.unplaced)}
+
+
+def group_by_wave(orders):
+    """{out_wave_code: [order, ...]} in arrival order; orders are OrderStore PickOrder records."""
+    waves = defaultdict(list)
+    for order in orders:
+        waves[order.out_wave_code].append(order)
+    return dict(waves)
+
+
+class WavePlanner:
+    """Turn waves of pick orders into shelf trips that serve as many order lines per trip as possible.
+
+    `locate(sku_code)` returns the shelf cells holding a SKU (several shelves
+    may hold the same SKU). Every wave is picked at one picking station, the
+    least loaded one so far, so orders of a wave that share shelves can share
+    trips. Within a wave the shelves are chosen by greedy set cover: take the
+    shelf that serves the most still-open lines (shorter round trip first on
+    ties) and repeat, so a shelf holding SKUs of several orders comes once.
+    Round trips are measured with the DistanceCache. On a map without
+    picking stations every line comes back unplaced.
+    """
+
+    def __init__(self, distances, locate, stations=None):
+        self.distances = distances
+        self.locate = locate
+        if stations is None:
+            stations = distances.graph.positions(PICKING_STATION)
+        self.stations = [tuple(station) for station in stations]
+
+    def plan(self, orders):
+        """WavePlan batching the lines of each wave into shared shelf trips."""
+        if not self.stations:
+            return self._unplaceable(orders)
+        trips, unplaced = [], []
+        load = dict.fromkeys(self.stations, 0)
+        for wave, wave_orders in group_by_wave(orders).items():
+            lines = [(order.out_order_code, sku, amount) for order in wave_orders for sku, amount in order.sku_items]
+            station = min(self.stations, key=load.__getitem__)
+            load[station] += len(lines)
+            wave_trips, missing = self._cover(wave, station, lines)
+            trips.extend(wave_trips)
+            unplaced.extend(missing)
+        return WavePlan(trips, unplaced)
+
+    def plan_per_order(self, orders):
+        """Baseline: every order fetches its own shelves (nearest shelf per SKU), nothing shared."""
+        if not self.stations:
+            return self._unplaceable(orders)
+        trips, unplaced = [], []
+        load = dict.fromkeys(self.stations, 0)
+        for wave, wave_orders in group_by_wave(orders).items():
+            station = min(self.stations, key=load.__getitem__)  # Same stations as `plan`
+            load[station] += sum(len(order.sku_items) for order in wave_orders)
+            for order in wave_orders:
+                by_shelf = defaultdict(list)
+                for sku, amount in order.sku_items:
+                    shelf = self._nearest_shelf(sku, station)
+                    if shelf is None:
+                        unplaced.append((order.out_order_code, sku, amount))
+                    else:
+                        by_shelf[shelf].append((order.out_order_code, sku, amount))
+                for shelf, shelf_lines in by_shelf.items():
+                    trips.append(Trip(wave, shelf, station, shelf_lines, self._round_trip(shelf, station)))
+        return WavePlan(trips, unplaced)
+
+    def _unplaceable(self, orders):
+        lines = [(order.out_order_code, sku, amount) for order in orders for sku, amount in order.sku_items]
+        return WavePlan([], lines)
+
+    def _cover(self, wave, station, lines):
+        # Which open lines every candidate shelf can serve, and its round trip (measured once per shelf)
+        serves = defaultdict(set)
+        lengths = {}
+        open_lines = set()
+        for index, (_, sku, _) in enumerate(lines):
+            for shelf in self.locate(sku):
+                shelf = tuple(shelf)
+                if shelf not in lengths:
+                    lengths[shelf] = self._round_trip(shelf, station)
+                if lengths[shelf] is not None:
+                    serves[shelf].add(index)
+                    open_lines.add(index)
+        missing = [line for index, line in enumerate(lines) if index not in open_lines]
+
+        trips = []
+        while open_lines:
+            shelf = max(serves, key=lambda s: (len(serves[s] & open_lines), -lengths[s]))
+            served = sorted(serves.pop(shelf) & open_lines)
+            open_lines.difference_update(served)
+            trips.append(Trip(wave, shelf, station, [lines[i] for i in served], lengths[shelf]))
+        return trips, missing
+
+    def _nearest_shelf(self, sku, station):
+        reachable = [(length, tuple(shelf)) for shelf in self.locate(sku)
+                     for length in [self._round_trip(shelf, station)] if length is not None]
+        return min(reachable)[1] if reachable else None
+
+    def _round_trip(self, shelf, station):
+        there = self.distances.distance(shelf, station)
+        back = self.distances.distance(station, shelf)
+        if there is None or back is None:
+            return None
+        return there + back
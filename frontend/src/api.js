@@ -10,3 +10,55 @@ export const getRobotPositions = async () => {
     return [];
   }
 };
+
+const STATE_NAMES = ["idle", "normal", "turning", "charging"];
+
+// Decode one base64 state-stream message (layout documented in backend/pygame_simulation/state_stream.py)
+const decodeStateMessage = (base64) => {
+  const bytes = Uint8Array.from(atob(base64), (c) => c.charCodeAt(0));
+  const view = new DataView(bytes.buffer);
+  const kind = view.getUint8(0);
+  const tick = view.getUint32(1, true);
+  if (kind === 1) {
+    const rows = view.getUint16(5, true);
+    const cols = view.getUint16(7, true);
+    const count = view.getUint16(9, true);
+    const cells = bytes.slice(11, 11 + rows * cols);
+    const robots = [];
+    for (let i = 0, offset = 11 + rows * cols; i < count; i++, offset += 5) {
+      robots.push({
+        id: i,
+        position: [view.getUint16(offset, true), view.getUint16(offset + 2, true)],
+        state: STATE_NAMES[view.getUint8(offset + 4)],
+      });
+    }
+    return { kind: "map", tick, rows, cols, cells, robots };
+  }
+  const firstTick = view.getUint32(5, true);
+  const robotCount = view.getUint16(9, true);
+  const cellCount = view.getUint32(11, true);
+  const robots = [];
+  let offset = 15;
+  for (let i = 0; i < robotCount; i++, offset += 7) {
+    robots.push({
+      id: view.getUint16(offset, true),
+      position: [view.getUint16(offset + 2, true), view.getUint16(offset + 4, true)],
+      state: STATE_NAMES[view.getUint8(offset + 6)],
+    });
+  }
+  const cells = [];
+  for (let i = 0; i < cellCount; i++, offset += 5) {
+    cells.push({ node: view.getUint32(offset, true), value: view.getUint8(offset + 4) });
+  }
+  return { kind: "delta", tick, firstTick, robots, cells };
+};
+
+// Subscribe to /robots/stream; onMap gets the full map once, onDelta the changes after it.
+// Returns a function that closes the stream.
+export const subscribeRobotStream = (onMap, onDelta) => {
+  const source = new EventSource(`${API_URL}/robots/stream`);
+  source.addEventListener("map", (event) => onMap(decodeStateMessage(event.data)));
+  source.addEventListener("delta", (event) => onDelta(decodeStateMessage(event.data)));
+  source.onerror = (error) => console.error("Robot stream error:", error);
+  return () => source.close();
+};